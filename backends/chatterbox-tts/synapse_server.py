@@ -0,0 +1,192 @@
+"""Synapse extensions for the upstream Chatterbox TTS server.
+
+Wraps ``server:app`` from devnen/Chatterbox-TTS-Server and adds:
+  POST /synapse/tts_blend        — Synthesize from weighted-blended voice conditionals
+  GET  /synapse/conditionals     — Conditional cache counters
+
+Chatterbox conditions generation on a voice-encoder speaker embedding (T3) and
+a speaker x-vector (S3Gen), plus a prompt token/mel sequence from the
+reference clip. Blending averages the two embeddings by weight; the sequence
+prompt cannot be averaged, so it comes from the highest-weighted voice.
+
+Encoding a reference (``prepare_conditionals``) is the expensive part, so
+conditionals are cached per reference filename. The gateway uploads references
+under content-addressed names (``synapse_<sha256>.wav``), so a filename always
+identifies the same audio.
+"""
+
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+
+import numpy as np
+import soundfile as sf
+import torch
+import torch.nn.functional as F
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from pydantic import BaseModel, Field
+
+import engine
+import server
+import utils
+from config import get_reference_audio_path
+from server import app
+
+logger = logging.getLogger(__name__)
+
+_CONDITIONALS_CACHE_SIZE = int(os.environ.get("SYNAPSE_CONDITIONALS_CACHE_SIZE", "64"))
+
+# model.conds is shared state: upstream /tts and /v1/audio/speech set it per
+# call from their audio prompt, and encoding and blended generation swap it.
+# Every generation path runs under this lock (re-entrant: the blend path
+# holds it across its chunks and calls the wrapped synthesize).
+_model_lock = threading.RLock()
+_conditionals: OrderedDict[str, object] = OrderedDict()
+_stats = {"hits": 0, "encodes": 0, "evictions": 0, "blends": 0}
+
+
+_upstream_synthesize = engine.synthesize
+
+
+def _locked_synthesize(*args, **kwargs):
+    with _model_lock:
+        return _upstream_synthesize(*args, **kwargs)
+
+
+engine.synthesize = _locked_synthesize
+if getattr(server, "synthesize", None) is _upstream_synthesize:
+    server.synthesize = _locked_synthesize
+
+
+class BlendVoice(BaseModel):
+    reference_audio_filename: str
+    weight: float = Field(..., gt=0.0, le=1.0)
+
+
+class BlendRequest(BaseModel):
+    text: str = Field(..., min_length=1)
+    voices: list[BlendVoice] = Field(..., min_length=1, max_length=5)
+    language: str = "en"
+    speed_factor: float = Field(default=1.0, ge=0.25, le=4.0)
+    split_text: bool = True
+    chunk_size: int = Field(default=120, ge=20, le=1000)
+    temperature: float = 0.8
+    exaggeration: float = 0.5
+    cfg_weight: float = 0.5
+    seed: int = 0
+
+
+def _reference_path(filename: str) -> str:
+    ref_dir = os.path.realpath(str(get_reference_audio_path(ensure_absolute=True)))
+    path = os.path.realpath(os.path.join(ref_dir, filename))
+    if os.path.dirname(path) != ref_dir:
+        raise HTTPException(400, f"Invalid reference filename: {filename}")
+    if not os.path.isfile(path):
+        # Not 404: the gateway reads 404 as "route missing" and falls back.
+        raise HTTPException(
+            409,
+            {
+                "code": "reference_missing",
+                "reference_audio_filename": filename,
+                "message": f"Reference file not found: {filename}",
+            },
+        )
+    return path
+
+
+def _encode_locked(model, filename: str):
+    """Return cached conditionals for ``filename``; caller holds ``_model_lock``."""
+    conds = _conditionals.get(filename)
+    if conds is not None:
+        _conditionals.move_to_end(filename)
+        _stats["hits"] += 1
+        return conds
+    previous = model.conds
+    try:
+        model.prepare_conditionals(_reference_path(filename))
+        conds = model.conds
+    finally:
+        model.conds = previous
+    _conditionals[filename] = conds
+    _stats["encodes"] += 1
+    while len(_conditionals) > _CONDITIONALS_CACHE_SIZE:
+        _conditionals.popitem(last=False)
+        _stats["evictions"] += 1
+    return conds
+
+
+def _weighted(tensors: list[torch.Tensor], weights: list[float]) -> torch.Tensor:
+    return sum(w * t for w, t in zip(weights, tensors))
+
+
+def _blend(conds_list: list, weights: list[float]):
+    total = sum(weights)
+    weights = [w / total for w in weights]
+    primary = conds_list[max(range(len(weights)), key=weights.__getitem__)]
+    if len(conds_list) == 1:
+        return primary
+
+    # Voice-encoder embeddings are unit-norm; keep the blend on the sphere.
+    speaker_emb = F.normalize(_weighted([c.t3.speaker_emb for c in conds_list], weights), dim=-1)
+    gen = dict(primary.gen)
+    gen["embedding"] = _weighted([c.gen["embedding"] for c in conds_list], weights)
+    return replace(primary, t3=replace(primary.t3, speaker_emb=speaker_emb), gen=gen)
+
+
+def _synthesize_blend_sync(req: BlendRequest) -> bytes:
+    model = engine.chatterbox_model
+    if model is None or not engine.MODEL_LOADED:
+        raise HTTPException(503, "TTS model is not loaded")
+
+    chunks = utils.chunk_text_by_sentences(req.text, req.chunk_size) if req.split_text else [req.text]
+    chunks = [c for c in chunks if c.strip()] or [req.text]
+
+    audio_parts: list[np.ndarray] = []
+    sample_rate = None
+    with _model_lock:
+        conds_list = [_encode_locked(model, v.reference_audio_filename) for v in req.voices]
+        blended = _blend(conds_list, [v.weight for v in req.voices])
+        _stats["blends"] += 1
+        previous = model.conds
+        model.conds = blended
+        try:
+            for chunk in chunks:
+                # No audio prompt: generate() uses model.conds as-is.
+                wav, sample_rate = engine.synthesize(
+                    text=chunk,
+                    audio_prompt_path=None,
+                    temperature=req.temperature,
+                    exaggeration=req.exaggeration,
+                    cfg_weight=req.cfg_weight,
+                    seed=req.seed,
+                    language=req.language,
+                )
+                if wav is None:
+                    raise HTTPException(500, "Synthesis failed")
+                audio_parts.append(wav.squeeze().detach().cpu().numpy())
+        finally:
+            model.conds = previous
+
+    audio = np.concatenate(audio_parts)
+    if req.speed_factor != 1.0:
+        audio, _ = utils.apply_speed_factor(torch.from_numpy(audio), sample_rate, req.speed_factor)
+        audio = audio.cpu().numpy() if isinstance(audio, torch.Tensor) else audio
+    buf = io.BytesIO()
+    sf.write(buf, audio, sample_rate, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+@app.post("/synapse/tts_blend")
+async def tts_blend(req: BlendRequest):
+    wav = await run_in_threadpool(_synthesize_blend_sync, req)
+    return Response(content=wav, media_type="audio/wav")
+
+
+@app.get("/synapse/conditionals")
+async def conditionals_stats():
+    return {"entries": len(_conditionals), "max_entries": _CONDITIONALS_CACHE_SIZE, **_stats}
@@ -0,0 +1,101 @@
+"""Chunked parallel transcription for long audio.
+
+The audio is cut into chunks of roughly ``chunk_seconds`` at silence gaps
+found by Silero VAD, each chunk is transcribed as its own worker-pool job (so
+chunks run concurrently and short requests can slot in between them), and the
+segments are merged back with absolute timestamps and continuous ids. Cutting
+only inside silence keeps words from being split across chunks.
+"""
+
+import numpy as np
+
+from models import TranscriptionResult, TranscriptSegment, TranscriptWord
+
+SAMPLE_RATE = 16000
+
+# Finer than the transcription VAD defaults (2 s silence) so there are enough
+# candidate cut points; padding keeps word onsets inside the chunk.
+_VAD_MIN_SILENCE_MS = 500
+_VAD_SPEECH_PAD_MS = 200
+
+
+def to_segment(seg, *, seg_id: int, offset: float = 0.0, include_words: bool = True) -> TranscriptSegment:
+    """faster-whisper segment → TranscriptSegment, shifted by ``offset`` seconds."""
+    words = None
+    if include_words and seg.words:
+        words = [
+            TranscriptWord(word=w.word, start=w.start + offset, end=w.end + offset, probability=w.probability)
+            for w in seg.words
+        ]
+    return TranscriptSegment(
+        id=seg_id, text=seg.text.strip(), start=seg.start + offset, end=seg.end + offset, words=words
+    )
+
+
+def plan_chunks(speech: list[dict], target_samples: int) -> list[tuple[int, int]]:
+    """Group VAD speech regions (sample offsets) into ``(start, end)`` chunks.
+
+    A chunk grows region by region until the next one would push it past
+    ``target_samples``; the cut then goes in the middle of the silence between
+    the two regions. A single region longer than the target stays whole.
+    """
+    if not speech:
+        return []
+    chunks = []
+    chunk_start = speech[0]["start"]
+    for previous, region in zip(speech, speech[1:]):
+        if region["end"] - chunk_start > target_samples:
+            cut = (previous["end"] + region["start"]) // 2
+            chunks.append((chunk_start, cut))
+            chunk_start = cut
+    chunks.append((chunk_start, speech[-1]["end"]))
+    return chunks
+
+
+def find_chunks(audio: np.ndarray, chunk_seconds: float) -> list[tuple[int, int]]:
+    """Speech chunks of ``audio`` (16 kHz float32) as ``(start, end)`` sample offsets."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    speech = get_speech_timestamps(
+        audio,
+        VadOptions(min_silence_duration_ms=_VAD_MIN_SILENCE_MS, speech_pad_ms=_VAD_SPEECH_PAD_MS),
+        sampling_rate=SAMPLE_RATE,
+    )
+    return plan_chunks(speech, int(chunk_seconds * SAMPLE_RATE))
+
+
+def transcribe_chunk(
+    model, audio: np.ndarray, chunk: tuple[int, int], language: str, word_timestamps: bool
+) -> list:
+    """Decode one chunk; returns faster-whisper segments relative to the chunk start."""
+    start, end = chunk
+    segments_iter, _ = model.transcribe(audio[start:end], language=language, word_timestamps=word_timestamps)
+    # The generator does the decoding; drain it on the calling worker thread.
+    return list(segments_iter)
+
+
+def merge_chunks(
+    chunks: list[tuple[int, int]],
+    chunk_segments: list[list],
+    *,
+    language: str,
+    language_probability: float,
+    duration: float,
+    word_timestamps: bool,
+) -> dict:
+    """Per-chunk segments → one TranscriptionResult dict with absolute timestamps."""
+    segments: list[TranscriptSegment] = []
+    for (start, _end), chunk_result in zip(chunks, chunk_segments):
+        offset = start / SAMPLE_RATE
+        for seg in chunk_result:
+            segments.append(
+                to_segment(seg, seg_id=len(segments) + 1, offset=offset, include_words=word_timestamps)
+            )
+
+    return TranscriptionResult(
+        text=" ".join(seg.text for seg in segments if seg.text),
+        language=language,
+        language_probability=language_probability,
+        duration=duration,
+        segments=segments,
+    ).model_dump()
@@ -8,6 +8,22 @@ class Settings(BaseSettings):
     device: str = "cpu"
     compute_type: str = "int8"
     model_cache_dir: str = "/cache/huggingface"
+    # Concurrent decodes in one CTranslate2 model; cpu_threads is per worker (0 = library default).
+    num_workers: int = 2
+    cpu_threads: int = 0
+    # Files at least this long (seconds) are split at silences and transcribed in parallel; 0 disables.
+    long_audio_threshold_seconds: float = 600.0
+    long_audio_chunk_seconds: float = 180.0
+    # Queue priority = arrival + audio seconds * weight: short jobs overtake long ones,
+    # but a job waits at most duration * weight behind later arrivals.
+    queue_duration_weight: float = 0.25
+    # /detect-language decodes only this much of the upload (one language-head pass per 30 s).
+    language_detection_seconds: float = 60.0
+    # Uploads are decoded from memory; larger ones spill to Starlette's spool file.
+    upload_spool_max_mb: int = 128
+    decode_workers: int = 4
+    # /stream gives up its worker slot when a client reads nothing for this long.
+    stream_stall_timeout_seconds: float = 30.0
 
     host: str = "0.0.0.0"
     port: int = 8000
@@ -0,0 +1,77 @@
+"""Language detection on a bounded prefix of the upload.
+
+Only the first ``max_seconds`` of audio are decoded. Silero VAD keeps the
+speech inside that prefix (so a music or silence intro does not decide the
+language), and Whisper's language head runs on up to ``max_seconds / 30``
+windows of it, stopping at the first confident one. The cost is fixed per
+request instead of growing with the file length.
+"""
+
+import gc
+import math
+from typing import BinaryIO
+
+import numpy as np
+
+from chunked import SAMPLE_RATE
+from models import LanguageDetectionResult, LanguageInfo
+
+# Whisper's encoder window; the language head scores one window at a time.
+WINDOW_SECONDS = 30.0
+
+
+def decode_prefix(input_file: str | BinaryIO, max_seconds: float) -> np.ndarray:
+    """Decode at most ``max_seconds`` of audio as 16 kHz mono float32."""
+    import av
+
+    max_samples = int(max_seconds * SAMPLE_RATE)
+    resampler = av.audio.resampler.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+    parts: list[np.ndarray] = []
+    total = 0
+    with av.open(input_file, mode="r", metadata_errors="ignore") as container:
+        frames = container.decode(audio=0)
+        while total < max_samples:
+            try:
+                frame = next(frames)
+            except StopIteration:
+                frame = None  # flush the resampler
+            except av.error.InvalidDataError:
+                continue
+            for resampled in resampler.resample(frame):
+                array = resampled.to_ndarray().reshape(-1)
+                parts.append(array)
+                total += len(array)
+            if frame is None:
+                break
+    # Same workaround as faster_whisper.audio.decode_audio: resampler objects
+    # are only freed by a collection.
+    del resampler
+    gc.collect()
+
+    if not parts:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(parts)[:max_samples].astype(np.float32) / 32768.0
+
+
+def speech_only(audio: np.ndarray) -> np.ndarray:
+    """The VAD speech regions of ``audio`` joined together; ``audio`` itself if none."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    speech = get_speech_timestamps(audio, VadOptions(), sampling_rate=SAMPLE_RATE)
+    if not speech:
+        return audio
+    return np.concatenate([audio[region["start"]:region["end"]] for region in speech])
+
+
+def detect_from_prefix(model, audio: np.ndarray, *, max_seconds: float, top_k: int) -> dict:
+    """LanguageDetectionResult dict for a decoded prefix, with the ``top_k`` candidates."""
+    speech = speech_only(audio)
+    language, probability, all_probs = model.detect_language(
+        speech, language_detection_segments=max(1, math.ceil(max_seconds / WINDOW_SECONDS))
+    )
+    ranked = sorted(all_probs, key=lambda item: item[1], reverse=True)[: max(1, top_k)]
+    return LanguageDetectionResult(
+        detected_language=language,
+        probability=probability,
+        all_languages=[LanguageInfo(code=code, name=code, probability=prob) for code, prob in ranked],
+    ).model_dump()
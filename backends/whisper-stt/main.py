@@ -2,39 +2,54 @@
 
 Endpoints:
   POST /transcribe       — Full transcription with word timestamps
-  POST /detect-language   — Detect spoken language
+  POST /detect-language   — Detect spoken language (bounded prefix, top-k)
   POST /stream            — SSE streaming segments
   GET  /health            — Health check
 """
 
 import asyncio
+import concurrent.futures
+import json
 import logging
-import tempfile
+import threading
+import time
 from collections.abc import AsyncGenerator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from typing import BinaryIO
+
+import numpy as np
 
 from fastapi import FastAPI, File, Form, UploadFile
 from fastapi.responses import JSONResponse
 from sse_starlette.sse import EventSourceResponse
+from starlette.formparsers import MultiPartParser
 
+from chunked import SAMPLE_RATE, find_chunks, merge_chunks, to_segment, transcribe_chunk
 from config import settings
-from models import (
-    LanguageDetectionResult,
-    LanguageInfo,
-    TranscriptionResult,
-    TranscriptSegment,
-    TranscriptWord,
-)
+from detect import WINDOW_SECONDS, decode_prefix, detect_from_prefix
+from models import TranscriptionResult
+from worker_pool import FairWorkerPool
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
 _MODEL_LOAD_TIMEOUT = 600.0
+# Decoded segments buffered ahead of a slow SSE client before decoding pauses.
+_STREAM_QUEUE_SEGMENTS = 16
+_STREAM_PUT_POLL_SECONDS = 0.25
+_STREAM_DONE = object()
 
 # --- Engine ---
 
 _model = None
-_lock = asyncio.Lock()
+_load_lock = asyncio.Lock()
+# All inference runs through the pool: one slot per CTranslate2 worker.
+_pool = FairWorkerPool(slots=settings.num_workers, duration_weight=settings.queue_duration_weight)
+# Uploads are decoded by PyAV straight from the request's upload buffer.
+_decode_executor = ThreadPoolExecutor(max_workers=max(1, settings.decode_workers), thread_name_prefix="stt-decode")
+# Keep uploads up to this size in memory instead of rolling them to a temp file.
+MultiPartParser.spool_max_size = settings.upload_spool_max_mb * 1024 * 1024
 
 
 def _load_model():
@@ -45,6 +60,8 @@ def _load_model():
         device=settings.device,
         compute_type=settings.compute_type,
         download_root=settings.model_cache_dir,
+        cpu_threads=settings.cpu_threads,
+        num_workers=max(1, settings.num_workers),
     )
 
 
@@ -52,7 +69,7 @@ async def _ensure_loaded():
     global _model
     if _model is not None:
         return
-    async with _lock:
+    async with _load_lock:
         if _model is not None:
             return
         logger.info("Loading STT model: %s (device=%s, compute=%s)",
@@ -67,25 +84,28 @@ async def _ensure_loaded():
 
 # --- Sync inference helpers ---
 
-def _transcribe_sync(audio_path: str, language: str | None, word_timestamps: bool) -> dict:
+def _use_chunked(duration: float) -> bool:
+    threshold = settings.long_audio_threshold_seconds
+    return settings.num_workers > 1 and threshold > 0 and duration >= threshold
+
+
+def _decode_sync(source: BinaryIO) -> np.ndarray:
+    from faster_whisper.audio import decode_audio
+
+    return decode_audio(source, sampling_rate=SAMPLE_RATE)
+
+
+def _transcribe_sync(audio: np.ndarray, language: str | None, word_timestamps: bool) -> dict:
     kwargs = {"word_timestamps": word_timestamps}
     if language:
         kwargs["language"] = language
 
-    segments_iter, info = _model.transcribe(audio_path, **kwargs)
+    segments_iter, info = _model.transcribe(audio, **kwargs)
 
     segments = []
     full_text_parts = []
     for seg in segments_iter:
-        words = None
-        if word_timestamps and seg.words:
-            words = [
-                TranscriptWord(word=w.word, start=w.start, end=w.end, probability=w.probability)
-                for w in seg.words
-            ]
-        segments.append(TranscriptSegment(
-            id=seg.id, text=seg.text.strip(), start=seg.start, end=seg.end, words=words
-        ))
+        segments.append(to_segment(seg, seg_id=seg.id, include_words=word_timestamps))
         full_text_parts.append(seg.text.strip())
 
     return TranscriptionResult(
@@ -97,40 +117,117 @@ def _transcribe_sync(audio_path: str, language: str | None, word_timestamps: boo
     ).model_dump()
 
 
-def _detect_language_sync(audio_path: str) -> dict:
-    _, info = _model.transcribe(audio_path, language=None)
+def _detect_language_sync(audio: np.ndarray, max_seconds: float, top_k: int) -> dict:
+    return detect_from_prefix(_model, audio, max_seconds=max_seconds, top_k=top_k)
 
-    all_langs = []
-    if hasattr(info, "all_language_probs") and info.all_language_probs:
-        sorted_probs = sorted(info.all_language_probs, key=lambda x: x[1], reverse=True)[:5]
-        all_langs = [LanguageInfo(code=lang, name=lang) for lang, _ in sorted_probs]
-
-    return LanguageDetectionResult(
-        detected_language=info.language,
-        probability=info.language_probability,
-        all_languages=all_langs,
-    ).model_dump()
 
+def _put_segment(
+    loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, item, cancelled: threading.Event
+) -> bool:
+    """Block the decode thread until ``queue`` has room.
 
-def _stream_segments_sync(audio_path: str, language: str | None) -> list[dict]:
+    False once the client is gone, or when it has not read anything for
+    ``stream_stall_timeout_seconds`` (so the stream stops holding a slot).
+    """
+    future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+    deadline = time.monotonic() + settings.stream_stall_timeout_seconds
+    while True:
+        try:
+            future.result(timeout=_STREAM_PUT_POLL_SECONDS)
+            return True
+        except concurrent.futures.TimeoutError:
+            if cancelled.is_set() or time.monotonic() >= deadline:
+                future.cancel()
+                return False
+
+
+def _stream_segments_sync(
+    audio: np.ndarray,
+    language: str | None,
+    loop: asyncio.AbstractEventLoop,
+    queue: asyncio.Queue,
+    cancelled: threading.Event,
+) -> bool:
+    """Decode segments one at a time, handing each to ``queue`` as soon as it exists.
+
+    faster-whisper decodes lazily while the generator is iterated, so a full
+    queue pauses decoding and ``cancelled`` stops it between segments.
+    Returns False if it stopped before queueing ``_STREAM_DONE``.
+    """
+    if cancelled.is_set():
+        return False
     kwargs = {"word_timestamps": True}
     if language:
         kwargs["language"] = language
 
-    segments_iter, _ = _model.transcribe(audio_path, **kwargs)
+    segments_iter, _ = _model.transcribe(audio, **kwargs)
+    try:
+        for seg in segments_iter:
+            if cancelled.is_set():
+                return False
+            segment = to_segment(seg, seg_id=seg.id).model_dump()
+            if not _put_segment(loop, queue, segment, cancelled):
+                return False
+    finally:
+        segments_iter.close()
+    return _put_segment(loop, queue, _STREAM_DONE, cancelled)
 
-    segments = []
-    for seg in segments_iter:
-        words = None
-        if seg.words:
-            words = [
-                TranscriptWord(word=w.word, start=w.start, end=w.end, probability=w.probability)
-                for w in seg.words
-            ]
-        segments.append(TranscriptSegment(
-            id=seg.id, text=seg.text.strip(), start=seg.start, end=seg.end, words=words
-        ).model_dump())
-    return segments
+
+# --- Scheduling ---
+
+async def _decode_upload(file: UploadFile, decode, *args) -> np.ndarray:
+    """Run ``decode(file, *args)`` on the decode pool, reading the upload buffer in place."""
+    await file.seek(0)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_decode_executor, decode, file.file, *args)
+
+
+async def _decode(file: UploadFile) -> tuple[np.ndarray, float]:
+    """Decode outside the worker pool so the duration is known before queueing."""
+    audio = await _decode_upload(file, _decode_sync)
+    return audio, len(audio) / SAMPLE_RATE
+
+
+async def _transcribe_chunked(
+    audio: np.ndarray, duration: float, language: str | None, word_timestamps: bool
+) -> dict:
+    """Long audio: detection and every chunk are separate pool jobs."""
+    chunks = await asyncio.to_thread(find_chunks, audio, settings.long_audio_chunk_seconds)
+
+    language_probability = 1.0
+    if not language:
+        if not chunks:
+            language, language_probability = "en", 0.0
+        else:
+            # Decide once from the first speech so every chunk decodes the same language.
+            language, language_probability, _ = await _pool.run(
+                WINDOW_SECONDS, _model.detect_language, audio[chunks[0][0]:]
+            )
+
+    tasks = [
+        asyncio.ensure_future(
+            _pool.run(
+                (end - start) / SAMPLE_RATE,
+                transcribe_chunk, _model, audio, (start, end), language, word_timestamps,
+            )
+        )
+        for start, end in chunks
+    ]
+    try:
+        chunk_segments = await asyncio.gather(*tasks)
+    finally:
+        # On failure or disconnect, give queued chunks' slots back to other requests.
+        for task in tasks:
+            task.cancel()
+
+    return merge_chunks(
+        chunks,
+        chunk_segments,
+        language=language,
+        language_probability=language_probability,
+        duration=duration,
+        word_timestamps=word_timestamps,
+    )
 
 
 # --- App ---
@@ -145,29 +242,14 @@ async def lifespan(app: FastAPI):
 app = FastAPI(title="Whisper STT", lifespan=lifespan)
 
 
-async def _save_upload(file: UploadFile) -> str:
-    """Save uploaded file to a temp path and return the path."""
-    suffix = ".wav"
-    if file.filename and "." in file.filename:
-        suffix = "." + file.filename.rsplit(".", 1)[1]
-    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
-    content = await file.read()
-    tmp.write(content)
-    tmp.close()
-    return tmp.name
-
-
-def _cleanup(path: str):
-    import os
-    try:
-        os.unlink(path)
-    except OSError:
-        pass
-
-
 @app.get("/health")
 async def health():
-    return {"status": "ok", "model_loaded": _model is not None, "model": settings.model_size}
+    return {
+        "status": "ok",
+        "model_loaded": _model is not None,
+        "model": settings.model_size,
+        "workers": _pool.stats(),
+    }
 
 
 @app.post("/transcribe")
@@ -177,29 +259,24 @@ async def transcribe(
     word_timestamps: bool = Form(True),
 ):
     await _ensure_loaded()
-    tmp_path = await _save_upload(file)
-    try:
-        async with _lock:
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, _transcribe_sync, tmp_path, language, word_timestamps
-            )
-        return JSONResponse(result)
-    finally:
-        _cleanup(tmp_path)
+    audio, duration = await _decode(file)
+    if _use_chunked(duration):
+        result = await _transcribe_chunked(audio, duration, language, word_timestamps)
+    else:
+        result = await _pool.run(duration, _transcribe_sync, audio, language, word_timestamps)
+    return JSONResponse(result)
 
 
 @app.post("/detect-language")
-async def detect_language(file: UploadFile = File(...)):
+async def detect_language(
+    file: UploadFile = File(...),
+    top_k: int = Form(5),
+):
     await _ensure_loaded()
-    tmp_path = await _save_upload(file)
-    try:
-        async with _lock:
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, _detect_language_sync, tmp_path)
-        return JSONResponse(result)
-    finally:
-        _cleanup(tmp_path)
+    max_seconds = settings.language_detection_seconds
+    audio = await _decode_upload(file, decode_prefix, max_seconds)
+    result = await _pool.run(len(audio) / SAMPLE_RATE, _detect_language_sync, audio, max_seconds, top_k)
+    return JSONResponse(result)
 
 
 @app.post("/stream")
@@ -208,21 +285,52 @@ async def stream_transcribe(
     language: str | None = Form(None),
 ):
     await _ensure_loaded()
-    tmp_path = await _save_upload(file)
+    audio, duration = await _decode(file)
 
     async def event_generator() -> AsyncGenerator:
-        try:
-            async with _lock:
-                loop = asyncio.get_event_loop()
-                segments = await loop.run_in_executor(
-                    None, _stream_segments_sync, tmp_path, language
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_QUEUE_SEGMENTS)
+        cancelled = threading.Event()
+        loop = asyncio.get_running_loop()
+
+        async def produce() -> bool:
+            # The slot is held only while decoding, not while the client drains
+            # the queue, and is given up if the client stalls.
+            async with _pool.slot(duration):
+                return await loop.run_in_executor(
+                    _pool.executor, _stream_segments_sync, audio, language, loop, queue, cancelled
                 )
-            import json
-            for seg in segments:
-                yield {"event": "segment", "data": json.dumps(seg)}
+
+        producer = asyncio.ensure_future(produce())
+        getter = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    if producer.exception() is not None:
+                        raise producer.exception()
+                    if not producer.result():
+                        detail = f"Client read nothing for {settings.stream_stall_timeout_seconds:g}s; stream stopped"
+                        logger.warning("Streaming transcription: %s", detail)
+                        yield {"event": "error", "data": json.dumps({"detail": detail})}
+                        return
+                    # Finished cleanly, so the sentinel is queued behind any segments.
+                    item = await getter
+                else:
+                    item = getter.result()
+                if item is _STREAM_DONE:
+                    break
+                yield {"event": "segment", "data": json.dumps(item)}
             yield {"event": "done", "data": "{}"}
+        except Exception as e:
+            logger.exception("Streaming transcription failed")
+            yield {"event": "error", "data": json.dumps({"detail": str(e)})}
         finally:
-            _cleanup(tmp_path)
+            # Client gone or stream over: stop decoding; the producer releases its slot.
+            cancelled.set()
+            if getter is not None:
+                getter.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
 
     return EventSourceResponse(event_generator())
 
@@ -27,6 +27,7 @@ class TranscriptionResult(BaseModel):
 class LanguageInfo(BaseModel):
     code: str
     name: str
+    probability: float | None = None
 
 
 class LanguageDetectionResult(BaseModel):
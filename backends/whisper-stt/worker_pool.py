@@ -0,0 +1,93 @@
+"""Fair scheduling of inference work onto CTranslate2 worker slots.
+
+The model runs ``slots`` decodes at once (``WhisperModel(num_workers=...)``).
+Waiting work is ordered by a virtual start time: arrival time plus
+``duration_weight`` seconds per second of audio. A 2 s language detection
+therefore overtakes a queued 20 min transcription, while a long job is never
+postponed by more than ``duration * duration_weight`` behind later arrivals.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any
+
+_WAIT_SAMPLES = 512
+
+
+class FairWorkerPool:
+    def __init__(self, *, slots: int, duration_weight: float):
+        self.slots = max(1, slots)
+        self._duration_weight = max(0.0, duration_weight)
+        # One thread per slot: work holding a slot always has a thread to run on.
+        self.executor = ThreadPoolExecutor(max_workers=self.slots, thread_name_prefix="stt-worker")
+        self._busy = 0
+        self._waiters: list[tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._waits: deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self._completed = 0
+        self._running_audio_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self, audio_seconds: float) -> AsyncIterator[None]:
+        """Hold one worker slot, queueing fairly by ``audio_seconds``."""
+        queued_at = time.monotonic()
+        await self._acquire(queued_at + audio_seconds * self._duration_weight)
+        self._waits.append(time.monotonic() - queued_at)
+        self._running_audio_seconds += audio_seconds
+        try:
+            yield
+        finally:
+            self._running_audio_seconds -= audio_seconds
+            self._completed += 1
+            self._release()
+
+    async def run(self, audio_seconds: float, fn: Callable[..., Any], *args) -> Any:
+        """Run blocking ``fn(*args)`` on a worker thread once a slot is free."""
+        async with self.slot(audio_seconds):
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+        now = time.monotonic()
+        oldest = min((key for key, _, fut in self._waiters if not fut.done()), default=None)
+        return {
+            "slots": self.slots,
+            "busy": self._busy,
+            "queue_depth": sum(1 for _, _, fut in self._waiters if not fut.done()),
+            "running_audio_seconds": round(self._running_audio_seconds, 1),
+            "completed": self._completed,
+            "wait_seconds_p50": round(waits[len(waits) // 2], 3) if waits else 0.0,
+            "wait_seconds_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 3) if waits else 0.0,
+            "wait_seconds_max": round(waits[-1], 3) if waits else 0.0,
+            # Virtual start of the next waiter relative to now (negative = overdue).
+            "next_priority_seconds": round(oldest - now, 3) if oldest is not None else None,
+        }
+
+    async def _acquire(self, priority: float) -> None:
+        if self._busy < self.slots and not self._waiters:
+            self._busy += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on.
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Hand the slot straight to the next waiter; busy count is unchanged.
+                future.set_result(None)
+                return
+        self._busy -= 1
@@ -0,0 +1 @@
+"""Gateway load-test and benchmark harness (see ``python -m bench.run --help``)."""
@@ -0,0 +1,411 @@
+"""In-process mock backends for gateway benchmarks.
+
+Each mock imitates the HTTP surface the gateway uses for one backend
+(llama-router, llama-embed, chatterbox-tts, whisper-stt, pyannote-speaker,
+deepfilter-audio) with configurable latency, streaming cadence and payload
+sizes. Upload handlers drain the request body so upload throughput is real.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import socket
+import struct
+import threading
+from dataclasses import asdict, dataclass, fields
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+
+@dataclass
+class MockSettings:
+    """Latency and payload knobs shared by all mocks (milliseconds, bytes)."""
+
+    chat_latency_ms: float = 40.0
+    chat_stream_tokens: int = 64
+    chat_token_interval_ms: float = 10.0
+    model_swap_seconds: float = 1.5
+    embed_latency_ms: float = 15.0
+    embed_dim: int = 1024
+    tts_latency_ms: float = 150.0
+    tts_audio_seconds: float = 4.0
+    tts_sample_rate: int = 24000
+    tts_chunk_ms: float = 250.0
+    tts_chunk_interval_ms: float = 40.0
+    stt_latency_ms: float = 200.0
+    stt_segments: int = 8
+    stt_segment_interval_ms: float = 50.0
+    speaker_latency_ms: float = 150.0
+    audio_latency_ms: float = 80.0
+    audio_chunk_bytes: int = 64 * 1024
+    audio_chunk_interval_ms: float = 5.0
+
+    def update(self, overrides: dict[str, str]) -> None:
+        types = {f.name: f.type for f in fields(self)}
+        for key, raw in overrides.items():
+            if key not in types:
+                raise KeyError(f"Unknown mock setting: {key}")
+            setattr(self, key, int(raw) if types[key] in (int, "int") else float(raw))
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+async def _sleep_ms(ms: float) -> None:
+    if ms > 0:
+        await asyncio.sleep(ms / 1000.0)
+
+
+async def _drain(request: Request) -> int:
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+    return size
+
+
+def _health(_request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok"})
+
+
+# --- llama-router ---
+
+
+class _RouterState:
+    def __init__(self, settings: MockSettings, models: list[str]):
+        self.settings = settings
+        self.status = {model: "unloaded" for model in models}
+        self._tasks: set[asyncio.Task] = set()
+
+    def catalog(self) -> list[dict]:
+        return [
+            {"id": model, "object": "model", "status": {"value": value, "args": []}}
+            for model, value in self.status.items()
+        ]
+
+    async def _finish_load(self, model: str) -> None:
+        await asyncio.sleep(self.settings.model_swap_seconds)
+        if self.status.get(model) == "loading":
+            self.status[model] = "loaded"
+
+    def load(self, model: str) -> bool:
+        if model not in self.status:
+            return False
+        if self.status[model] != "loaded":
+            self.status[model] = "loading"
+            task = asyncio.get_running_loop().create_task(self._finish_load(model))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return True
+
+
+def llama_router_app(settings: MockSettings, models: list[str]) -> Starlette:
+    state = _RouterState(settings, models)
+
+    async def list_models(_request: Request):
+        return JSONResponse({"object": "list", "data": state.catalog()})
+
+    async def load(request: Request):
+        body = await request.json()
+        if not state.load(body.get("model", "")):
+            return JSONResponse({"error": "unknown model"}, status_code=404)
+        return JSONResponse({"success": True})
+
+    async def unload(request: Request):
+        body = await request.json()
+        state.status[body.get("model", "")] = "unloaded"
+        return JSONResponse({"success": True})
+
+    async def chat(request: Request):
+        body = await request.json()
+        model = body.get("model")
+        if state.status.get(model) != "loaded":
+            return JSONResponse({"error": f"model {model} not loaded"}, status_code=503)
+        await _sleep_ms(settings.chat_latency_ms)
+        if not body.get("stream"):
+            return JSONResponse({
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "token " * settings.chat_stream_tokens},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 16, "completion_tokens": settings.chat_stream_tokens},
+            })
+
+        async def events():
+            for index in range(settings.chat_stream_tokens):
+                chunk = {
+                    "id": "chatcmpl-bench",
+                    "object": "chat.completion.chunk",
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": f"tok{index} "}}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n".encode()
+                await _sleep_ms(settings.chat_token_interval_ms)
+            yield b"data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return Starlette(routes=[
+        Route("/health", _health),
+        Route("/models", list_models),
+        Route("/v1/models", list_models),
+        Route("/models/load", load, methods=["POST"]),
+        Route("/models/unload", unload, methods=["POST"]),
+        Route("/v1/chat/completions", chat, methods=["POST"]),
+    ])
+
+
+# --- llama-embed ---
+
+
+def llama_embed_app(settings: MockSettings) -> Starlette:
+    vector = [round(random.uniform(-1, 1), 6) for _ in range(settings.embed_dim)]
+
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        await _sleep_ms(settings.embed_latency_ms)
+        return JSONResponse({
+            "object": "list",
+            "data": [{"object": "embedding", "index": i, "embedding": vector} for i in range(len(inputs))],
+            "model": body.get("model", "bench-embed"),
+            "usage": {"prompt_tokens": 8 * len(inputs), "total_tokens": 8 * len(inputs)},
+        })
+
+    async def models(_request: Request):
+        return JSONResponse({"object": "list", "data": [{"id": "bench-embed", "object": "model"}]})
+
+    return Starlette(routes=[
+        Route("/health", _health),
+        Route("/v1/models", models),
+        Route("/v1/embeddings", embeddings, methods=["POST"]),
+    ])
+
+
+# --- chatterbox-tts ---
+
+
+def _wav_header(sample_rate: int, data_size: int) -> bytes:
+    return (
+        b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVEfmt "
+        + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        + b"data" + struct.pack("<I", data_size)
+    )
+
+
+def chatterbox_app(settings: MockSettings) -> Starlette:
+    references: set[str] = set()
+
+    async def wav_stream():
+        total = int(settings.tts_audio_seconds * settings.tts_sample_rate) * 2
+        chunk = int(settings.tts_chunk_ms / 1000.0 * settings.tts_sample_rate) * 2 or total
+        silence = bytes(chunk)
+        await _sleep_ms(settings.tts_latency_ms)
+        yield _wav_header(settings.tts_sample_rate, total)
+        sent = 0
+        while sent < total:
+            part = min(chunk, total - sent)
+            yield silence[:part]
+            sent += part
+            await _sleep_ms(settings.tts_chunk_interval_ms)
+
+    def _length() -> str:
+        return str(44 + int(settings.tts_audio_seconds * settings.tts_sample_rate) * 2)
+
+    async def tts(request: Request):
+        await request.body()
+        return StreamingResponse(wav_stream(), media_type="audio/wav", headers={"Content-Length": _length()})
+
+    async def upload_reference(request: Request):
+        form = await request.form()
+        upload = form["files"]
+        references.add(upload.filename)
+        return JSONResponse({"uploaded_files": [upload.filename]})
+
+    async def reference_files(_request: Request):
+        return JSONResponse(sorted(references))
+
+    return Starlette(routes=[
+        Route("/health", _health),
+        Route("/api/ui/initial-data", _health),
+        Route("/tts", tts, methods=["POST"]),
+        Route("/synapse/tts_blend", tts, methods=["POST"]),
+        Route("/v1/audio/speech", tts, methods=["POST"]),
+        Route("/upload_reference", upload_reference, methods=["POST"]),
+        Route("/get_reference_files", reference_files),
+    ])
+
+
+# --- whisper-stt ---
+
+
+def whisper_app(settings: MockSettings) -> Starlette:
+    def _segments() -> list[dict]:
+        return [
+            {"id": i, "start": i * 2.0, "end": i * 2.0 + 1.8, "text": f"segment {i}"}
+            for i in range(settings.stt_segments)
+        ]
+
+    async def transcribe(request: Request):
+        size = await _drain(request)
+        await _sleep_ms(settings.stt_latency_ms)
+        segments = _segments()
+        return JSONResponse({
+            "text": " ".join(s["text"] for s in segments),
+            "language": "en",
+            "language_probability": 0.99,
+            "duration": segments[-1]["end"] if segments else 0.0,
+            "segments": segments,
+            "bytes_received": size,
+        })
+
+    async def detect_language(request: Request):
+        await _drain(request)
+        await _sleep_ms(settings.stt_latency_ms / 4)
+        return JSONResponse({
+            "detected_language": "en",
+            "language_probability": 0.99,
+            "all_languages": [{"language": "en", "probability": 0.99}],
+        })
+
+    async def stream(request: Request):
+        await _drain(request)
+
+        async def events():
+            await _sleep_ms(settings.stt_latency_ms)
+            for segment in _segments():
+                yield f"event: segment\ndata: {json.dumps(segment)}\n\n".encode()
+                await _sleep_ms(settings.stt_segment_interval_ms)
+            yield b"event: done\ndata: {}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return Starlette(routes=[
+        Route("/health", _health),
+        Route("/transcribe", transcribe, methods=["POST"]),
+        Route("/detect-language", detect_language, methods=["POST"]),
+        Route("/stream", stream, methods=["POST"]),
+    ])
+
+
+# --- pyannote-speaker ---
+
+
+def pyannote_app(settings: MockSettings) -> Starlette:
+    async def diarize(request: Request):
+        await _drain(request)
+        await _sleep_ms(settings.speaker_latency_ms)
+        return JSONResponse({
+            "segments": [
+                {"start": i * 3.0, "end": i * 3.0 + 2.5, "speaker": f"SPEAKER_{i % 2:02d}"}
+                for i in range(8)
+            ],
+            "num_speakers": 2,
+        })
+
+    async def verify(request: Request):
+        await _drain(request)
+        await _sleep_ms(settings.speaker_latency_ms)
+        return JSONResponse({"similarity": 0.87, "is_same_speaker": True})
+
+    return Starlette(routes=[
+        Route("/health", _health),
+        Route("/diarize", diarize, methods=["POST"]),
+        Route("/verify", verify, methods=["POST"]),
+    ])
+
+
+# --- deepfilter-audio ---
+
+
+def deepfilter_app(settings: MockSettings) -> Starlette:
+    async def process(request: Request):
+        size = await _drain(request)
+        await _sleep_ms(settings.audio_latency_ms)
+        chunk = bytes(settings.audio_chunk_bytes)
+
+        async def body():
+            sent = 0
+            while sent < size:
+                part = min(len(chunk), size - sent)
+                yield chunk[:part]
+                sent += part
+                await _sleep_ms(settings.audio_chunk_interval_ms)
+
+        return StreamingResponse(body(), media_type="audio/wav", headers={"Content-Length": str(size)})
+
+    return Starlette(routes=[
+        Route("/health", _health),
+        Route("/denoise", process, methods=["POST"]),
+        Route("/convert", process, methods=["POST"]),
+    ])
+
+
+BENCH_CHAT_MODELS = ["bench-general", "bench-coder"]
+
+
+def build_apps(settings: MockSettings) -> dict[str, Starlette]:
+    """Mock app per backend name in config/backends.yaml."""
+    return {
+        "llama-router": llama_router_app(settings, BENCH_CHAT_MODELS),
+        "llama-embed": llama_embed_app(settings),
+        "chatterbox-tts": chatterbox_app(settings),
+        "whisper-stt": whisper_app(settings),
+        "pyannote-speaker": pyannote_app(settings),
+        "deepfilter-audio": deepfilter_app(settings),
+    }
+
+
+class MockBackends:
+    """Serves every mock on its own localhost port from one background thread."""
+
+    def __init__(self, settings: MockSettings):
+        self._apps = build_apps(settings)
+        self.urls: dict[str, str] = {}
+        self._servers: list[uvicorn.Server] = []
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    def start(self) -> dict[str, str]:
+        sockets = {}
+        for name in self._apps:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(("127.0.0.1", 0))
+            sockets[name] = sock
+            self.urls[name] = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+        async def serve_all():
+            tasks = []
+            for name, app in self._apps.items():
+                server = uvicorn.Server(uvicorn.Config(app, log_level="warning", access_log=False))
+                server.install_signal_handlers = lambda: None
+                self._servers.append(server)
+                tasks.append(asyncio.create_task(server.serve(sockets=[sockets[name]])))
+            while not all(server.started for server in self._servers):
+                await asyncio.sleep(0.01)
+            self._ready.set()
+            await asyncio.gather(*tasks)
+
+        self._thread = threading.Thread(target=lambda: asyncio.run(serve_all()), daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("Mock backends did not start")
+        return self.urls
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=10)
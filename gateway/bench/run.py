@@ -0,0 +1,262 @@
+"""Run the gateway benchmark against mock backends.
+
+Usage (from gateway/):
+  python -m bench.run                                  # all scenarios
+  python -m bench.run --scenarios chat,tts --scale 0.25
+  python -m bench.run --save bench/baseline.json       # record a baseline
+  python -m bench.run --compare bench/baseline.json    # exit 1 on regression
+  python -m bench.run --mock tts_latency_ms=400 --mock embed_dim=4096
+
+The gateway runs as a real uvicorn subprocess (so its CPU and RSS can be
+measured in isolation); the mocks run in this process on their own thread.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import yaml
+
+from .mock_backends import MockBackends, MockSettings
+from .workloads import MIXED_PHASE, ProcessSampler, build_scenarios, run_mixed, run_scenario
+
+GATEWAY_DIR = Path(__file__).resolve().parent.parent
+BACKENDS_CONFIG = GATEWAY_DIR.parent / "config" / "backends.yaml"
+
+# (metric, higher_is_worse, absolute noise floor) checked by --compare.
+_COMPARED_METRICS = (
+    ("p50_ms", True, 2.0),
+    ("p99_ms", True, 5.0),
+    ("throughput_rps", False, 0.5),
+    ("cpu_ms_per_request", True, 0.2),
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _write_backends_config(path: Path, urls: dict[str, str]) -> None:
+    """Production backends.yaml (pool limits included) pointed at the mocks."""
+    with open(BACKENDS_CONFIG) as f:
+        config = yaml.safe_load(f)
+    for name, backend in config["backends"].items():
+        backend["url"] = urls[name]
+    with open(path, "w") as f:
+        yaml.safe_dump(config, f)
+
+
+def _gateway_env(workdir: Path, config_path: Path) -> dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "SYNAPSE_GATEWAY_CONFIG_PATH": str(config_path),
+        "SYNAPSE_VOICE_LIBRARY_DIR": str(workdir / "voices"),
+        "SYNAPSE_MODEL_PROFILES_PATH": str(workdir / "model-profiles.json"),
+        "SYNAPSE_TTS_REFERENCE_CACHE_PATH": str(workdir / "chatterbox-references.json"),
+        # Every request must reach the mock; cache hits would measure the disk.
+        "SYNAPSE_TTS_CACHE_ENABLED": "false",
+        "SYNAPSE_STT_CACHE_ENABLED": "false",
+        "SYNAPSE_LOG_LEVEL": "WARNING",
+    })
+    return env
+
+
+def _start_gateway(port: int, env: dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "src.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=GATEWAY_DIR,
+        env=env,
+    )
+
+
+async def _wait_healthy(base_url: str, proc: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=5.0) as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"Gateway exited with status {proc.returncode}")
+            try:
+                resp = await client.get("/health")
+                if resp.status_code == 200 and resp.json().get("status") == "healthy":
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError("Gateway did not become healthy")
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=GATEWAY_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def _benchmark(args: argparse.Namespace, mock_settings: MockSettings) -> dict:
+    scenarios = build_scenarios(upload_mb=args.upload_mb, embed_batch=args.embed_batch, scale=args.scale)
+    selected = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in scenarios and name != "mixed"]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(scenarios)}, mixed)")
+
+    mocks = MockBackends(mock_settings)
+    urls = mocks.start()
+    proc = None
+    try:
+        with tempfile.TemporaryDirectory(prefix="synapse-bench-") as tmp:
+            workdir = Path(tmp)
+            (workdir / "voices").mkdir()
+            config_path = workdir / "backends.yaml"
+            _write_backends_config(config_path, urls)
+
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            proc = _start_gateway(port, _gateway_env(workdir, config_path))
+            await _wait_healthy(base_url, proc)
+            sampler = ProcessSampler(proc.pid)
+            rss_start = sampler.rss_bytes()
+
+            results: dict[str, dict] = {}
+            limits = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+            async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+                for name in selected:
+                    if name == "mixed":
+                        result = await run_mixed(client, [scenarios[n] for n in MIXED_PHASE], sampler)
+                    else:
+                        result = await run_scenario(client, scenarios[name], sampler)
+                    results[name] = result
+                    _print_row(name, result)
+
+            return {
+                "meta": {
+                    "git_revision": _git_revision(),
+                    "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "python": platform.python_version(),
+                    "cpu_count": os.cpu_count(),
+                    "scale": args.scale,
+                    "upload_mb": args.upload_mb,
+                    "embed_batch": args.embed_batch,
+                    "gateway_rss_start_mb": round(rss_start / 1048576, 1),
+                    "mocks": mock_settings.as_dict(),
+                },
+                "scenarios": results,
+            }
+    finally:
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        mocks.stop()
+
+
+_HEADER = (
+    f"{'scenario':<12} {'done':>6} {'err':>4} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+    f"{'ttfb p50':>9} {'cpu ms/req':>10} {'rss MB':>8}"
+)
+
+
+def _ms(result: dict, key: str) -> str:
+    return f"{result[key]:>9.1f}" if key in result else f"{'-':>9}"
+
+
+def _print_row(name: str, result: dict) -> None:
+    print(
+        f"{name:<12} {result['completed']:>6} {result['errors']:>4} {result['throughput_rps']:>9.1f} "
+        f"{_ms(result, 'p50_ms')} {_ms(result, 'p99_ms')} {_ms(result, 'ttfb_p50_ms')} "
+        f"{result['cpu_ms_per_request']:>10.2f} {result['rss_peak_mb']:>8.1f}",
+        flush=True,
+    )
+    for sub_name, sub in result.get("scenarios", {}).items():
+        print(
+            f"  {sub_name:<10} {sub['completed']:>6} {sub['errors']:>4} {sub['throughput_rps']:>9.1f} "
+            f"{_ms(sub, 'p50_ms')} {_ms(sub, 'p99_ms')} {_ms(sub, 'ttfb_p50_ms')}",
+            flush=True,
+        )
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Regressions of ``current`` against ``baseline`` beyond ``tolerance``."""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        if result["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: errors {base.get('errors', 0)} -> {result['errors']}")
+        for metric, higher_is_worse, floor in _COMPARED_METRICS:
+            if metric not in result or metric not in base:
+                continue
+            old, new = base[metric], result[metric]
+            delta = new - old if higher_is_worse else old - new
+            if delta > floor and delta > tolerance * old:
+                worse = f" ({delta / old:.0%} worse)" if old else ""
+                regressions.append(f"{name}: {metric} {old} -> {new}{worse}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.run", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenarios",
+        default="chat,chat_stream,embeddings,stt_upload,stt_stream,tts,denoise,diarize,chat_swap,mixed",
+        help="Comma-separated scenarios to run, in order",
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every scenario's request count")
+    parser.add_argument("--upload-mb", type=float, default=32.0, help="Upload size for stt_upload")
+    parser.add_argument("--embed-batch", type=int, default=32, help="Inputs per embeddings request")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request client timeout (seconds)")
+    parser.add_argument("--mock", action="append", default=[], metavar="KEY=VALUE", help="Override a MockSettings field")
+    parser.add_argument("--save", type=Path, help="Write results as JSON (e.g. a new baseline)")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    mock_settings = MockSettings()
+    try:
+        mock_settings.update(dict(item.split("=", 1) for item in args.mock))
+    except (KeyError, ValueError) as e:
+        parser.error(f"--mock: {e}")
+
+    print(_HEADER, flush=True)
+    report = asyncio.run(_benchmark(args, mock_settings))
+
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nSaved results to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(baseline, report, args.tolerance)
+        if regressions:
+            print(f"\nRegressions vs {args.compare} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions vs {args.compare} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""Benchmark scenarios and the load driver.
+
+A scenario is a request factory plus a concurrency level. The driver runs it
+against a live gateway, streams every response to the end, and records
+latency, time to first byte and bytes moved per request, together with the
+gateway process's CPU time and memory over the phase.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import os
+import struct
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+from .mock_backends import BENCH_CHAT_MODELS
+
+
+@dataclass
+class RequestSpec:
+    method: str
+    path: str
+    json: dict | None = None
+    files: dict | None = None
+    data: dict | None = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    concurrency: int
+    requests: int
+    build: Callable[[int], RequestSpec]
+    # Unmeasured requests first (e.g. to get the right model loaded).
+    warmup: int = 1
+
+
+@dataclass
+class Sample:
+    latency: float
+    ttfb: float
+    response_bytes: int
+    ok: bool
+
+
+@dataclass
+class _ScenarioRun:
+    scenario: Scenario
+    samples: list[Sample] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+# --- Payloads ---
+
+
+def wav_bytes(size_bytes: int, sample_rate: int = 16000) -> bytes:
+    """Silent 16-bit mono WAV of roughly ``size_bytes``."""
+    data_size = max(0, size_bytes - 44) & ~1
+    header = (
+        b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVEfmt "
+        + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        + b"data" + struct.pack("<I", data_size)
+    )
+    return header + bytes(data_size)
+
+
+def _chat_body(model: str, index: int, *, stream: bool) -> dict:
+    return {
+        "model": model,
+        "stream": stream,
+        "max_tokens": 64,
+        "messages": [{"role": "user", "content": f"Benchmark prompt {index}: summarize the request path."}],
+    }
+
+
+def build_scenarios(*, upload_mb: float, embed_batch: int, scale: float) -> dict[str, Scenario]:
+    """Standard scenario set; ``scale`` multiplies every request count."""
+
+    def n(count: int, minimum: int = 1) -> int:
+        return max(minimum, int(count * scale))
+
+    upload = wav_bytes(int(upload_mb * 1024 * 1024))
+    clip = wav_bytes(1024 * 1024)
+    general, coder = BENCH_CHAT_MODELS[0], BENCH_CHAT_MODELS[1]
+    # Unique per call so the embedding cache never turns the burst into hits.
+    embed_ids = itertools.count()
+
+    def embed(_index: int) -> RequestSpec:
+        base = next(embed_ids) * embed_batch
+        return RequestSpec("POST", "/v1/embeddings", json={
+            "model": "bench-embed",
+            "input": [f"benchmark passage {base + k} " * 8 for k in range(embed_batch)],
+        })
+
+    scenarios = [
+        Scenario(
+            "chat", "non-streaming chat, one resident model", 16, n(400),
+            lambda i: RequestSpec("POST", "/v1/chat/completions", json=_chat_body(general, i, stream=False)),
+        ),
+        Scenario(
+            "chat_stream", "SSE chat completions", 16, n(200),
+            lambda i: RequestSpec("POST", "/v1/chat/completions", json=_chat_body(general, i, stream=True)),
+        ),
+        # Switches model every two requests; each switch is a full unload/load.
+        Scenario(
+            "chat_swap", "chat alternating between two models (load/unload per switch)", 2, n(16, minimum=4),
+            lambda i: RequestSpec(
+                "POST", "/v1/chat/completions", json=_chat_body(coder if (i // 2) % 2 else general, i, stream=False)
+            ),
+            warmup=0,
+        ),
+        Scenario("embeddings", f"bursts of {embed_batch} unique inputs", 8, n(150), embed),
+        Scenario(
+            "stt_upload", f"{upload_mb:g} MB multipart upload to /stt/transcribe", 4, n(16),
+            lambda i: RequestSpec("POST", "/stt/transcribe", files={"file": ("bench.wav", upload, "audio/wav")}),
+        ),
+        Scenario(
+            "stt_stream", "SSE transcription of a 1 MB clip", 8, n(40),
+            lambda i: RequestSpec("POST", "/stt/stream", files={"file": ("bench.wav", clip, "audio/wav")}),
+        ),
+        Scenario(
+            "tts", "streamed WAV from /tts/synthesize", 8, n(40),
+            lambda i: RequestSpec("POST", "/tts/synthesize", json={"text": f"Benchmark sentence number {i}."}),
+        ),
+        Scenario(
+            "denoise", "1 MB upload, streamed WAV back", 4, n(40),
+            lambda i: RequestSpec("POST", "/audio/denoise", files={"file": ("bench.wav", clip, "audio/wav")}),
+        ),
+        Scenario(
+            "diarize", "1 MB upload to /speakers/diarize", 4, n(40),
+            lambda i: RequestSpec("POST", "/speakers/diarize", files={"file": ("bench.wav", clip, "audio/wav")}),
+        ),
+    ]
+    return {scenario.name: scenario for scenario in scenarios}
+
+
+# Scenarios run concurrently in the "mixed" phase, at a quarter of their size.
+MIXED_PHASE = ("chat_stream", "embeddings", "stt_upload", "tts", "denoise")
+
+
+# --- Process accounting ---
+
+
+class ProcessSampler:
+    """CPU time and RSS of one process, read from /proc."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._ticks = os.sysconf("SC_CLK_TCK")
+        self._peak_rss = 0
+        self._task: asyncio.Task | None = None
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            # Fields after the parenthesised command name; utime/stime are 14/15.
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self._ticks
+
+    def rss_bytes(self) -> int:
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    async def __aenter__(self) -> ProcessSampler:
+        self._peak_rss = self.rss_bytes()
+        self._cpu_start = self.cpu_seconds()
+        self._task = asyncio.create_task(self._watch())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self.cpu = self.cpu_seconds() - self._cpu_start
+        self.rss_end = self.rss_bytes()
+        self.rss_peak = max(self._peak_rss, self.rss_end)
+
+    async def _watch(self) -> None:
+        while True:
+            self._peak_rss = max(self._peak_rss, self.rss_bytes())
+            await asyncio.sleep(0.1)
+
+
+# --- Driver ---
+
+
+async def _send(client: httpx.AsyncClient, spec: RequestSpec) -> Sample:
+    started = time.perf_counter()
+    ttfb = 0.0
+    size = 0
+    async with client.stream(spec.method, spec.path, json=spec.json, files=spec.files, data=spec.data) as resp:
+        async for chunk in resp.aiter_raw():
+            if chunk and not ttfb:
+                ttfb = time.perf_counter() - started
+            size += len(chunk)
+        ok = resp.status_code < 400
+    latency = time.perf_counter() - started
+    return Sample(latency=latency, ttfb=ttfb or latency, response_bytes=size, ok=ok)
+
+
+async def _drive(client: httpx.AsyncClient, scenario: Scenario, count: int, run: _ScenarioRun | None) -> None:
+    indexes = iter(range(count))
+
+    async def worker():
+        for index in indexes:
+            try:
+                sample = await _send(client, scenario.build(index))
+            except httpx.HTTPError as e:
+                if run is not None:
+                    key = type(e).__name__
+                    run.errors[key] = run.errors.get(key, 0) + 1
+                continue
+            if run is None:
+                continue
+            run.samples.append(sample)
+            if not sample.ok:
+                run.errors["http_error"] = run.errors.get("http_error", 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(min(scenario.concurrency, count))))
+
+
+async def _run_one(client: httpx.AsyncClient, scenario: Scenario) -> _ScenarioRun:
+    run = _ScenarioRun(scenario)
+    started = time.perf_counter()
+    await _drive(client, scenario, scenario.requests, run)
+    run.elapsed = time.perf_counter() - started
+    return run
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Nearest-rank percentile.
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _summarize(run: _ScenarioRun, *, cpu_seconds: float | None = None) -> dict:
+    samples = [s for s in run.samples if s.ok]
+    latencies = [s.latency * 1000 for s in samples]
+    ttfbs = [s.ttfb * 1000 for s in samples]
+    completed = len(samples)
+    result = {
+        "requests": run.scenario.requests,
+        "concurrency": run.scenario.concurrency,
+        "completed": completed,
+        "errors": sum(run.errors.values()),
+        "error_kinds": dict(run.errors),
+        "elapsed_s": round(run.elapsed, 3),
+        "throughput_rps": round(completed / run.elapsed, 2) if run.elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "ttfb_p50_ms": round(_percentile(ttfbs, 50), 2),
+        "ttfb_p99_ms": round(_percentile(ttfbs, 99), 2),
+        "response_mb": round(sum(s.response_bytes for s in samples) / 1048576, 2),
+    }
+    if cpu_seconds is not None:
+        result["cpu_ms_per_request"] = round(cpu_seconds * 1000 / completed, 3) if completed else 0.0
+    return result
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, sampler: ProcessSampler) -> dict:
+    if scenario.warmup:
+        await _drive(client, scenario, scenario.warmup, None)
+    async with sampler:
+        run = await _run_one(client, scenario)
+    result = _summarize(run, cpu_seconds=sampler.cpu)
+    result["rss_peak_mb"] = round(sampler.rss_peak / 1048576, 1)
+    result["rss_end_mb"] = round(sampler.rss_end / 1048576, 1)
+    return result
+
+
+async def run_mixed(
+    client: httpx.AsyncClient, scenarios: list[Scenario], sampler: ProcessSampler
+) -> dict:
+    """Run several scenarios at once; CPU per request is over all of them."""
+    shrunk = [
+        Scenario(s.name, s.description, s.concurrency, max(1, s.requests // 4), s.build, s.warmup)
+        for s in scenarios
+    ]
+    for scenario in shrunk:
+        if scenario.warmup:
+            await _drive(client, scenario, scenario.warmup, None)
+    async with sampler:
+        started = time.perf_counter()
+        runs = await asyncio.gather(*(_run_one(client, s) for s in shrunk))
+        elapsed = time.perf_counter() - started
+    completed = sum(len([s for s in run.samples if s.ok]) for run in runs)
+    return {
+        "scenarios": {run.scenario.name: _summarize(run) for run in runs},
+        "completed": completed,
+        "errors": sum(sum(run.errors.values()) for run in runs),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "cpu_ms_per_request": round(sampler.cpu * 1000 / completed, 3) if completed else 0.0,
+        "rss_peak_mb": round(sampler.rss_peak / 1048576, 1),
+        "rss_end_mb": round(sampler.rss_end / 1048576, 1),
+    }
@@ -0,0 +1,109 @@
+"""Progressive compressed encoding of streamed WAV audio via ffmpeg workers."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import shutil
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+_READ_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class EncodedFormat:
+    media_type: str
+    codec: str
+    container: str
+    # Key into AudioEncoderPool bitrates; None for lossless codecs.
+    bitrate_key: str | None
+    muxer_args: tuple[str, ...] = ()
+
+
+FORMATS: dict[str, EncodedFormat] = {
+    # Short Ogg pages / WebM clusters so packets reach the client every ~200 ms.
+    "opus": EncodedFormat("audio/ogg; codecs=opus", "libopus", "ogg", "opus", ("-page_duration", "200000")),
+    "webm": EncodedFormat("audio/webm; codecs=opus", "libopus", "webm", "opus", ("-cluster_time_limit", "200")),
+    "mp3": EncodedFormat("audio/mpeg", "libmp3lame", "mp3", "mp3"),
+    "flac": EncodedFormat("audio/flac", "flac", "flac", None),
+}
+
+
+class AudioEncodeError(Exception):
+    pass
+
+
+class AudioEncoderPool:
+    """Runs at most ``max_workers`` ffmpeg encoders; further streams queue.
+
+    Each encoder is fed the WAV body as it arrives and its output is yielded
+    as soon as ffmpeg flushes it, so encoding overlaps synthesis and never
+    runs on the event loop.
+    """
+
+    def __init__(self, *, max_workers: int, bitrates_kbps: dict[str, int], ffmpeg: str = "ffmpeg"):
+        self._slots = asyncio.Semaphore(max(1, max_workers))
+        self._bitrates_kbps = bitrates_kbps
+        self._ffmpeg = shutil.which(ffmpeg)
+
+    @property
+    def available(self) -> bool:
+        return self._ffmpeg is not None
+
+    def _command(self, output_format: str) -> list[str]:
+        fmt = FORMATS[output_format]
+        command = [
+            self._ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin",
+            # The WAV header is all ffmpeg needs; default probing would buffer seconds of input.
+            "-probesize", "32", "-analyzeduration", "0",
+            "-f", "wav", "-i", "pipe:0",
+            "-c:a", fmt.codec,
+        ]
+        if fmt.bitrate_key is not None:
+            command += ["-b:a", f"{self._bitrates_kbps[fmt.bitrate_key]}k"]
+        return command + [*fmt.muxer_args, "-flush_packets", "1", "-f", fmt.container, "pipe:1"]
+
+    async def encode(self, output_format: str, wav: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Yield ``wav`` encoded as ``output_format`` while it is still arriving."""
+        if self._ffmpeg is None:
+            raise AudioEncodeError("ffmpeg is not installed")
+        async with self._slots:
+            proc = await asyncio.create_subprocess_exec(
+                *self._command(output_format),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            feeder = asyncio.create_task(self._feed(proc, wav))
+            try:
+                while chunk := await proc.stdout.read(_READ_SIZE):
+                    yield chunk
+                await feeder
+                if await proc.wait() != 0:
+                    stderr = (await proc.stderr.read()).decode("utf-8", "replace").strip()
+                    raise AudioEncodeError(f"ffmpeg {output_format} encode failed: {stderr[-500:]}")
+            finally:
+                feeder.cancel()
+                await asyncio.gather(feeder, return_exceptions=True)
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+
+    @staticmethod
+    async def _feed(proc: asyncio.subprocess.Process, wav: AsyncIterator[bytes]) -> None:
+        try:
+            async for chunk in wav:
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg exited early; its exit status carries the error.
+            return
+        finally:
+            if not proc.stdin.is_closing():
+                proc.stdin.close()
+            aclose = getattr(wav, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -1,4 +1,5 @@
 import asyncio
+import importlib.util
 import logging
 import time
 from collections.abc import AsyncIterator
@@ -6,6 +7,8 @@ from dataclasses import dataclass, field
 
 import httpx
 
+from .metrics import backend_series
+
 logger = logging.getLogger(__name__)
 
 # Timeout presets per backend type (seconds)
@@ -16,6 +19,8 @@ TIMEOUTS = {
     "stt": 600.0,
     "speaker": 600.0,
     "audio": 600.0,
+    # Async jobs run detached from any client connection.
+    "jobs": 3600.0,
     "default": 60.0,
 }
 
@@ -53,20 +58,110 @@ class CircuitBreaker:
         return True
 
 
+@dataclass
+class PoolConfig:
+    """Connection pool settings for one backend (``pool:`` block in backends.yaml)."""
+
+    max_connections: int = 50
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    # Cleartext HTTP/2 needs prior knowledge: set http2: true, http1: false.
+    http1: bool = True
+
+    @classmethod
+    def from_dict(cls, raw: dict | None) -> "PoolConfig":
+        raw = raw or {}
+        config = cls(
+            max_connections=max(1, int(raw.get("max_connections", cls.max_connections))),
+            max_keepalive_connections=max(
+                0, int(raw.get("max_keepalive_connections", cls.max_keepalive_connections))
+            ),
+            keepalive_expiry=max(0.0, float(raw.get("keepalive_expiry", cls.keepalive_expiry))),
+            http2=bool(raw.get("http2", cls.http2)),
+            http1=bool(raw.get("http1", cls.http1)),
+        )
+        config.max_keepalive_connections = min(config.max_keepalive_connections, config.max_connections)
+        return config
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class _PoolUsage:
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    requests: int = 0
+    pool_timeouts: int = 0
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response body wrapper that keeps pool usage accounted until it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, usage: _PoolUsage):
+        self._stream = stream
+        self._usage = usage
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._usage.in_flight -= 1
+        await self._stream.aclose()
+
+
 class BackendClient:
-    """Async HTTP client with retry and circuit breaker per backend."""
+    """Async HTTP client with retry and circuit breaker per backend.
+
+    Each registered backend gets its own connection pool, so a burst of slow
+    audio uploads cannot take the connections latency-sensitive LLM calls need.
+    Unregistered names and health probes use a small shared pool.
+    """
 
     def __init__(self) -> None:
         self._client: httpx.AsyncClient | None = None
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._pool_configs: dict[str, PoolConfig] = {}
+        self._usage: dict[str, _PoolUsage] = {}
         self._breakers: dict[str, CircuitBreaker] = {}
 
-    async def start(self) -> None:
+    async def start(self, backends: dict | None = None) -> None:
         self._client = httpx.AsyncClient(
             follow_redirects=True,
-            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
         )
+        for name, backend in (backends or {}).items():
+            raw_pool = backend.get("pool") if isinstance(backend, dict) else None
+            config = PoolConfig.from_dict(raw_pool)
+            if config.http2 and not _http2_available():
+                logger.warning(
+                    "HTTP/2 requested for %s but the 'h2' package is not installed; using HTTP/1.1",
+                    name,
+                )
+                config.http2 = False
+                config.http1 = True
+            self._pool_configs[name] = config
+            self._clients[name] = httpx.AsyncClient(
+                follow_redirects=True,
+                http1=config.http1,
+                http2=config.http2,
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_keepalive_connections,
+                    keepalive_expiry=config.keepalive_expiry,
+                ),
+            )
 
     async def stop(self) -> None:
+        for session in self._clients.values():
+            await session.aclose()
+        self._clients = {}
         if self._client:
             await self._client.aclose()
             self._client = None
@@ -76,12 +171,58 @@ class BackendClient:
             self._breakers[backend] = CircuitBreaker()
         return self._breakers[backend]
 
-    def _require_client(self) -> httpx.AsyncClient:
-        """Return initialized client or raise a clear runtime error."""
+    def _require_client(self, backend: str | None = None) -> httpx.AsyncClient:
+        """Return the backend's pool (or the shared one) or raise a clear runtime error."""
         if self._client is None:
             raise RuntimeError("Backend client is not started")
+        if backend is not None:
+            return self._clients.get(backend, self._client)
         return self._client
 
+    def _usage_for(self, backend: str) -> _PoolUsage:
+        usage = self._usage.get(backend)
+        if usage is None:
+            usage = self._usage[backend] = _PoolUsage()
+        return usage
+
+    def _acquire(self, backend: str) -> _PoolUsage:
+        usage = self._usage_for(backend)
+        usage.in_flight += 1
+        usage.requests += 1
+        usage.peak_in_flight = max(usage.peak_in_flight, usage.in_flight)
+        return usage
+
+    def breaker_states(self) -> dict[str, str]:
+        return {name: breaker.state for name, breaker in self._breakers.items()}
+
+    def pool_stats(self) -> dict[str, dict]:
+        """Per-backend pool limits and occupancy.
+
+        With HTTP/1.1 every request holds one connection, so requests beyond
+        ``max_connections`` are the ones waiting for the pool.
+        """
+        stats: dict[str, dict] = {}
+        for name in sorted(set(self._pool_configs) | set(self._usage)):
+            config = self._pool_configs.get(name)
+            usage = self._usage.get(name, _PoolUsage())
+            max_connections = config.max_connections if config else None
+            active = min(usage.in_flight, max_connections) if max_connections else usage.in_flight
+            stats[name] = {
+                "dedicated": config is not None,
+                "max_connections": max_connections,
+                "max_keepalive_connections": config.max_keepalive_connections if config else None,
+                "keepalive_expiry": config.keepalive_expiry if config else None,
+                "http2": config.http2 if config else False,
+                "in_flight": usage.in_flight,
+                "active": active,
+                "queued": usage.in_flight - active,
+                "peak_in_flight": usage.peak_in_flight,
+                "occupancy": round(active / max_connections, 3) if max_connections else None,
+                "requests": usage.requests,
+                "pool_timeouts": usage.pool_timeouts,
+            }
+        return stats
+
     async def request(
         self,
         backend_name: str,
@@ -90,11 +231,18 @@ class BackendClient:
         *,
         timeout_type: str = "default",
         max_retries: int = 3,
+        stream: bool = False,
         **kwargs,
     ) -> httpx.Response:
-        """Send request with retry + circuit breaker."""
+        """Send request with retry + circuit breaker.
+
+        With ``stream=True`` the call returns once response headers arrive and
+        the body is left unread; the caller must ``await resp.aclose()``.
+        """
+        series = backend_series(backend_name)
         breaker = self._breaker(backend_name)
         if not breaker.allow_request():
+            series.circuit_open.inc()
             raise httpx.ConnectError(
                 f"Circuit breaker open for {backend_name}"
             )
@@ -103,23 +251,50 @@ class BackendClient:
         delays = [0.5, 1.0, 2.0]
 
         last_exc: Exception | None = None
+        session = self._require_client(backend_name)
         for attempt in range(max_retries):
+            usage = self._acquire(backend_name)
+            held = False
+            started = time.perf_counter()
             try:
-                resp = await self._require_client().request(
-                    method, url, timeout=timeout, **kwargs
-                )
+                if stream:
+                    resp = await session.send(
+                        session.build_request(method, url, timeout=timeout, **kwargs),
+                        stream=True,
+                    )
+                    resp.stream = _TrackedStream(resp.stream, usage)
+                    held = True
+                else:
+                    resp = await session.request(
+                        method, url, timeout=timeout, **kwargs
+                    )
                 breaker.record_success()
+                series.duration.observe(time.perf_counter() - started)
+                series.ok.inc()
                 return resp
+            except httpx.PoolTimeout:
+                # Our own pool is saturated; the backend is not at fault.
+                usage.pool_timeouts += 1
+                series.pool_timeout.inc()
+                raise
             except (httpx.ConnectError, httpx.ConnectTimeout) as e:
                 last_exc = e
                 breaker.record_failure()
+                series.connect_error.inc()
                 if attempt < max_retries - 1:
+                    series.retries.inc()
                     delay = delays[min(attempt, len(delays) - 1)]
                     logger.warning(
                         "%s attempt %d failed: %s (retry in %.1fs)",
                         backend_name, attempt + 1, e, delay,
                     )
                     await asyncio.sleep(delay)
+            except httpx.HTTPError:
+                series.error.inc()
+                raise
+            finally:
+                if not held:
+                    usage.in_flight -= 1
 
         raise last_exc
 
@@ -139,28 +314,49 @@ class BackendClient:
         while the caller iterates, then closes automatically.
         No retry — streams are not idempotent.
         """
+        series = backend_series(backend_name)
         breaker = self._breaker(backend_name)
         if not breaker.allow_request():
+            series.circuit_open.inc()
             raise httpx.ConnectError(
                 f"Circuit breaker open for {backend_name}"
             )
 
         timeout = TIMEOUTS.get(timeout_type, TIMEOUTS["default"])
+        session = self._require_client(backend_name)
+        usage = self._acquire(backend_name)
+        started = time.perf_counter()
         try:
-            async with self._require_client().stream(
+            async with session.stream(
                 method, url, timeout=timeout, **kwargs
             ) as resp:
                 breaker.record_success()
+                series.duration.observe(time.perf_counter() - started)
+                series.ok.inc()
                 async for chunk in resp.aiter_bytes():
                     yield chunk
+        except httpx.PoolTimeout:
+            usage.pool_timeouts += 1
+            series.pool_timeout.inc()
+            raise
         except (httpx.ConnectError, httpx.ConnectTimeout) as e:
             breaker.record_failure()
+            series.connect_error.inc()
+            raise
+        except httpx.HTTPError:
+            series.error.inc()
             raise
+        finally:
+            usage.in_flight -= 1
 
-    async def health_check(self, backend_name: str, url: str) -> dict:
-        """Check a backend's health endpoint. Returns status dict."""
+    async def health_check(self, backend_name: str, url: str, *, timeout: float = 5.0) -> dict:
+        """Check a backend's health endpoint. Returns status dict.
+
+        Probes use the shared pool so a saturated backend pool does not read
+        as an unhealthy backend.
+        """
         try:
-            resp = await self._require_client().get(url, timeout=5.0)
+            resp = await self._require_client().get(url, timeout=timeout)
             return {
                 "status": "healthy" if resp.status_code == 200 else "unhealthy",
                 "code": resp.status_code,
@@ -13,6 +13,57 @@ class Settings(BaseSettings):
     llama_router_deployment_name: str = "llama-router"
     llama_router_container_name: str = "llama-server"
     runtime_reconfigure_timeout_seconds: float = 300.0
+    chat_scheduler_max_starvation_seconds: float = 30.0
+    model_catalog_ttl_seconds: float = 10.0
+    model_catalog_refresh_seconds: float = 5.0
+    health_poll_interval_seconds: float = 15.0
+    health_probe_timeout_seconds: float = 5.0
+    embedding_cache_enabled: bool = True
+    embedding_cache_max_mb: int = 256
+    embedding_cache_ttl_seconds: float = 86400.0
+    embedding_cache_dir: str = ""
+    embedding_cache_disk_max_mb: int = 2048
+    embedding_batch_enabled: bool = False
+    embedding_batch_window_ms: float = 5.0
+    embedding_batch_max_inputs: int = 64
+    embedding_batch_max_tokens: int = 8192
+    max_upload_mb: int = 2048
+    tts_stream_parallelism: int = 2
+    tts_stream_max_chunk_chars: int = 300
+    tts_reference_cache_path: str = "/data/voices/chatterbox-references.json"
+    tts_reference_cache_max_entries: int = 256
+    tts_reference_verify_seconds: float = 60.0
+    tts_cache_enabled: bool = True
+    # Caches live on the disposable cache volume, not the voice library PVC.
+    tts_cache_dir: str = "/data/cache/tts"
+    tts_cache_max_mb: int = 2048
+    tts_encode_workers: int = 4
+    stt_cache_enabled: bool = True
+    stt_cache_dir: str = "/data/cache/stt"
+    stt_cache_max_mb: int = 256
+    stt_cache_ttl_seconds: float = 604800.0
+    stt_cache_namespace: str = ""  # bump when whisper-stt's model or decoding changes
+    stt_realtime_max_sessions: int = 16
+    stt_realtime_max_inflight: int = 4
+    stt_realtime_max_pending_utterances: int = 4
+    stt_realtime_partial_interval_ms: int = 1000
+    stt_realtime_endpoint_silence_ms: int = 700
+    stt_realtime_max_utterance_seconds: float = 30.0
+    stt_realtime_vad_min_rms: float = 250.0
+    stt_realtime_vad_threshold_ratio: float = 3.0
+    tts_opus_bitrate_kbps: int = 32
+    tts_mp3_bitrate_kbps: int = 64
+    # Own volume: spooled uploads must not fill the voice library PVC.
+    jobs_dir: str = "/data/jobs"
+    jobs_ttl_seconds: float = 86400.0
+    jobs_max_pending: int = 256
+    jobs_max_mb: int = 8192
+    jobs_stt_workers: int = 2
+    jobs_speaker_workers: int = 1
+    jobs_audio_workers: int = 2
+    jobs_webhook_timeout_seconds: float = 10.0
+    # Comma-separated hosts (or ".domain" suffixes) allowed to resolve to private addresses.
+    jobs_webhook_allowed_hosts: str = ""
     log_level: str = "INFO"
     terminal_feed_mode: str = "mock"
     terminal_feed_buffer_size: int = 500
@@ -0,0 +1,155 @@
+"""Size-capped on-disk LRU index shared by the gateway's output caches."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Temp files older than this are leftovers from interrupted writes.
+_STALE_TEMP_SECONDS = 3600.0
+
+
+class DiskLRUCache:
+    """Files stored as ``{dir}/{key[:2]}/{key}{suffix}`` with an in-memory LRU index.
+
+    The index (key → stored time, size) is rebuilt from file mtimes on first
+    use, so the cache survives restarts. Entries older than ``ttl_seconds``
+    (0 = never) expire, and the least recently used are evicted past
+    ``max_bytes``; the newest entry is always kept. Subclasses add keys and
+    the read/write paths.
+    """
+
+    def __init__(self, *, cache_dir: str, max_bytes: int, suffix: str, label: str, ttl_seconds: float = 0.0):
+        self._dir = Path(cache_dir)
+        self._max_bytes = max(0, max_bytes)
+        self._suffix = suffix
+        self._label = label
+        self._ttl_seconds = max(0.0, ttl_seconds)
+        self._entries: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        self._bytes = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._expired = 0
+
+    def path_for(self, key: str) -> Path:
+        return self._dir / key[:2] / f"{key}{self._suffix}"
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "stores": self._stores,
+            "evictions": self._evictions,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+    # --- Internals ---
+
+    def _temp_path(self, key: str) -> Path:
+        return self.path_for(key).with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return bool(self._ttl_seconds) and time.time() - stored_at > self._ttl_seconds
+
+    def _remember(self, key: str, stored_at: float, size: int) -> None:
+        self._drop(key)
+        self._entries[key] = (stored_at, size)
+        self._bytes += size
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    async def _commit(self, key: str, size: int) -> None:
+        """Index a file just written to ``path_for(key)`` and evict past the cap."""
+        self._remember(key, time.time(), size)
+        self._stores += 1
+        await self._evict()
+
+    async def _expire(self, key: str) -> None:
+        self._drop(key)
+        self._expired += 1
+        await asyncio.to_thread(self._unlink_many, [key])
+
+    async def _evict(self) -> None:
+        victims: list[str] = []
+        while self._bytes > self._max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._drop(key)
+            victims.append(key)
+            self._evictions += 1
+        if victims:
+            await asyncio.to_thread(self._unlink_many, victims)
+
+    def _unlink_many(self, keys: list[str]) -> None:
+        for key in keys:
+            try:
+                self.path_for(key).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning("%s eviction failed for %s: %s", self._label, key, e)
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            found, expired = await asyncio.to_thread(self._scan)
+            for key, stored_at, size in found:
+                self._remember(key, stored_at, size)
+            self._expired += expired
+            self._loaded = True
+            await self._evict()
+
+    def _scan(self) -> tuple[list[tuple[str, float, int]], int]:
+        """Live cache files oldest-first by mtime; expired ones are deleted."""
+        files: list[tuple[float, str, int]] = []
+        expired = 0
+        if not self._dir.is_dir():
+            return [], 0
+        for path in self._dir.glob(f"*/*{self._suffix}"):
+            try:
+                stat = path.stat()
+                if self._is_expired(stat.st_mtime):
+                    path.unlink(missing_ok=True)
+                    expired += 1
+                    continue
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path.name[: -len(self._suffix)], stat.st_size))
+        for path in self._dir.glob("*/.*.tmp"):
+            try:
+                if time.time() - path.stat().st_mtime > _STALE_TEMP_SECONDS:
+                    path.unlink(missing_ok=True)
+            except OSError:
+                continue
+        files.sort()
+        return [(key, mtime, size) for mtime, key, size in files], expired
+
+    def _write(self, key: str, body: bytes) -> None:
+        """Atomically write ``body`` as the file for ``key``."""
+        final_path = self.path_for(key)
+        final_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self._temp_path(key)
+        try:
+            temp_path.write_bytes(body)
+            os.replace(temp_path, final_path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            raise
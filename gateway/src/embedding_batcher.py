@@ -0,0 +1,267 @@
+"""Micro-batching coalescer for concurrent llama-embed requests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from .backend_client import BackendClient
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingUpstreamError(Exception):
+    """llama-embed rejected a request; carries the status and JSON body to relay."""
+
+    def __init__(self, status_code: int, payload: Any):
+        super().__init__(f"llama-embed returned status {status_code}")
+        self.status_code = status_code
+        self.payload = payload
+
+
+@dataclass
+class EmbeddingBatchResult:
+    vectors: list[list[float]]
+    usage: dict[str, int]
+    model: str | None
+
+
+def parse_embeddings_response(resp: httpx.Response, expected: int) -> EmbeddingBatchResult:
+    """Validate an OpenAI embeddings response and return vectors in input order."""
+    try:
+        data = resp.json()
+    except ValueError:
+        data = {"error": "Embeddings backend error", "detail": resp.text[:1000]}
+    if resp.status_code != 200:
+        raise EmbeddingUpstreamError(resp.status_code, data)
+
+    vectors: list[list[float] | None] = [None] * expected
+    items = data.get("data", []) if isinstance(data, dict) else []
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        index = item.get("index", position)
+        if isinstance(index, int) and 0 <= index < expected:
+            vectors[index] = item.get("embedding")
+    if any(vector is None for vector in vectors):
+        raise EmbeddingUpstreamError(
+            502,
+            {"error": "Embeddings backend error", "detail": "llama-embed returned an incomplete embeddings batch"},
+        )
+
+    usage = data.get("usage")
+    model = data.get("model")
+    return EmbeddingBatchResult(
+        vectors=vectors,
+        usage=usage if isinstance(usage, dict) else {"prompt_tokens": 0, "total_tokens": 0},
+        model=model if isinstance(model, str) else None,
+    )
+
+
+def _estimate_tokens(text: str) -> int:
+    # Rough BPE estimate; only used to keep merged batches under the token budget.
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class _PendingEmbedding:
+    texts: list[str]
+    tokens: int
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class _OpenBatch:
+    backend_url: str
+    template: dict[str, Any]
+    items: list[_PendingEmbedding] = field(default_factory=list)
+    inputs: int = 0
+    tokens: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+class EmbeddingBatcher:
+    """Coalesce embedding inputs that arrive within a short window into one call.
+
+    Requests are only merged when every non-``input`` field matches, so each
+    caller still gets vectors for exactly the parameters it asked for.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: BackendClient,
+        window_seconds: float,
+        max_inputs: int,
+        max_tokens: int,
+    ):
+        self._client = client
+        self._window_seconds = max(0.0, window_seconds)
+        self._max_inputs = max(1, max_inputs)
+        self._max_tokens = max(1, max_tokens)
+        self._open: dict[tuple[str, str], _OpenBatch] = {}
+        # The loop only keeps weak references to tasks; hold in-flight batches here.
+        self._tasks: set[asyncio.Task] = set()
+        self._batches = 0
+        self._batched_inputs = 0
+        self._batched_requests = 0
+        self._max_batch_inputs = 0
+        self._queue_delay_total = 0.0
+        self._queue_delay_max = 0.0
+        self._isolated_retries = 0
+        self._errors = 0
+
+    async def submit(
+        self, backend_url: str, template: dict[str, Any], texts: list[str]
+    ) -> EmbeddingBatchResult:
+        """Queue texts for the next batch and wait for their vectors."""
+        key = (backend_url, json.dumps(template, sort_keys=True, separators=(",", ":")))
+        tokens = sum(_estimate_tokens(text) for text in texts)
+        batch = self._open.get(key)
+        if batch is not None and (
+            batch.inputs + len(texts) > self._max_inputs
+            or batch.tokens + tokens > self._max_tokens
+        ):
+            self._flush(key)
+            batch = None
+
+        loop = asyncio.get_running_loop()
+        if batch is None:
+            batch = _OpenBatch(backend_url=backend_url, template=template)
+            self._open[key] = batch
+            batch.timer = loop.call_later(self._window_seconds, self._flush, key)
+
+        pending = _PendingEmbedding(
+            texts=texts,
+            tokens=tokens,
+            future=loop.create_future(),
+            enqueued_at=time.monotonic(),
+        )
+        batch.items.append(pending)
+        batch.inputs += len(texts)
+        batch.tokens += tokens
+        if batch.inputs >= self._max_inputs or batch.tokens >= self._max_tokens:
+            self._flush(key)
+        return await pending.future
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": round(self._window_seconds * 1000.0, 3),
+            "max_inputs": self._max_inputs,
+            "max_tokens": self._max_tokens,
+            "batches": self._batches,
+            "batched_requests": self._batched_requests,
+            "batched_inputs": self._batched_inputs,
+            "avg_batch_inputs": round(self._batched_inputs / self._batches, 2) if self._batches else 0.0,
+            "max_batch_inputs": self._max_batch_inputs,
+            "avg_queue_delay_ms": (
+                round(self._queue_delay_total / self._batched_requests * 1000.0, 3)
+                if self._batched_requests else 0.0
+            ),
+            "max_queue_delay_ms": round(self._queue_delay_max * 1000.0, 3),
+            "isolated_retries": self._isolated_retries,
+            "errors": self._errors,
+        }
+
+    def _flush(self, key: tuple[str, str]) -> None:
+        batch = self._open.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def aclose(self) -> None:
+        """Fail batches still collecting and cancel the ones in flight."""
+        closed = EmbeddingUpstreamError(503, {"error": "Embedding batcher is shutting down"})
+        for batch in self._open.values():
+            if batch.timer is not None:
+                batch.timer.cancel()
+            self._fail(batch, closed)
+        self._open.clear()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, batch: _OpenBatch, *, isolated: bool = False) -> None:
+        dispatched_at = time.monotonic()
+        if not isolated:
+            self._batches += 1
+            self._batched_requests += len(batch.items)
+            self._batched_inputs += batch.inputs
+            self._max_batch_inputs = max(self._max_batch_inputs, batch.inputs)
+            for item in batch.items:
+                delay = dispatched_at - item.enqueued_at
+                self._queue_delay_total += delay
+                self._queue_delay_max = max(self._queue_delay_max, delay)
+
+        texts = [text for item in batch.items for text in item.texts]
+        payload = dict(batch.template)
+        payload["input"] = texts
+        try:
+            resp = await self._client.request(
+                "llama-embed", "POST", f"{batch.backend_url}/v1/embeddings",
+                json=payload,
+                timeout_type="embeddings",
+            )
+            result = parse_embeddings_response(resp, len(texts))
+        except EmbeddingUpstreamError as e:
+            if len(batch.items) > 1 and e.status_code < 500:
+                # One bad input (e.g. over the context size) must not fail its
+                # batch-mates: replay each caller's inputs on their own.
+                self._isolated_retries += 1
+                await asyncio.gather(*(
+                    self._run(
+                        _OpenBatch(
+                            backend_url=batch.backend_url,
+                            template=batch.template,
+                            items=[item],
+                            inputs=len(item.texts),
+                            tokens=item.tokens,
+                        ),
+                        isolated=True,
+                    )
+                    for item in batch.items
+                ))
+                return
+            self._errors += 1
+            self._fail(batch, e)
+            return
+        except asyncio.CancelledError:
+            self._fail(batch, EmbeddingUpstreamError(503, {"error": "Embedding batcher is shutting down"}))
+            raise
+        except Exception as e:
+            self._errors += 1
+            self._fail(batch, e)
+            return
+
+        total_tokens = max(1, batch.tokens)
+        prompt_tokens = int(result.usage.get("prompt_tokens", 0) or 0)
+        offset = 0
+        for item in batch.items:
+            count = len(item.texts)
+            # llama-embed reports usage per call; attribute it by estimated share.
+            share = round(prompt_tokens * item.tokens / total_tokens)
+            if not item.future.done():
+                item.future.set_result(EmbeddingBatchResult(
+                    vectors=result.vectors[offset:offset + count],
+                    usage={"prompt_tokens": share, "total_tokens": share},
+                    model=result.model,
+                ))
+            offset += count
+
+    @staticmethod
+    def _fail(batch: _OpenBatch, exc: Exception) -> None:
+        for item in batch.items:
+            if not item.future.done():
+                item.future.set_exception(exc)
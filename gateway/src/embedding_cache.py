@@ -0,0 +1,219 @@
+"""Content-addressed embedding cache with LRU/TTL eviction and optional disk tier."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Prune the disk tier after this many writes so directory scans stay rare.
+_DISK_PRUNE_EVERY_WRITES = 256
+
+
+def _pack_vector(values: object) -> array | None:
+    """``values`` as a float64 array if it is a flat list of numbers, else None."""
+    if not isinstance(values, list) or not all(
+        isinstance(value, (int, float)) and not isinstance(value, bool) for value in values
+    ):
+        return None
+    return array("d", values)
+
+
+class EmbeddingCache:
+    """Maps (model, params, text) hashes to embedding vectors.
+
+    Vectors are held as packed float64 arrays so the memory bound is exact and
+    a 1024-dim vector costs ~8 KB instead of a list of Python floats.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        ttl_seconds: float = 0.0,
+        disk_dir: str = "",
+        disk_max_bytes: int = 0,
+    ):
+        self._max_bytes = max(0, max_bytes)
+        self._ttl_seconds = max(0.0, ttl_seconds)
+        self._entries: OrderedDict[str, tuple[float, array]] = OrderedDict()
+        self._bytes = 0
+        self._disk_dir = Path(disk_dir) if disk_dir else None
+        self._disk_max_bytes = max(0, disk_max_bytes)
+        self._disk_writes_since_prune = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(model: str, text: str, params: str = "") -> str:
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(params.encode("utf-8"))
+        digest.update(b"\0")
+        # Raw text: it is what goes upstream, and llama-embed tokenizes NFD
+        # and NFC forms (or " foo" and "foo") differently.
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    async def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Return cached vectors for the given keys; absent keys are misses."""
+        found: dict[str, list[float]] = {}
+        disk_lookups: list[str] = []
+        now = time.monotonic()
+        for key in keys:
+            if key in found:
+                continue
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, vector = entry
+                if self._ttl_seconds and now - stored_at > self._ttl_seconds:
+                    self._drop(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = vector.tolist()
+                    self._hits += 1
+                    continue
+            if self._disk_dir is not None:
+                disk_lookups.append(key)
+            else:
+                self._misses += 1
+
+        if disk_lookups:
+            loaded = await asyncio.to_thread(self._read_disk_many, disk_lookups)
+            for key in disk_lookups:
+                vector = loaded.get(key)
+                if vector is None:
+                    self._misses += 1
+                    continue
+                self._disk_hits += 1
+                self._remember(key, vector)
+                found[key] = vector.tolist()
+        return found
+
+    async def put_many(self, items: dict[str, list[float]]) -> None:
+        packed: dict[str, array] = {}
+        for key, values in items.items():
+            vector = _pack_vector(values)
+            if vector is None:
+                # Null, nested or base64 embeddings are relayed but not cached.
+                continue
+            packed[key] = vector
+            self._remember(key, vector)
+        if self._disk_dir is not None and packed:
+            await asyncio.to_thread(self._write_disk_many, packed)
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._disk_hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self._hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_ratio": round((self._hits + self._disk_hits) / lookups, 4) if lookups else 0.0,
+            "disk_enabled": self._disk_dir is not None,
+        }
+
+    def _remember(self, key: str, vector: array) -> None:
+        size = vector.itemsize * len(vector)
+        if size > self._max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic(), vector)
+        self._bytes += size
+        while self._bytes > self._max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self._evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1].itemsize * len(entry[1])
+
+    # --- Disk tier (runs in worker threads) ---
+
+    def _disk_path(self, key: str) -> Path:
+        assert self._disk_dir is not None
+        return self._disk_dir / key[:2] / f"{key}.f64"
+
+    def _read_disk_many(self, keys: list[str]) -> dict[str, array]:
+        loaded: dict[str, array] = {}
+        now = time.time()
+        for key in keys:
+            path = self._disk_path(key)
+            try:
+                stat = path.stat()
+                if self._ttl_seconds and now - stat.st_mtime > self._ttl_seconds:
+                    path.unlink(missing_ok=True)
+                    continue
+                vector = array("d")
+                vector.frombytes(path.read_bytes())
+                os.utime(path, (now, stat.st_mtime))
+            except (OSError, ValueError):
+                continue
+            loaded[key] = vector
+        return loaded
+
+    def _write_disk_many(self, items: dict[str, array]) -> None:
+        written = 0
+        for key, vector in items.items():
+            path = self._disk_path(key)
+            temp_name = None
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Unique per write: concurrent misses for one input may both land here.
+                fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{key}.", suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(vector.tobytes())
+                os.replace(temp_name, path)
+            except OSError as e:
+                logger.warning("Embedding cache disk write failed: %s", e)
+                if temp_name is not None:
+                    Path(temp_name).unlink(missing_ok=True)
+                continue
+            written += 1
+        self._disk_writes_since_prune += written
+        if self._disk_writes_since_prune >= _DISK_PRUNE_EVERY_WRITES:
+            self._disk_writes_since_prune = 0
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Drop expired files, then least-recently-read files above the size cap."""
+        assert self._disk_dir is not None
+        now = time.time()
+        files: list[tuple[float, int, Path]] = []
+        total = 0
+        for path in self._disk_dir.glob("*/*.f64"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self._ttl_seconds and now - stat.st_mtime > self._ttl_seconds:
+                path.unlink(missing_ok=True)
+                continue
+            files.append((stat.st_atime, stat.st_size, path))
+            total += stat.st_size
+        if not self._disk_max_bytes or total <= self._disk_max_bytes:
+            return
+        files.sort(key=lambda item: item[0])
+        for _atime, size, path in files:
+            if total <= self._disk_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
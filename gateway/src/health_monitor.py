@@ -0,0 +1,108 @@
+"""Background backend health poller with an in-memory snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from .backend_client import BackendClient
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Probe all configured backends concurrently on a fixed interval.
+
+    Readers (``/health``, dashboard, ``/api/backend-routes``) only look at the
+    last snapshot, so page views never fan out probes to the backends.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: BackendClient,
+        backends: dict,
+        interval_seconds: float = 15.0,
+        probe_timeout_seconds: float = 5.0,
+    ):
+        self._client = client
+        self._backends = dict(backends)
+        self._interval_seconds = max(1.0, interval_seconds)
+        self._probe_timeout_seconds = max(0.5, probe_timeout_seconds)
+        self._results: dict[str, dict] = {
+            name: {"status": "checking"} for name in self._backends
+        }
+        self._overall = "degraded"
+        self._checked_at: str | None = None
+        self._checked_monotonic: float | None = None
+        self._task: asyncio.Task | None = None
+        self._running = False
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """Return the last aggregated health snapshot (no backend I/O)."""
+        age = None
+        if self._checked_monotonic is not None:
+            age = round(time.monotonic() - self._checked_monotonic, 3)
+        return {
+            "status": self._overall,
+            "checked_at": self._checked_at,
+            "age_seconds": age,
+            "interval_seconds": self._interval_seconds,
+            "backends": self._results,
+        }
+
+    def backend_status(self, name: str) -> dict:
+        return self._results.get(name, {"status": "checking"})
+
+    async def refresh(self) -> dict:
+        """Probe every backend concurrently and swap in a new snapshot."""
+        names = list(self._backends)
+        probes = [self._probe(name, self._backends[name]) for name in names]
+        outcomes = await asyncio.gather(*probes)
+        results = dict(zip(names, outcomes))
+
+        # Swap whole dicts so concurrent readers never see a half-built snapshot.
+        self._results = results
+        self._overall = (
+            "healthy" if all(r["status"] == "healthy" for r in results.values()) else "degraded"
+        )
+        self._checked_at = datetime.now(timezone.utc).isoformat()
+        self._checked_monotonic = time.monotonic()
+        return self.snapshot()
+
+    async def _probe(self, name: str, backend: dict) -> dict:
+        health_path = backend.get("health", "/health")
+        url = f"{backend['url']}{health_path}"
+        started = time.perf_counter()
+        result = await self._client.health_check(name, url, timeout=self._probe_timeout_seconds)
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000.0, 1)
+        result["checked_at"] = datetime.now(timezone.utc).isoformat()
+        return result
+
+    async def _run_loop(self) -> None:
+        while self._running:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Backend health poll failed: %s", e)
+            await asyncio.sleep(self._interval_seconds)
@@ -1,6 +1,23 @@
 """HTTP helpers for gateway route handlers."""
 
-from fastapi.responses import JSONResponse
+from collections.abc import AsyncIterator, Callable
+
+import httpx
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+# Request headers forwarded so clients can resume or seek in backend audio.
+_RANGE_REQUEST_HEADERS = ("range", "if-range")
+# Backend response headers relayed with streamed bodies.
+_STREAM_RESPONSE_HEADERS = (
+    "content-length",
+    "content-range",
+    "accept-ranges",
+    "content-encoding",
+    "etag",
+    "last-modified",
+)
 
 
 def json_or_error_response(resp, error_label: str) -> JSONResponse:
@@ -13,3 +30,60 @@ def json_or_error_response(resp, error_label: str) -> JSONResponse:
             "detail": resp.text[:1000],
         }
     return JSONResponse(status_code=resp.status_code, content=payload)
+
+
+def range_headers(request: Request) -> dict[str, str]:
+    """Client Range/If-Range headers to forward to a backend."""
+    return {name: request.headers[name] for name in _RANGE_REQUEST_HEADERS if name in request.headers}
+
+
+async def _relay_body(resp: httpx.Response):
+    try:
+        # Raw bytes so the relayed Content-Length/Content-Encoding stay valid.
+        async for chunk in resp.aiter_raw():
+            yield chunk
+    finally:
+        await resp.aclose()
+
+
+async def stream_or_error_response(
+    resp: httpx.Response,
+    error_label: str,
+    *,
+    media_type: str,
+    headers: dict[str, str] | None = None,
+    wrap_body: Callable[[AsyncIterator[bytes]], AsyncIterator[bytes]] | None = None,
+    relay_headers: bool = True,
+) -> Response:
+    """Relay a ``stream=True`` backend response, or the gateway error envelope.
+
+    200 and 206 bodies are streamed as they arrive with length/range headers
+    passed through; anything else is read and mapped to
+    ``{"error": error_label, "detail": ...}`` with the backend status.
+    ``wrap_body`` can observe the relayed bytes (e.g. to tee them to a cache);
+    pass ``relay_headers=False`` when it changes them (e.g. transcoding).
+    """
+    if resp.status_code not in (200, 206):
+        try:
+            await resp.aread()
+        finally:
+            await resp.aclose()
+        return JSONResponse(
+            status_code=resp.status_code,
+            content={"error": error_label, "detail": resp.text},
+        )
+
+    relayed = {}
+    if relay_headers:
+        relayed = {name: resp.headers[name] for name in _STREAM_RESPONSE_HEADERS if name in resp.headers}
+    relayed.update(headers or {})
+    body = _relay_body(resp)
+    if wrap_body is not None:
+        body = wrap_body(body)
+    return StreamingResponse(
+        body,
+        status_code=resp.status_code,
+        media_type=media_type,
+        headers=relayed,
+        background=BackgroundTask(resp.aclose),
+    )
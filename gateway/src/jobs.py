@@ -0,0 +1,535 @@
+"""Disk-backed async jobs for long-running backend work.
+
+A job owns a directory ``{jobs_dir}/{job_id}/`` holding ``job.json`` (state),
+``input`` (the spooled upload) and ``result`` once it succeeds. Jobs run on a
+bounded worker pool per backend, independent of the submitting connection, so
+a client disconnect never discards finished work. Queued and interrupted jobs
+are requeued on startup; finished jobs are deleted after the TTL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import logging
+import os
+import shutil
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = frozenset({SUCCEEDED, FAILED, CANCELLED})
+
+_SPOOL_CHUNK = 1024 * 1024
+_WEBHOOK_RETRY_DELAYS = (1.0, 5.0, 15.0)
+
+
+class JobFailed(Exception):
+    """Backend rejected the job; ``status_code`` is the backend status."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class JobStorageFull(Exception):
+    pass
+
+
+class WebhookRejected(ValueError):
+    """A webhook URL that the gateway will not call."""
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def _host_allowed(host: str, allowed_hosts: frozenset[str]) -> bool:
+    return host in allowed_hosts or any(
+        entry.startswith(".") and host.endswith(entry) for entry in allowed_hosts
+    )
+
+
+async def check_webhook_url(url: str, allowed_hosts: frozenset[str]) -> str | None:
+    """Reject webhook URLs that are not http(s) or resolve to a non-public address.
+
+    Returns the validated address to connect to, or None for hosts in
+    ``allowed_hosts`` (exact names, or ``.suffix`` entries for a domain and
+    its subdomains), which skip the address check for receivers that
+    deliberately live inside the cluster.
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower().rstrip(".")
+    if parts.scheme not in ("http", "https") or not host:
+        raise WebhookRejected("webhook_url must be an absolute http(s) URL")
+    if _host_allowed(host, allowed_hosts):
+        return None
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (OSError, ValueError) as e:
+        raise WebhookRejected(f"webhook_url host could not be resolved: {host}") from e
+    if not infos or not all(_is_public_address(info[4][0]) for info in infos):
+        raise WebhookRejected(
+            "webhook_url must resolve to public addresses; private, loopback and "
+            "link-local targets need SYNAPSE_JOBS_WEBHOOK_ALLOWED_HOSTS"
+        )
+    return infos[0][4][0]
+
+
+def pinned_webhook_request(url: str, address: str | None) -> tuple[str, dict[str, str], dict[str, str]]:
+    """URL, headers and httpx extensions that connect to ``address`` instead of re-resolving the host.
+
+    The original host is kept for the ``Host`` header and, over https, for SNI
+    and certificate verification, so a rebinding DNS name cannot swap the
+    validated address for another one between the check and the connect.
+    """
+    if address is None:
+        return url, {}, {}
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    ip = address.split("%", 1)[0]
+    netloc = f"[{ip}]" if ":" in ip else ip
+    if parts.port is not None:
+        netloc = f"{netloc}:{parts.port}"
+    if "@" in parts.netloc:
+        netloc = f"{parts.netloc.rpartition('@')[0]}@{netloc}"
+    host_header = f"[{host}]" if ":" in host else host
+    if parts.port is not None:
+        host_header = f"{host_header}:{parts.port}"
+    extensions = {"sni_hostname": host} if parts.scheme == "https" else {}
+    return urlunsplit(parts._replace(netloc=netloc)), {"Host": host_header}, extensions
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    backend: str
+    status: str
+    created_at: float
+    params: dict[str, str] = field(default_factory=dict)
+    input_filename: str = "audio.wav"
+    input_content_type: str = "audio/wav"
+    input_bytes: int = 0
+    webhook_url: str | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+    attempts: int = 0
+    error: str | None = None
+    error_status: int | None = None
+    result_media_type: str | None = None
+    result_bytes: int | None = None
+
+    def public(self, *, ttl_seconds: float) -> dict:
+        payload = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "attempts": self.attempts,
+            "input_bytes": self.input_bytes,
+            "webhook_url": self.webhook_url,
+        }
+        if self.status == SUCCEEDED:
+            payload["result_url"] = f"/jobs/{self.id}/result"
+            payload["result_media_type"] = self.result_media_type
+            payload["result_bytes"] = self.result_bytes
+        if self.error is not None:
+            payload["error"] = self.error
+            payload["error_status"] = self.error_status
+        if self.finished_at is not None:
+            payload["expires_at"] = self.finished_at + ttl_seconds
+        return payload
+
+
+@dataclass(frozen=True)
+class JobKind:
+    """A job type: which backend's pool runs it and how.
+
+    ``run(job, input_path, result_path)`` performs the backend call, writes
+    the result file and returns its media type; it raises ``JobFailed`` for
+    backend errors.
+    """
+
+    name: str
+    backend: str
+    run: Callable[[Job, Path, Path], Awaitable[str]]
+
+
+class JobManager:
+    def __init__(
+        self,
+        *,
+        jobs_dir: str,
+        ttl_seconds: float,
+        max_pending: int,
+        max_bytes: int,
+        workers: dict[str, int],
+        webhook_timeout_seconds: float,
+        webhook_allowed_hosts: str = "",
+    ):
+        self._dir = Path(jobs_dir)
+        self._ttl_seconds = max(0.0, ttl_seconds)
+        self._max_pending = max(1, max_pending)
+        self._max_bytes = max(0, max_bytes)
+        # Uploads being spooled right now, not yet reflected in any job.
+        self._reserved_bytes = 0
+        self._worker_counts = {backend: max(1, count) for backend, count in workers.items()}
+        self._webhook_timeout = webhook_timeout_seconds
+        self._webhook_allowed_hosts = frozenset(
+            entry.strip().lower().rstrip(".") for entry in webhook_allowed_hosts.split(",") if entry.strip()
+        )
+        self._kinds: dict[str, JobKind] = {}
+        self._jobs: dict[str, Job] = {}
+        self._queues: dict[str, asyncio.Queue[str]] = {}
+        self._running: dict[str, asyncio.Task] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._webhook_tasks: set[asyncio.Task] = set()
+        self._webhook_client: httpx.AsyncClient | None = None
+        self._stopping = False
+        self._submitted = 0
+        self._completed = {SUCCEEDED: 0, FAILED: 0, CANCELLED: 0}
+        self._expired = 0
+        self._webhook_failures = 0
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds
+
+    async def check_webhook(self, url: str) -> str | None:
+        """Raise WebhookRejected unless ``url`` may receive job notifications; see check_webhook_url."""
+        return await check_webhook_url(url, self._webhook_allowed_hosts)
+
+    def register(self, kind: JobKind) -> None:
+        self._kinds[kind.name] = kind
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._webhook_client = httpx.AsyncClient(timeout=self._webhook_timeout)
+        backends = {kind.backend for kind in self._kinds.values()}
+        for backend in backends:
+            self._queues[backend] = asyncio.Queue()
+            for index in range(self._worker_counts.get(backend, 1)):
+                self._tasks.append(asyncio.create_task(self._worker(backend), name=f"jobs-{backend}-{index}"))
+        self._tasks.append(asyncio.create_task(self._sweeper(), name="jobs-sweeper"))
+
+        restored = await asyncio.to_thread(self._load)
+        for job in sorted(restored, key=lambda j: j.created_at):
+            if job.kind not in self._kinds:
+                logger.warning("Dropping job %s of unknown kind %s", job.id, job.kind)
+                continue
+            self._jobs[job.id] = job
+            if job.status not in FINISHED_STATUSES:
+                # Interrupted by a restart: run it again from the spooled input.
+                job.status = QUEUED
+                self._queues[job.backend].put_nowait(job.id)
+        if restored:
+            logger.info("Restored %d jobs (%d pending)", len(self._jobs), self._pending_count())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._queues.clear()
+        if self._webhook_tasks:
+            await asyncio.gather(*self._webhook_tasks, return_exceptions=True)
+        if self._webhook_client is not None:
+            await self._webhook_client.aclose()
+            self._webhook_client = None
+
+    async def submit(
+        self,
+        kind_name: str,
+        source: BinaryIO,
+        *,
+        filename: str | None,
+        content_type: str | None,
+        params: dict[str, str],
+        webhook_url: str | None,
+    ) -> Job:
+        """Spool ``source`` to disk and queue a job for it."""
+        kind = self._kinds[kind_name]
+        if self._pending_count() >= self._max_pending:
+            raise JobQueueFull(f"{self._max_pending} jobs already pending")
+        source.seek(0, os.SEEK_END)
+        size = source.tell()
+        if self.stored_bytes() + size > self._max_bytes:
+            raise JobStorageFull(
+                f"{self.stored_bytes()} of {self._max_bytes} bytes in use, upload is {size} bytes"
+            )
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind.name,
+            backend=kind.backend,
+            status=QUEUED,
+            created_at=time.time(),
+            params=params,
+            input_filename=filename or "audio.wav",
+            input_content_type=content_type or "audio/wav",
+            webhook_url=webhook_url,
+        )
+        job_dir = self._job_dir(job.id)
+        self._reserved_bytes += size
+        try:
+            job.input_bytes = await asyncio.to_thread(self._spool, source, job_dir)
+            await asyncio.to_thread(self._write_state, job)
+        except OSError:
+            await asyncio.to_thread(shutil.rmtree, job_dir, True)
+            raise
+        finally:
+            self._reserved_bytes -= size
+        self._jobs[job.id] = job
+        self._submitted += 1
+        self._queues[kind.backend].put_nowait(job.id)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, *, status: str | None = None, kind: str | None = None) -> list[Job]:
+        jobs = [
+            job for job in self._jobs.values()
+            if (status is None or job.status == status) and (kind is None or job.kind == kind)
+        ]
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def public(self, job: Job) -> dict:
+        return job.public(ttl_seconds=self._ttl_seconds)
+
+    def result_path(self, job: Job) -> Path:
+        return self._job_dir(job.id) / "result"
+
+    async def cancel(self, job_id: str) -> Job | None:
+        """Cancel a pending job, or delete a finished one and its result."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status in FINISHED_STATUSES:
+            await self._delete(job)
+            return job
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        # Still queued (its worker skips it), or dequeued but cancelled before
+        # _run started, in which case nothing else records the cancellation.
+        if job.status not in FINISHED_STATUSES:
+            await self._finish(job, CANCELLED)
+        return job
+
+    def stored_bytes(self) -> int:
+        """Spooled inputs of unfinished jobs, kept results, and uploads being spooled."""
+        return self._reserved_bytes + sum(
+            (job.input_bytes if job.status not in FINISHED_STATUSES else 0) + (job.result_bytes or 0)
+            for job in self._jobs.values()
+        )
+
+    def stats(self) -> dict:
+        by_status = {status: 0 for status in (QUEUED, RUNNING, *sorted(FINISHED_STATUSES))}
+        by_kind: dict[str, dict[str, int]] = {name: dict(by_status) for name in self._kinds}
+        for job in self._jobs.values():
+            by_status[job.status] += 1
+            by_kind.setdefault(job.kind, dict.fromkeys(by_status, 0))[job.status] += 1
+        return {
+            "jobs": len(self._jobs),
+            "pending": self._pending_count(),
+            "max_pending": self._max_pending,
+            "stored_bytes": self.stored_bytes(),
+            "max_bytes": self._max_bytes,
+            "workers": dict(self._worker_counts),
+            "ttl_seconds": self._ttl_seconds,
+            "by_status": by_status,
+            "by_kind": by_kind,
+            "submitted": self._submitted,
+            "completed": dict(self._completed),
+            "expired": self._expired,
+            "webhook_failures": self._webhook_failures,
+        }
+
+    # --- Internals ---
+
+    def _pending_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status not in FINISHED_STATUSES)
+
+    def _job_dir(self, job_id: str) -> Path:
+        return self._dir / job_id
+
+    async def _worker(self, backend: str) -> None:
+        queue = self._queues[backend]
+        while True:
+            job_id = await queue.get()
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                continue
+            task = asyncio.create_task(self._run(job))
+            self._running[job_id] = task
+            try:
+                # wait() rather than await: a cancelled job must not stop the worker.
+                await asyncio.wait({task})
+            finally:
+                if not task.done():
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                self._running.pop(job_id, None)
+
+    async def _run(self, job: Job) -> None:
+        kind = self._kinds[job.kind]
+        job.status = RUNNING
+        job.started_at = time.time()
+        job.attempts += 1
+        await asyncio.to_thread(self._write_state, job)
+        job_dir = self._job_dir(job.id)
+        try:
+            media_type = await kind.run(job, job_dir / "input", job_dir / "result")
+        except asyncio.CancelledError:
+            if self._stopping:
+                # Shutdown, not a user cancel: leave it to be requeued on start.
+                job.status = QUEUED
+                await asyncio.to_thread(self._write_state, job)
+                raise
+            await self._finish(job, CANCELLED)
+            return
+        except JobFailed as e:
+            await self._finish(job, FAILED, error=e.detail, error_status=e.status_code)
+            return
+        except httpx.HTTPError as e:
+            await self._finish(job, FAILED, error=f"Backend unavailable: {e}", error_status=503)
+            return
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            await self._finish(job, FAILED, error=str(e) or type(e).__name__, error_status=500)
+            return
+        job.result_media_type = media_type
+        job.result_bytes = await asyncio.to_thread(self._size, job_dir / "result")
+        await self._finish(job, SUCCEEDED)
+
+    async def _finish(
+        self, job: Job, status: str, *, error: str | None = None, error_status: int | None = None
+    ) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        job.error = error
+        job.error_status = error_status
+        self._completed[status] += 1
+        job_dir = self._job_dir(job.id)
+        # The input is only kept while the job may still (re)run.
+        await asyncio.to_thread(self._unlink, job_dir / "input")
+        if status != SUCCEEDED:
+            await asyncio.to_thread(self._unlink, job_dir / "result")
+        await asyncio.to_thread(self._write_state, job)
+        if status == FAILED:
+            logger.warning("Job %s (%s) failed: %s", job.id, job.kind, error)
+        if job.webhook_url and self._webhook_client is not None:
+            task = asyncio.create_task(self._notify(job.webhook_url, self.public(job)))
+            self._webhook_tasks.add(task)
+            task.add_done_callback(self._webhook_tasks.discard)
+
+    async def _notify(self, url: str, payload: dict) -> None:
+        for attempt, delay in enumerate((0.0, *_WEBHOOK_RETRY_DELAYS)):
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                # Re-checked per attempt and connected to the checked address, so
+                # neither a later DNS change nor a rebinding answer redirects it.
+                address = await self.check_webhook(url)
+                target, headers, extensions = pinned_webhook_request(url, address)
+                resp = await self._webhook_client.post(target, json=payload, headers=headers, extensions=extensions)
+                if resp.status_code < 400:
+                    return
+                reason = f"status {resp.status_code}"
+            except WebhookRejected as e:
+                reason = str(e)
+            except httpx.HTTPError as e:
+                reason = str(e) or type(e).__name__
+            logger.info("Webhook for job %s failed (attempt %d): %s", payload["id"], attempt + 1, reason)
+        self._webhook_failures += 1
+        logger.warning("Giving up on webhook for job %s: %s", payload["id"], url)
+
+    async def _delete(self, job: Job) -> None:
+        self._jobs.pop(job.id, None)
+        await asyncio.to_thread(shutil.rmtree, self._job_dir(job.id), True)
+
+    async def _sweeper(self) -> None:
+        interval = min(60.0, max(1.0, self._ttl_seconds / 4))
+        while True:
+            await asyncio.sleep(interval)
+            cutoff = time.time() - self._ttl_seconds
+            expired = [
+                job for job in self._jobs.values()
+                if job.status in FINISHED_STATUSES and job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job in expired:
+                await self._delete(job)
+                self._expired += 1
+
+    def _spool(self, source: BinaryIO, job_dir: Path) -> int:
+        job_dir.mkdir(parents=True, exist_ok=True)
+        source.seek(0)
+        with open(job_dir / "input", "wb") as f:
+            shutil.copyfileobj(source, f, _SPOOL_CHUNK)
+            return f.tell()
+
+    def _write_state(self, job: Job) -> None:
+        path = self._job_dir(job.id) / "job.json"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".json.tmp")
+            temp_path.write_text(json.dumps(asdict(job), ensure_ascii=True, indent=2), encoding="utf-8")
+            temp_path.replace(path)
+        except OSError as e:
+            logger.warning("Failed to persist job %s: %s", job.id, e)
+
+    def _load(self) -> list[Job]:
+        if not self._dir.is_dir():
+            return []
+        jobs = []
+        for path in self._dir.glob("*/job.json"):
+            try:
+                jobs.append(Job(**json.loads(path.read_text(encoding="utf-8"))))
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning("Skipping unreadable job state %s: %s", path, e)
+        return jobs
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Failed to remove %s: %s", path, e)
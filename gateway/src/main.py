@@ -8,12 +8,15 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 
 from .backend_client import client
 from .config import load_backends_config, settings
+from . import metrics
+from .health_monitor import HealthMonitor
 from .terminal_feed import LogRedactor, TerminalFeed, as_sse, parse_source_filter, validate_level
 from .terminal_feed_bus_redis import RedisTerminalFeedBus
+from .upload_stream import UploadSizeLimitMiddleware
 from .voice_manager import VoiceManager
 
 logger = logging.getLogger(__name__)
@@ -24,6 +27,7 @@ _voice_manager: VoiceManager | None = None
 _start_time: float = 0.0
 _terminal_feed: TerminalFeed | None = None
 _terminal_feed_bus: RedisTerminalFeedBus | None = None
+_health_monitor: HealthMonitor | None = None
 _DASHBOARD_TEMPLATE: str = ""
 
 
@@ -50,10 +54,16 @@ def get_terminal_feed() -> TerminalFeed:
     return _terminal_feed
 
 
+def get_health_monitor() -> HealthMonitor:
+    if _health_monitor is None:
+        raise RuntimeError("Health monitor is not initialized")
+    return _health_monitor
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup: load config, init httpx pool, init voice manager."""
-    global _backends_config, _voice_manager, _start_time, _terminal_feed, _terminal_feed_bus
+    global _backends_config, _voice_manager, _start_time, _terminal_feed, _terminal_feed_bus, _health_monitor
 
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper(), logging.INFO),
@@ -96,13 +106,34 @@ async def lifespan(app: FastAPI):
         _terminal_feed.set_distributor(None)
         if bus_mode not in {"", "local"}:
             logger.warning("Unknown terminal feed bus mode '%s'; falling back to local-only mode", bus_mode)
-    await client.start()
+    await client.start(_backends_config.get("backends", {}))
+    _health_monitor = HealthMonitor(
+        client=client,
+        backends=_backends_config.get("backends", {}),
+        interval_seconds=settings.health_poll_interval_seconds,
+        probe_timeout_seconds=settings.health_probe_timeout_seconds,
+    )
+    await _health_monitor.start()
+    from .router_llm import start_model_catalogs
+    await start_model_catalogs()
+    from .router_jobs import start_jobs
+    await start_jobs()
     _start_time = _time.time()
     _load_dashboard_template()
     logger.info("Synapse Gateway started")
 
     yield
 
+    from .router_jobs import stop_jobs
+    await stop_jobs()
+    from .router_llm import EMBEDDING_BATCHER, ROUTER_RUNTIME_CONTROLLER, stop_model_catalogs
+    await stop_model_catalogs()
+    await ROUTER_RUNTIME_CONTROLLER.aclose()
+    if EMBEDDING_BATCHER is not None:
+        await EMBEDDING_BATCHER.aclose()
+    if _health_monitor is not None:
+        await _health_monitor.stop()
+        _health_monitor = None
     if _terminal_feed_bus is not None:
         await _terminal_feed_bus.stop()
         _terminal_feed_bus = None
@@ -116,6 +147,26 @@ async def lifespan(app: FastAPI):
 
 
 app = FastAPI(title="Synapse Gateway", version="1.0.0", lifespan=lifespan)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=settings.max_upload_mb * 1024 * 1024,
+    path_prefixes=("/stt/", "/speakers/", "/audio/", "/jobs/"),
+)
+# Outermost, so rejected uploads and unhandled errors are counted too.
+app.add_middleware(metrics.MetricsMiddleware)
+
+
+def _collect_state_metrics():
+    yield from metrics.backend_state_families(client.pool_stats(), client.breaker_states())
+    if _terminal_feed is not None:
+        yield from metrics.terminal_feed_families(_terminal_feed.stats())
+    from .router_jobs import JOBS
+    yield from metrics.job_families(JOBS.stats())
+    from .router_stt import REALTIME
+    yield from metrics.realtime_stt_families(REALTIME.stats())
+
+
+metrics.register_collector(_collect_state_metrics)
 
 
 # --- Error handling ---
@@ -138,21 +189,17 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 @app.get("/health")
 async def health():
-    """Aggregated health check across all registered backends."""
-    config = get_backends_config()
-    backends = config.get("backends", {})
-    results = {}
+    """Aggregated health across all registered backends (served from the poller snapshot)."""
+    snapshot = get_health_monitor().snapshot()
+    snapshot["pools"] = client.pool_stats()
+    return snapshot
 
-    for name, backend in backends.items():
-        health_path = backend.get("health", "/health")
-        url = f"{backend['url']}{health_path}"
-        results[name] = await client.health_check(name, url)
 
-    all_healthy = all(r["status"] == "healthy" for r in results.values())
-    return {
-        "status": "healthy" if all_healthy else "degraded",
-        "backends": results,
-    }
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus exposition of gateway and backend metrics."""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
 
 
 # --- Dashboard ---
@@ -219,14 +266,9 @@ def _event_matches_filters(event: dict, *, min_level: str, source_filter: set[st
 async def _build_dashboard_html() -> str:
     config = get_backends_config()
     backends = config.get("backends", {})
-    health_results = {}
-    for name, backend in backends.items():
-        health_path = backend.get("health", "/health")
-        url = f"{backend['url']}{health_path}"
-        health_results[name] = await client.health_check(name, url)
-
-    all_healthy = all(r["status"] == "healthy" for r in health_results.values())
-    overall = "healthy" if all_healthy else "degraded"
+    snapshot = get_health_monitor().snapshot()
+    health_results = snapshot["backends"]
+    overall = snapshot["status"]
     uptime_secs = _time.time() - _start_time if _start_time else 0
 
     return (
@@ -302,6 +344,8 @@ async def backend_routes():
     config = get_backends_config()
     raw_routes = config.get("routes", {})
     backends_cfg = config.get("backends", {})
+    monitor = get_health_monitor()
+    pools = client.pool_stats()
 
     # Group routes by target backend
     grouped: dict[str, list[dict]] = {}
@@ -320,6 +364,8 @@ async def backend_routes():
         health_path = backends_cfg[name].get("health", "/health")
         result[name] = {
             "title": name,
+            "health": monitor.backend_status(name),
+            "pool": pools.get(name),
             "groups": [
                 {"title": "Gateway Routes", "routes": routes},
                 {"title": "Ops", "routes": [{"method": "GET", "path": health_path}]},
@@ -353,9 +399,11 @@ from .router_tts import router as tts_router  # noqa: E402
 from .router_stt import router as stt_router  # noqa: E402
 from .router_speaker import router as speaker_router  # noqa: E402
 from .router_audio import router as audio_router  # noqa: E402
+from .router_jobs import router as jobs_router  # noqa: E402
 
 app.include_router(llm_router)
 app.include_router(tts_router)
 app.include_router(stt_router)
 app.include_router(speaker_router)
 app.include_router(audio_router)
+app.include_router(jobs_router)
@@ -0,0 +1,292 @@
+"""Prometheus metrics for the gateway (served at ``/metrics``).
+
+Hot-path series are label children bound once per route/backend and cached,
+so recording is a dict lookup plus a lock-free add. State that already lives
+elsewhere (pool occupancy, circuit breakers, terminal feed counters) is read
+at scrape time by a collector instead of being mirrored on every change.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    disable_created_metrics,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+
+# *_created series double the exposition size and nothing here uses them.
+disable_created_metrics()
+REGISTRY = CollectorRegistry()
+
+_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0,
+)
+_MODEL_SWAP_BUCKETS = (1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+# Label for requests that never matched a route (404s, early 413s), to keep
+# raw paths out of the label set.
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUESTS = Counter(
+    "synapse_http_requests_total", "Gateway HTTP requests.",
+    ["route", "method", "status"], registry=REGISTRY,
+)
+HTTP_DURATION = Histogram(
+    "synapse_http_request_duration_seconds", "Gateway request latency until the response body ends.",
+    ["route", "method"], buckets=_LATENCY_BUCKETS, registry=REGISTRY,
+)
+HTTP_TTFB = Histogram(
+    "synapse_http_time_to_first_byte_seconds", "Time to first body byte for streamed (unsized) responses.",
+    ["route", "method"], buckets=_LATENCY_BUCKETS, registry=REGISTRY,
+)
+HTTP_REQUEST_BYTES = Counter(
+    "synapse_http_request_bytes_total", "Request body bytes received (uploads).",
+    ["route", "method"], registry=REGISTRY,
+)
+HTTP_RESPONSE_BYTES = Counter(
+    "synapse_http_response_bytes_total", "Response body bytes sent (downloads).",
+    ["route", "method"], registry=REGISTRY,
+)
+BACKEND_DURATION = Histogram(
+    "synapse_backend_request_duration_seconds", "Backend latency until response headers.",
+    ["backend"], buckets=_LATENCY_BUCKETS, registry=REGISTRY,
+)
+BACKEND_REQUESTS = Counter(
+    "synapse_backend_requests_total", "Backend request attempts by outcome.",
+    ["backend", "outcome"], registry=REGISTRY,
+)
+BACKEND_RETRIES = Counter(
+    "synapse_backend_retries_total", "Backend attempts retried after a connect failure.",
+    ["backend"], registry=REGISTRY,
+)
+MODEL_SWAPS = Counter(
+    "synapse_model_swaps_total", "llama-router model loads by outcome.",
+    ["outcome"], registry=REGISTRY,
+)
+MODEL_SWAP_DURATION = Histogram(
+    "synapse_model_swap_duration_seconds", "llama-router model load time (request to loaded).",
+    ["outcome"], buckets=_MODEL_SWAP_BUCKETS, registry=REGISTRY,
+)
+MODEL_UNLOADS = Counter(
+    "synapse_model_unloads_total", "Models unloaded to make room for another.",
+    registry=REGISTRY,
+)
+
+
+class RouteSeries:
+    """Pre-bound children for one (route, method)."""
+
+    __slots__ = ("duration", "ttfb", "request_bytes", "response_bytes", "_route", "_method", "_status")
+
+    def __init__(self, route: str, method: str):
+        self._route = route
+        self._method = method
+        self.duration = HTTP_DURATION.labels(route, method)
+        self.ttfb = HTTP_TTFB.labels(route, method)
+        self.request_bytes = HTTP_REQUEST_BYTES.labels(route, method)
+        self.response_bytes = HTTP_RESPONSE_BYTES.labels(route, method)
+        self._status: dict[int, object] = {}
+
+    def count(self, status: int) -> None:
+        child = self._status.get(status)
+        if child is None:
+            child = self._status[status] = HTTP_REQUESTS.labels(self._route, self._method, str(status))
+        child.inc()
+
+
+class BackendSeries:
+    """Pre-bound children for one backend."""
+
+    __slots__ = ("duration", "ok", "connect_error", "pool_timeout", "error", "circuit_open", "retries")
+
+    def __init__(self, backend: str):
+        self.duration = BACKEND_DURATION.labels(backend)
+        self.ok = BACKEND_REQUESTS.labels(backend, "ok")
+        self.connect_error = BACKEND_REQUESTS.labels(backend, "connect_error")
+        self.pool_timeout = BACKEND_REQUESTS.labels(backend, "pool_timeout")
+        self.error = BACKEND_REQUESTS.labels(backend, "error")
+        self.circuit_open = BACKEND_REQUESTS.labels(backend, "circuit_open")
+        self.retries = BACKEND_RETRIES.labels(backend)
+
+
+_route_series: dict[str, dict[str, RouteSeries]] = {}
+_backend_series: dict[str, BackendSeries] = {}
+
+
+def route_series(route: str, method: str) -> RouteSeries:
+    by_method = _route_series.get(route)
+    if by_method is None:
+        by_method = _route_series[route] = {}
+    series = by_method.get(method)
+    if series is None:
+        series = by_method[method] = RouteSeries(route, method)
+    return series
+
+
+def backend_series(backend: str) -> BackendSeries:
+    series = _backend_series.get(backend)
+    if series is None:
+        series = _backend_series[backend] = BackendSeries(backend)
+    return series
+
+
+def observe_model_swap(outcome: str, seconds: float) -> None:
+    MODEL_SWAPS.labels(outcome).inc()
+    MODEL_SWAP_DURATION.labels(outcome).observe(seconds)
+
+
+class _CallbackCollector:
+    def __init__(self, collect: Callable[[], Iterable[Metric]]):
+        self._collect = collect
+
+    def collect(self) -> Iterable[Metric]:
+        return self._collect()
+
+
+def register_collector(collect: Callable[[], Iterable[Metric]]) -> None:
+    """Register a callable that yields metric families at scrape time."""
+    REGISTRY.register(_CallbackCollector(collect))
+
+
+def backend_state_families(pool_stats: dict[str, dict], breaker_states: dict[str, str]) -> Iterable[Metric]:
+    in_flight = GaugeMetricFamily(
+        "synapse_backend_pool_in_flight", "Requests holding or waiting for a backend connection.", labels=["backend"]
+    )
+    queued = GaugeMetricFamily(
+        "synapse_backend_pool_queued", "Requests waiting for a free backend connection.", labels=["backend"]
+    )
+    limit = GaugeMetricFamily(
+        "synapse_backend_pool_max_connections", "Backend connection pool size.", labels=["backend"]
+    )
+    for name, stats in pool_stats.items():
+        in_flight.add_metric([name], stats["in_flight"])
+        queued.add_metric([name], stats["queued"])
+        if stats["max_connections"] is not None:
+            limit.add_metric([name], stats["max_connections"])
+    breaker = GaugeMetricFamily(
+        "synapse_backend_circuit_state", "Circuit breaker state (1 for the current state).",
+        labels=["backend", "state"],
+    )
+    for name, state in breaker_states.items():
+        for candidate in ("closed", "half-open", "open"):
+            breaker.add_metric([name, candidate], 1.0 if state == candidate else 0.0)
+    return [in_flight, queued, limit, breaker]
+
+
+def terminal_feed_families(stats: dict) -> Iterable[Metric]:
+    dropped = CounterMetricFamily(
+        "synapse_terminal_feed_dropped_events", "Terminal feed events dropped for slow subscribers."
+    )
+    dropped.add_metric([], stats["dropped_events"])
+    publish_failures = CounterMetricFamily(
+        "synapse_terminal_feed_publish_failures", "Terminal feed events the distributor failed to publish."
+    )
+    publish_failures.add_metric([], stats["distributed_publish_failures"])
+    subscribers = GaugeMetricFamily("synapse_terminal_feed_subscribers", "Connected terminal feed subscribers.")
+    subscribers.add_metric([], stats["subscriber_count"])
+    return [dropped, publish_failures, subscribers]
+
+
+def job_families(stats: dict) -> Iterable[Metric]:
+    jobs = GaugeMetricFamily("synapse_jobs", "Async jobs currently held, by kind and status.", labels=["kind", "status"])
+    for kind, by_status in stats["by_kind"].items():
+        for status, count in by_status.items():
+            jobs.add_metric([kind, status], count)
+    completed = CounterMetricFamily("synapse_jobs_completed", "Async jobs finished, by outcome.", labels=["status"])
+    for status, count in stats["completed"].items():
+        completed.add_metric([status], count)
+    webhook_failures = CounterMetricFamily(
+        "synapse_job_webhook_failures", "Job webhooks abandoned after retries."
+    )
+    webhook_failures.add_metric([], stats["webhook_failures"])
+    return [jobs, completed, webhook_failures]
+
+
+def realtime_stt_families(stats: dict) -> Iterable[Metric]:
+    sessions = GaugeMetricFamily("synapse_stt_realtime_sessions", "Open /stt/realtime WebSocket sessions.")
+    sessions.add_metric([], stats["active_sessions"])
+    inflight = GaugeMetricFamily(
+        "synapse_stt_realtime_backend_inflight", "Realtime speech windows being transcribed by whisper-stt."
+    )
+    inflight.add_metric([], stats["backend_inflight"])
+    messages = CounterMetricFamily(
+        "synapse_stt_realtime_messages", "Realtime transcripts sent, by type.", labels=["type"]
+    )
+    messages.add_metric(["partial"], stats["partials"])
+    messages.add_metric(["final"], stats["finals"])
+    skipped = CounterMetricFamily(
+        "synapse_stt_realtime_partials_skipped", "Partials skipped because the backend slots were busy."
+    )
+    skipped.add_metric([], stats["partials_skipped"])
+    waits = CounterMetricFamily(
+        "synapse_stt_realtime_backpressure_waits",
+        "Times a session stopped reading its socket because its utterance queue was full.",
+    )
+    waits.add_metric([], stats["backpressure_waits"])
+    return [sessions, inflight, messages, skipped, waits]
+
+
+def render() -> tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """Record per-route latency, status, TTFB and body bytes.
+
+    Routes are labelled by their template (``/voices/{voice_id}``), read from
+    the scope after routing, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        sized = True
+        first_byte_at = 0.0
+        request_bytes = 0
+        response_bytes = 0
+
+        async def counting_receive():
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def timing_send(message):
+            nonlocal status, sized, first_byte_at, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                sized = any(key == b"content-length" for key, _ in message.get("headers", ()))
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                if body and not first_byte_at:
+                    first_byte_at = time.perf_counter()
+                response_bytes += len(body)
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, timing_send)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            series = route_series(route, scope["method"])
+            series.count(status)
+            series.duration.observe(time.perf_counter() - started)
+            if not sized and first_byte_at:
+                series.ttfb.observe(first_byte_at - started)
+            if request_bytes:
+                series.request_bytes.inc(request_bytes)
+            if response_bytes:
+                series.response_bytes.inc(response_bytes)
@@ -0,0 +1,107 @@
+"""Cached backend model catalogs with background and change-driven refresh."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class ModelCatalog:
+    """Holds the last fetched catalog and refreshes it off the request path.
+
+    ``invalidate()`` bumps a generation counter so a fetch that started before
+    a load/unload can never overwrite the catalog with pre-change state.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl_seconds: float,
+        refresh_interval_seconds: float,
+    ):
+        self._name = name
+        self._fetch = fetch
+        self._ttl_seconds = max(0.0, ttl_seconds)
+        self._refresh_interval_seconds = max(1.0, refresh_interval_seconds)
+        self._value: Any = None
+        self._fetched_at: float | None = None
+        self._generation = 0
+        self._flights = SingleFlight()
+        self._hits = 0
+        self._fetches = 0
+        self._invalidations = 0
+        self._task: asyncio.Task | None = None
+        self._running = False
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get(self) -> Any:
+        """Return the cached catalog, fetching first when it is missing or stale."""
+        if self._fetched_at is not None and time.monotonic() - self._fetched_at <= self._ttl_seconds:
+            self._hits += 1
+            return self._value
+        return await self.refresh()
+
+    async def refresh(self) -> Any:
+        """Fetch now; callers in the same generation share one upstream call."""
+        generation = self._generation
+        return await self._flights.do(generation, lambda: self._fetch_generation(generation))
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._fetched_at = None
+        self._invalidations += 1
+
+    def stats(self) -> dict:
+        age = None
+        if self._fetched_at is not None:
+            age = round(time.monotonic() - self._fetched_at, 3)
+        return {
+            "name": self._name,
+            "age_seconds": age,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self._hits,
+            "fetches": self._fetches,
+            "invalidations": self._invalidations,
+        }
+
+    async def _fetch_generation(self, generation: int) -> Any:
+        self._fetches += 1
+        value = await self._fetch()
+        if generation == self._generation:
+            self._value = value
+            self._fetched_at = time.monotonic()
+        return value
+
+    async def _run_loop(self) -> None:
+        while self._running:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Backends restart routinely; request-path callers surface errors.
+                logger.debug("%s catalog refresh failed: %s", self._name, e)
+            await asyncio.sleep(self._refresh_interval_seconds)
@@ -0,0 +1,195 @@
+"""Model-aware admission scheduler for llama-router chat traffic.
+
+llama-router runs with ``--models-max 1``, so interleaving requests for two
+models swaps weights on nearly every call. The scheduler keeps admitting
+requests for the active model while other models queue, switches only once the
+active model has no requests in flight, and bounds how long any queue waits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class ModelLease:
+    """Admission for one request on one model. ``release()`` is idempotent."""
+
+    def __init__(self, scheduler: ModelScheduler, model_id: str):
+        self._scheduler = scheduler
+        self.model_id = model_id
+        self._released = False
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._scheduler._release()
+
+
+class ModelScheduler:
+    """Per-model FIFO queues in front of a single-model backend."""
+
+    def __init__(self, *, max_starvation_seconds: float = 30.0):
+        self._max_starvation_seconds = max(0.0, max_starvation_seconds)
+        self._active_model: str | None = None
+        self._in_flight = 0
+        self._queues: dict[str, deque[tuple[float, asyncio.Future]]] = {}
+        self._preparing = SingleFlight()
+        self._prepared_model: str | None = None
+        self._admitted = 0
+        self._queued = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._swap_count = 0
+        self._swap_seconds_total = 0.0
+        self._last_swap_seconds = 0.0
+
+    async def acquire(
+        self, model_id: str, prepare: Callable[[], Awaitable[None]]
+    ) -> ModelLease:
+        """Wait for the model's turn, make sure it is loaded, and return a lease."""
+        enqueued_at = time.monotonic()
+        if self._can_admit(model_id, enqueued_at):
+            self._active_model = model_id
+            self._in_flight += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            queue = self._queues.setdefault(model_id, deque())
+            queue.append((enqueued_at, future))
+            self._queued += 1
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # Admitted in the same tick we were cancelled: give the slot back.
+                    self._release()
+                else:
+                    self._discard_waiter(model_id, future)
+                raise
+
+        wait = time.monotonic() - enqueued_at
+        self._admitted += 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+
+        lease = ModelLease(self, model_id)
+        try:
+            await self._prepare(model_id, prepare)
+        except BaseException:
+            lease.release()
+            raise
+        return lease
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        queues = {}
+        for model_id, queue in self._queues.items():
+            if not queue:
+                continue
+            queues[model_id] = {
+                "depth": len(queue),
+                "oldest_wait_seconds": round(now - queue[0][0], 3),
+            }
+        return {
+            "active_model": self._active_model,
+            "in_flight": self._in_flight,
+            "queues": queues,
+            "queue_depth": sum(len(queue) for queue in self._queues.values()),
+            "max_starvation_seconds": self._max_starvation_seconds,
+            "admitted": self._admitted,
+            "queued": self._queued,
+            "avg_wait_seconds": round(self._wait_total / self._admitted, 3) if self._admitted else 0.0,
+            "max_wait_seconds": round(self._wait_max, 3),
+            "swap_count": self._swap_count,
+            "swap_seconds_total": round(self._swap_seconds_total, 3),
+            "last_swap_seconds": round(self._last_swap_seconds, 3),
+        }
+
+    # --- Internals ---
+
+    def _oldest_other_wait(self, model_id: str, now: float) -> float:
+        oldest = 0.0
+        for other_id, queue in self._queues.items():
+            if other_id == model_id or not queue:
+                continue
+            oldest = max(oldest, now - queue[0][0])
+        return oldest
+
+    def _can_admit(self, model_id: str, now: float) -> bool:
+        if self._active_model is None or (self._in_flight == 0 and not self._has_waiters()):
+            return True
+        if self._active_model != model_id:
+            return False
+        # Keep draining the active model unless another queue has waited too long.
+        return self._oldest_other_wait(model_id, now) < self._max_starvation_seconds
+
+    def _has_waiters(self) -> bool:
+        return any(self._queues.values())
+
+    def _discard_waiter(self, model_id: str, future: asyncio.Future) -> None:
+        queue = self._queues.get(model_id)
+        if not queue:
+            return
+        for entry in queue:
+            if entry[1] is future:
+                queue.remove(entry)
+                break
+
+    def _release(self) -> None:
+        self._in_flight = max(0, self._in_flight - 1)
+        if self._in_flight == 0:
+            self._dispatch()
+
+    def _next_model(self, now: float) -> str | None:
+        active_queue = self._queues.get(self._active_model or "")
+        if active_queue and self._oldest_other_wait(self._active_model, now) < self._max_starvation_seconds:
+            return self._active_model
+        candidates = [
+            (queue[0][0], model_id) for model_id, queue in self._queues.items() if queue
+        ]
+        if not candidates:
+            return None
+        return min(candidates)[1]
+
+    def _dispatch(self) -> None:
+        """Admit the next model's whole queue once nothing is in flight."""
+        while self._in_flight == 0:
+            next_model = self._next_model(time.monotonic())
+            if next_model is None:
+                return
+            if next_model != self._active_model:
+                logger.info(
+                    "Model scheduler switching %s -> %s (%d queued)",
+                    self._active_model, next_model, len(self._queues[next_model]),
+                )
+            self._active_model = next_model
+            queue = self._queues[next_model]
+            while queue:
+                _enqueued_at, future = queue.popleft()
+                if future.done():
+                    continue
+                future.set_result(None)
+                self._in_flight += 1
+
+    async def _prepare(self, model_id: str, prepare: Callable[[], Awaitable[None]]) -> None:
+        """Run ``prepare`` once per admitted group; concurrent callers share it."""
+        await self._preparing.do(model_id, lambda: self._run_prepare(model_id, prepare))
+
+    async def _run_prepare(self, model_id: str, prepare: Callable[[], Awaitable[None]]) -> None:
+        swapping = self._prepared_model is not None and self._prepared_model != model_id
+        started = time.monotonic()
+        await prepare()
+        if swapping:
+            elapsed = time.monotonic() - started
+            self._swap_count += 1
+            self._swap_seconds_total += elapsed
+            self._last_swap_seconds = elapsed
+        self._prepared_model = model_id
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -12,6 +13,8 @@ class SynthesizeRequest(BaseModel):
     language: str = "en"
     speed: float = Field(default=1.0, ge=0.5, le=2.0)
     split_sentences: bool = True
+    # Compressed formats are encoded in the gateway as audio arrives.
+    output_format: Literal["wav", "opus", "webm", "mp3", "flac"] = "wav"
 
 
 class StreamRequest(BaseModel):
@@ -20,6 +23,8 @@ class StreamRequest(BaseModel):
     language: str = "en"
     speed: float = Field(default=1.0, ge=0.5, le=2.0)
     split_sentences: bool = True
+    # "pcm" is headerless 16-bit audio; its format is in the X-Audio-* headers.
+    output_format: Literal["wav", "pcm", "opus", "webm", "mp3", "flac"] = "wav"
 
 
 class VoiceWeight(BaseModel):
@@ -0,0 +1,529 @@
+"""Real-time STT over WebSocket: VAD endpointing and windowed transcription.
+
+Clients stream audio frames. An energy VAD with an adaptive noise floor cuts
+the stream into utterances. Each finished utterance is sent to whisper-stt as
+one window and answered with a ``final`` message; the utterance still in
+progress is re-transcribed periodically for ``partial`` messages. Timestamps
+are seconds since the first audio byte of the stream.
+
+Buffers are bounded: an utterance is cut at ``max_utterance_seconds``, at most
+``max_pending`` finished utterances wait for the backend per session, and
+while that queue is full the session stops reading the socket, so the
+client's sends block instead of the gateway buffering. Backend calls across
+all sessions share ``max_inflight`` slots; partials are skipped, not queued,
+when those are all busy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import shutil
+import struct
+import sys
+from array import array
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+AUDIO_FORMATS = ("pcm", "opus")
+
+_BYTES_PER_SAMPLE = 2
+_FRAME_MS = 20
+_READ_SIZE = 32 * 1024
+# A confident first detection fixes the language for the rest of the stream.
+_PIN_LANGUAGE_PROBABILITY = 0.5
+
+
+class AudioDecodeError(Exception):
+    pass
+
+
+class WindowTranscribeError(Exception):
+    pass
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """16-bit mono PCM wrapped in a minimal WAV header."""
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(pcm), b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * _BYTES_PER_SAMPLE, _BYTES_PER_SAMPLE, 16,
+        b"data", len(pcm),
+    )
+    return header + pcm
+
+
+def _frame_rms(frame: bytes) -> float:
+    samples = array("h", frame)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return math.sqrt(sum(s * s for s in samples) / len(samples)) if samples else 0.0
+
+
+@dataclass(frozen=True)
+class Utterance:
+    index: int
+    start_sample: int
+    pcm: bytes
+
+    @property
+    def start(self) -> float:
+        return self.start_sample / SAMPLE_RATE
+
+    @property
+    def end(self) -> float:
+        return (self.start_sample + len(self.pcm) // _BYTES_PER_SAMPLE) / SAMPLE_RATE
+
+
+class SpeechEndpointer:
+    """Cuts 16 kHz s16le PCM into utterances with an energy VAD.
+
+    A 20 ms frame is speech when its RMS is above both ``min_rms`` and
+    ``threshold_ratio`` × the noise floor. The floor follows quiet frames
+    quickly and loud ones slowly, so steady background noise is absorbed
+    within seconds. An utterance opens after ``start_ms`` of speech (keeping
+    ``pre_roll_ms`` before it) and closes after ``end_silence_ms`` of silence
+    or once it reaches ``max_utterance_seconds``.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_rms: float,
+        threshold_ratio: float,
+        end_silence_ms: int,
+        max_utterance_seconds: float,
+        start_ms: int = 60,
+        pre_roll_ms: int = 300,
+        trailing_ms: int = 200,
+    ):
+        self._frame_bytes = SAMPLE_RATE * _FRAME_MS // 1000 * _BYTES_PER_SAMPLE
+        self._min_rms = max(0.0, min_rms)
+        self._ratio = max(1.0, threshold_ratio)
+        self._noise = self._min_rms / self._ratio
+        self._start_frames = max(1, start_ms // _FRAME_MS)
+        self._end_frames = max(1, end_silence_ms // _FRAME_MS)
+        self._trailing_frames = min(self._end_frames, trailing_ms // _FRAME_MS)
+        self._max_bytes = max(self._frame_bytes, int(max_utterance_seconds * SAMPLE_RATE) * _BYTES_PER_SAMPLE)
+        self._pending = bytearray()
+        self._pre_roll: deque[bytes] = deque(maxlen=max(self._start_frames, pre_roll_ms // _FRAME_MS))
+        self._samples = 0
+        self._speech_run = 0
+        self._silence_run = 0
+        self._active: bytearray | None = None
+        self._active_start = 0
+        self._count = 0
+
+    @property
+    def active(self) -> Utterance | None:
+        """Snapshot of the utterance in progress, if any."""
+        if self._active is None:
+            return None
+        return Utterance(self._count, self._active_start, bytes(self._active))
+
+    def feed(self, pcm: bytes) -> list[Utterance]:
+        """Consume PCM; returns the utterances it completed."""
+        self._pending.extend(pcm)
+        finished = []
+        offset = 0
+        while len(self._pending) - offset >= self._frame_bytes:
+            utterance = self._frame(bytes(self._pending[offset:offset + self._frame_bytes]))
+            offset += self._frame_bytes
+            if utterance is not None:
+                finished.append(utterance)
+        del self._pending[:offset]
+        return finished
+
+    def flush(self) -> Utterance | None:
+        """Close the utterance in progress at the end of the stream."""
+        if self._active is None:
+            return None
+        return self._close(trim_frames=0)
+
+    def _frame(self, frame: bytes) -> Utterance | None:
+        rms = _frame_rms(frame)
+        speech = rms > max(self._min_rms, self._noise * self._ratio)
+        self._noise += (0.1 if rms < self._noise else 0.002) * (rms - self._noise)
+        self._samples += len(frame) // _BYTES_PER_SAMPLE
+
+        if self._active is None:
+            self._pre_roll.append(frame)
+            self._speech_run = self._speech_run + 1 if speech else 0
+            if self._speech_run >= self._start_frames:
+                self._active = bytearray(b"".join(self._pre_roll))
+                self._active_start = self._samples - len(self._active) // _BYTES_PER_SAMPLE
+                self._pre_roll.clear()
+                self._speech_run = 0
+                self._silence_run = 0
+                self._count += 1
+            return None
+
+        self._active.extend(frame)
+        self._silence_run = 0 if speech else self._silence_run + 1
+        if self._silence_run >= self._end_frames:
+            return self._close(trim_frames=self._silence_run - self._trailing_frames)
+        if len(self._active) >= self._max_bytes:
+            return self._close(trim_frames=0)
+        return None
+
+    def _close(self, *, trim_frames: int) -> Utterance:
+        pcm = self._active
+        if trim_frames > 0:
+            del pcm[len(pcm) - trim_frames * self._frame_bytes:]
+        utterance = Utterance(self._count, self._active_start, bytes(pcm))
+        self._active = None
+        self._silence_run = 0
+        return utterance
+
+
+def decoder_command(ffmpeg: str, audio_format: str, sample_rate: int) -> list[str] | None:
+    """ffmpeg argv converting the client's audio to 16 kHz mono s16le; None if it already is."""
+    if audio_format == "pcm":
+        if sample_rate == SAMPLE_RATE:
+            return None
+        # Without a tiny probe ffmpeg buffers raw input until EOF.
+        input_args = ["-probesize", "32", "-analyzeduration", "0", "-f", "s16le", "-ar", str(sample_rate), "-ac", "1"]
+    else:
+        # Opus in Ogg or WebM; the container header is all ffmpeg needs to start.
+        input_args = ["-probesize", "4096", "-analyzeduration", "0"]
+    return [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin",
+        *input_args, "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-flush_packets", "1", "pipe:1",
+    ]
+
+
+async def _passthrough(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        yield chunk
+
+
+async def _ffmpeg_decode(command: list[str], chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Yield decoded PCM while the client audio is still arriving."""
+    proc = await asyncio.create_subprocess_exec(
+        *command,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    feeder = asyncio.create_task(_feed(proc, chunks))
+    try:
+        while chunk := await proc.stdout.read(_READ_SIZE):
+            yield chunk
+        # Re-raises a client disconnect seen while feeding.
+        await feeder
+        if await proc.wait() != 0:
+            stderr = (await proc.stderr.read()).decode("utf-8", "replace").strip()
+            raise AudioDecodeError(f"Audio decode failed: {stderr[-500:]}")
+    finally:
+        feeder.cancel()
+        await asyncio.gather(feeder, return_exceptions=True)
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+
+async def _feed(proc: asyncio.subprocess.Process, chunks: AsyncIterator[bytes]) -> None:
+    try:
+        async for chunk in chunks:
+            proc.stdin.write(chunk)
+            # Blocks while ffmpeg's output is not consumed: backpressure reaches the socket.
+            await proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # ffmpeg exited early; its exit status carries the error.
+        return
+    finally:
+        if not proc.stdin.is_closing():
+            proc.stdin.close()
+
+
+class RealtimeSTT:
+    """Accepts ``/stt/realtime`` sessions and bounds their backend use.
+
+    ``transcribe(wav, fields)`` posts one window to whisper-stt and returns
+    its TranscriptionResult JSON, raising WindowTranscribeError on failure.
+    """
+
+    def __init__(
+        self,
+        *,
+        transcribe: Callable[[bytes, dict[str, str]], Awaitable[dict]],
+        max_sessions: int,
+        max_inflight: int,
+        max_pending: int,
+        partial_interval_ms: int,
+        endpoint_silence_ms: int,
+        max_utterance_seconds: float,
+        vad_min_rms: float,
+        vad_threshold_ratio: float,
+        ffmpeg: str = "ffmpeg",
+    ):
+        self._transcribe = transcribe
+        self._max_sessions = max(1, max_sessions)
+        self._slots = asyncio.Semaphore(max(1, max_inflight))
+        self._max_inflight = max(1, max_inflight)
+        self.max_pending = max(1, max_pending)
+        # Speech added to an utterance between partials; 0 disables them.
+        self.partial_bytes = max(0, partial_interval_ms) * SAMPLE_RATE // 1000 * _BYTES_PER_SAMPLE
+        self._endpoint_silence_ms = endpoint_silence_ms
+        self._max_utterance_seconds = max_utterance_seconds
+        self._vad_min_rms = vad_min_rms
+        self._vad_threshold_ratio = vad_threshold_ratio
+        self._ffmpeg = shutil.which(ffmpeg)
+        self._active = 0
+        self._inflight = 0
+        self._counters = dict.fromkeys(
+            (
+                "sessions", "rejected", "audio_seconds", "utterances", "finals", "partials",
+                "partials_skipped", "backend_errors", "backpressure_waits",
+            ),
+            0,
+        )
+
+    async def serve(
+        self,
+        websocket: WebSocket,
+        *,
+        audio_format: str,
+        sample_rate: int,
+        language: str | None,
+        word_timestamps: bool,
+    ) -> None:
+        await websocket.accept()
+        if audio_format not in AUDIO_FORMATS or not 8000 <= sample_rate <= 48000:
+            await _reject(websocket, 1003, f"format must be one of {', '.join(AUDIO_FORMATS)}; sample_rate 8000-48000")
+            return
+        command = decoder_command(self._ffmpeg or "ffmpeg", audio_format, sample_rate)
+        if command is not None and self._ffmpeg is None:
+            await _reject(websocket, 1003, "ffmpeg is not installed; send 16 kHz pcm")
+            return
+        if self._active >= self._max_sessions:
+            self._counters["rejected"] += 1
+            await _reject(websocket, 1013, "Too many realtime sessions")
+            return
+
+        self._active += 1
+        self._counters["sessions"] += 1
+        session = _Session(self, websocket, language=language or None, word_timestamps=word_timestamps)
+        try:
+            await session.run(command)
+        finally:
+            self._active -= 1
+
+    def new_endpointer(self) -> SpeechEndpointer:
+        return SpeechEndpointer(
+            min_rms=self._vad_min_rms,
+            threshold_ratio=self._vad_threshold_ratio,
+            end_silence_ms=self._endpoint_silence_ms,
+            max_utterance_seconds=self._max_utterance_seconds,
+        )
+
+    @property
+    def saturated(self) -> bool:
+        return self._slots.locked()
+
+    async def transcribe(self, utterance: Utterance, fields: dict[str, str]) -> dict:
+        async with self._slots:
+            self._inflight += 1
+            try:
+                return await self._transcribe(pcm_to_wav(utterance.pcm), fields)
+            finally:
+                self._inflight -= 1
+
+    def count(self, name: str, amount: float = 1) -> None:
+        self._counters[name] += amount
+
+    def stats(self) -> dict:
+        return {
+            "active_sessions": self._active,
+            "max_sessions": self._max_sessions,
+            "backend_inflight": self._inflight,
+            "max_inflight": self._max_inflight,
+            **{
+                name: round(value, 1) if isinstance(value, float) else value
+                for name, value in self._counters.items()
+            },
+        }
+
+
+async def _reject(websocket: WebSocket, code: int, detail: str) -> None:
+    await websocket.send_json({"type": "error", "detail": detail})
+    await websocket.close(code=code, reason=detail[:120])
+
+
+class _Session:
+    def __init__(self, manager: RealtimeSTT, websocket: WebSocket, *, language: str | None, word_timestamps: bool):
+        self._manager = manager
+        self._ws = websocket
+        self._language = language
+        self._word_timestamps = word_timestamps
+        self._endpointer = manager.new_endpointer()
+        self._finals: asyncio.Queue[Utterance | None] = asyncio.Queue(maxsize=manager.max_pending)
+        self._send_lock = asyncio.Lock()
+        self._worker: asyncio.Task | None = None
+        self._partial: asyncio.Task | None = None
+        self._partial_mark = (0, 0)
+        self._last_queued = 0
+
+    async def run(self, command: list[str] | None) -> None:
+        decoded = _passthrough if command is None else lambda chunks: _ffmpeg_decode(command, chunks)
+        self._worker = asyncio.create_task(self._final_worker())
+        try:
+            await self._send({"type": "ready", "sample_rate": SAMPLE_RATE})
+            async for pcm in decoded(self._receive_audio()):
+                self._manager.count("audio_seconds", len(pcm) / (SAMPLE_RATE * _BYTES_PER_SAMPLE))
+                for utterance in self._endpointer.feed(pcm):
+                    await self._enqueue(utterance)
+                self._maybe_partial()
+            tail = self._endpointer.flush()
+            if tail is not None:
+                await self._enqueue(tail)
+            await self._enqueue(None)
+            await self._worker
+            await self._send({"type": "done"})
+            await self._ws.close()
+        except WebSocketDisconnect:
+            logger.debug("Realtime STT client disconnected")
+        except AudioDecodeError as e:
+            await self._close_with_error(1007, str(e))
+        except Exception as e:
+            logger.exception("Realtime STT session failed")
+            await self._close_with_error(1011, str(e))
+        finally:
+            for task in (self._worker, self._partial):
+                if task is not None:
+                    task.cancel()
+            await asyncio.gather(*(t for t in (self._worker, self._partial) if t is not None), return_exceptions=True)
+
+    async def _receive_audio(self) -> AsyncIterator[bytes]:
+        """Binary messages until the client sends ``{"type": "stop"}``."""
+        while True:
+            message = await self._ws.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                yield message["bytes"]
+            elif message.get("text") is not None and _is_stop(message["text"]):
+                return
+
+    async def _enqueue(self, utterance: Utterance | None) -> None:
+        """Queue a finished utterance; blocks (and stops reading the socket) while the queue is full."""
+        if utterance is not None:
+            self._last_queued = utterance.index
+            self._manager.count("utterances")
+        if self._finals.full():
+            self._manager.count("backpressure_waits")
+        put = asyncio.ensure_future(self._finals.put(utterance))
+        await asyncio.wait({put, self._worker}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            # The worker only stops early on a send failure; surface it.
+            self._worker.result()
+            raise WebSocketDisconnect(1006)
+
+    def _fields(self, word_timestamps: bool) -> dict[str, str]:
+        fields = {"word_timestamps": "true" if word_timestamps else "false"}
+        if self._language:
+            fields["language"] = self._language
+        return fields
+
+    def _maybe_partial(self) -> None:
+        active = self._endpointer.active
+        if active is None or not self._manager.partial_bytes:
+            return
+        index, mark = self._partial_mark
+        if index == active.index and len(active.pcm) - mark < self._manager.partial_bytes:
+            return
+        if index != active.index and len(active.pcm) < self._manager.partial_bytes:
+            return
+        if self._partial is not None and not self._partial.done():
+            return
+        if self._manager.saturated:
+            self._manager.count("partials_skipped")
+            return
+        self._partial_mark = (active.index, len(active.pcm))
+        self._partial = asyncio.create_task(self._send_partial(active))
+
+    async def _send_partial(self, utterance: Utterance) -> None:
+        try:
+            result = await self._manager.transcribe(utterance, self._fields(False))
+        except Exception as e:
+            # Partials are best effort; the final for this utterance reports errors.
+            logger.debug("Realtime STT partial failed: %s", e)
+            return
+        if utterance.index <= self._last_queued:
+            return
+        self._manager.count("partials")
+        await self._send({
+            "type": "partial",
+            "utterance": utterance.index,
+            "start": round(utterance.start, 3),
+            "end": round(utterance.end, 3),
+            "text": result.get("text", ""),
+        })
+
+    async def _final_worker(self) -> None:
+        while (utterance := await self._finals.get()) is not None:
+            try:
+                result = await self._manager.transcribe(utterance, self._fields(self._word_timestamps))
+            except Exception as e:
+                self._manager.count("backend_errors")
+                await self._send({"type": "error", "utterance": utterance.index, "detail": str(e)})
+                continue
+            if self._language is None and result.get("language_probability", 0.0) >= _PIN_LANGUAGE_PROBABILITY:
+                self._language = result.get("language")
+            self._manager.count("finals")
+            await self._send(_final_message(utterance, result))
+
+    async def _send(self, message: dict) -> None:
+        async with self._send_lock:
+            await self._ws.send_text(json.dumps(message))
+
+    async def _close_with_error(self, code: int, detail: str) -> None:
+        try:
+            await self._send({"type": "error", "detail": detail})
+            await self._ws.close(code=code, reason=detail[:120])
+        except Exception:
+            pass
+
+
+def _is_stop(text: str) -> bool:
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and payload.get("type") == "stop"
+
+
+def _final_message(utterance: Utterance, result: dict) -> dict:
+    """Backend result with segment and word times shifted onto the stream clock."""
+    offset = utterance.start
+    segments = []
+    for seg in result.get("segments", []):
+        words = seg.get("words")
+        segments.append({
+            "text": seg.get("text", ""),
+            "start": round(seg.get("start", 0.0) + offset, 3),
+            "end": round(seg.get("end", 0.0) + offset, 3),
+            "words": [
+                {**word, "start": round(word["start"] + offset, 3), "end": round(word["end"] + offset, 3)}
+                for word in words
+            ] if words else None,
+        })
+    return {
+        "type": "final",
+        "utterance": utterance.index,
+        "start": round(utterance.start, 3),
+        "end": round(utterance.end, 3),
+        "text": result.get("text", ""),
+        "language": result.get("language"),
+        "segments": segments,
+    }
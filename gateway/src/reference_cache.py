@@ -0,0 +1,226 @@
+"""Persistent, content-addressed cache of Chatterbox reference uploads."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def remote_reference_name(digest: str) -> str:
+    """Deterministic Chatterbox filename for reference content."""
+    return f"synapse_{digest[:32]}.wav"
+
+
+class ReferenceUploadCache:
+    """Maps reference WAV content (SHA-256) to the filename Chatterbox stored.
+
+    The index lives on the voices PVC so restarts and other replicas reuse it.
+    Uploads are verified against Chatterbox's reference listing (refreshed at
+    most once per ``verify_interval_seconds``) because Chatterbox can lose
+    them on restart; misses re-upload once per digest via single-flight.
+    """
+
+    def __init__(
+        self,
+        *,
+        index_path: str,
+        max_entries: int,
+        verify_interval_seconds: float,
+        upload: Callable[[str, str], Awaitable[str]],
+        list_remote: Callable[[], Awaitable[set[str]]],
+    ):
+        self._index_path = Path(index_path)
+        self._max_entries = max(1, max_entries)
+        self._verify_interval_seconds = max(0.0, verify_interval_seconds)
+        self._upload = upload
+        self._list_remote = list_remote
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._index_mtime: float | None = None
+        self._index_lock = asyncio.Lock()
+        self._digests: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._remote: set[str] | None = None
+        self._remote_checked_at = 0.0
+        # Names Chatterbox rejected since the last upload, even if listed or indexed.
+        self._missing: set[str] = set()
+        self._flights = SingleFlight()
+        self._hits = 0
+        self._adopted = 0
+        self._uploads = 0
+        self._evictions = 0
+
+    async def resolve(self, ref_path: str) -> str:
+        """Return the Chatterbox filename for ``ref_path``, uploading if needed."""
+        digest = await self.digest(ref_path)
+        entry = self._entries.get(digest)
+        if entry is not None and self._remote_fresh() and entry["remote_name"] in self._remote:
+            self._entries.move_to_end(digest)
+            entry["last_used"] = time.time()
+            self._hits += 1
+            return entry["remote_name"]
+        return await self._flights.do(("ensure", digest), lambda: self._ensure(digest, ref_path))
+
+    def forget_remote(self, remote_name: str) -> None:
+        """Chatterbox reported ``remote_name`` missing; the next resolve re-uploads it."""
+        self._missing.add(remote_name)
+        if self._remote is not None:
+            self._remote.discard(remote_name)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self._hits,
+            "adopted": self._adopted,
+            "uploads": self._uploads,
+            "evictions": self._evictions,
+            "remote_files": len(self._remote) if self._remote is not None else None,
+        }
+
+    # --- Internals ---
+
+    def _remote_fresh(self) -> bool:
+        return (
+            self._remote is not None
+            and time.monotonic() - self._remote_checked_at <= self._verify_interval_seconds
+        )
+
+    async def digest(self, ref_path: str) -> str:
+        """SHA-256 of the file's content, memoized by (path, mtime, size)."""
+        stat = await asyncio.to_thread(os.stat, ref_path)
+        key = (ref_path, stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = await asyncio.to_thread(self._hash_file, ref_path)
+            self._digests[key] = digest
+            while len(self._digests) > self._max_entries * 4:
+                self._digests.popitem(last=False)
+        return digest
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(_HASH_CHUNK_SIZE):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    async def _refresh_remote(self) -> set[str] | None:
+        if self._remote_fresh():
+            return self._remote
+        try:
+            remote = await self._flights.do("remote", self._list_remote)
+        except Exception as e:
+            # Listing is an optimization; fall back to trusting the index.
+            logger.warning("Chatterbox reference listing failed: %s", e)
+            return None
+        self._remote = set(remote)
+        self._remote_checked_at = time.monotonic()
+        return self._remote
+
+    async def _ensure(self, digest: str, ref_path: str) -> str:
+        stored = await asyncio.to_thread(self._read_index_if_changed)
+        if stored is not None:
+            self._merge_index(stored)
+        entry = self._entries.get(digest)
+        remote = await self._refresh_remote()
+
+        if (
+            entry is not None
+            and entry["remote_name"] not in self._missing
+            and (remote is None or entry["remote_name"] in remote)
+        ):
+            self._touch(digest, entry["remote_name"])
+            self._hits += 1
+            return entry["remote_name"]
+
+        expected = remote_reference_name(digest)
+        if remote is not None and expected in remote and expected not in self._missing:
+            # Uploaded earlier (possibly by another replica) but not indexed here.
+            remote_name = expected
+            self._adopted += 1
+        else:
+            remote_name = await self._upload(ref_path, expected)
+            self._uploads += 1
+            self._missing.discard(remote_name)
+            if self._remote is not None:
+                self._remote.add(remote_name)
+            logger.info("Uploaded reference %s → %s", os.path.basename(ref_path), remote_name)
+
+        self._touch(digest, remote_name)
+        # Ensures for different voices overlap; one writer at a time shares the
+        # temp file, and snapshotting under the lock keeps the newest state last.
+        async with self._index_lock:
+            payload = json.dumps(
+                {
+                    "version": 1,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                    "entries": dict(self._entries),
+                },
+                ensure_ascii=True,
+                indent=2,
+            )
+            await asyncio.to_thread(self._write_index, payload)
+        return remote_name
+
+    def _touch(self, digest: str, remote_name: str) -> None:
+        self._entries[digest] = {"remote_name": remote_name, "last_used": time.time()}
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _merge_index(self, entries: dict) -> None:
+        """Fold entries written by earlier runs or other replicas into memory."""
+        merged = dict(self._entries)
+        for digest, entry in entries.items():
+            if not isinstance(entry, dict) or not isinstance(entry.get("remote_name"), str):
+                continue
+            current = merged.get(digest)
+            if current is None or entry.get("last_used", 0) > current.get("last_used", 0):
+                merged[digest] = {
+                    "remote_name": entry["remote_name"],
+                    "last_used": float(entry.get("last_used", 0)),
+                }
+        ordered = sorted(merged.items(), key=lambda item: item[1]["last_used"])
+        self._entries = OrderedDict(ordered[-self._max_entries:])
+
+    # --- Index file I/O (runs in worker threads) ---
+
+    def _read_index_if_changed(self) -> dict | None:
+        try:
+            mtime = self._index_path.stat().st_mtime
+        except OSError:
+            return None
+        if mtime == self._index_mtime:
+            return None
+        try:
+            raw = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return None
+        self._index_mtime = mtime
+        entries = raw.get("entries") if isinstance(raw, dict) else None
+        return entries if isinstance(entries, dict) else None
+
+    def _write_index(self, payload: str) -> None:
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self._index_path.with_suffix(f"{self._index_path.suffix}.tmp")
+            temp_path.write_text(payload, encoding="utf-8")
+            temp_path.replace(self._index_path)
+            self._index_mtime = self._index_path.stat().st_mtime
+        except OSError as e:
+            logger.warning("Failed to persist reference upload index: %s", e)
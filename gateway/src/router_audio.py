@@ -8,11 +8,12 @@ Endpoints:
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
-from fastapi.responses import JSONResponse, Response
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
 
 from .backend_client import client
 from .config import get_backend_url
+from .http_utils import range_headers, stream_or_error_response
+from .upload_stream import MultipartUploadStream
 
 router = APIRouter(prefix="/audio", tags=["audio"])
 logger = logging.getLogger(__name__)
@@ -33,29 +34,24 @@ def _get_config():
 
 
 @router.post("/denoise")
-async def denoise(file: UploadFile = File(...)):
+async def denoise(request: Request, file: UploadFile = File(...)):
     """Remove background noise from audio. Returns cleaned WAV. Proxied to DeepFilterNet."""
     config = _get_config()
     backend_url = get_backend_url(config, "deepfilter-audio")
 
-    audio_data = await file.read()
-
-    files = [("file", (file.filename or "audio.wav", audio_data, file.content_type or "audio/wav"))]
+    body = MultipartUploadStream(files=[("file", file, "audio.wav")])
 
     resp = await client.request(
         "deepfilter-audio", "POST", f"{backend_url}/denoise",
-        files=files,
+        content=body,
+        headers={**body.headers, **range_headers(request)},
         timeout_type="audio",
+        stream=True,
     )
 
-    if resp.status_code != 200:
-        return JSONResponse(
-            status_code=resp.status_code,
-            content={"error": "Audio backend error", "detail": resp.text},
-        )
-
-    return Response(
-        content=resp.content,
+    return await stream_or_error_response(
+        resp,
+        "Audio backend error",
         media_type="audio/wav",
         headers={"Content-Disposition": "attachment; filename=denoised.wav"},
     )
@@ -63,6 +59,7 @@ async def denoise(file: UploadFile = File(...)):
 
 @router.post("/convert")
 async def convert(
+    request: Request,
     file: UploadFile = File(...),
     output_format: str = Form("wav"),
     sample_rate: Optional[int] = Form(None),
@@ -79,31 +76,24 @@ async def convert(
     config = _get_config()
     backend_url = get_backend_url(config, "deepfilter-audio")
 
-    audio_data = await file.read()
-
-    files = [("file", (file.filename or "audio.wav", audio_data, file.content_type or "audio/wav"))]
     data = {"output_format": normalized_format}
     if sample_rate is not None:
         data["sample_rate"] = str(sample_rate)
     if bitrate is not None:
         data["bitrate"] = bitrate
+    body = MultipartUploadStream(files=[("file", file, "audio.wav")], fields=data)
 
     resp = await client.request(
         "deepfilter-audio", "POST", f"{backend_url}/convert",
-        files=files,
-        data=data,
+        content=body,
+        headers={**body.headers, **range_headers(request)},
         timeout_type="audio",
+        stream=True,
     )
 
-    if resp.status_code != 200:
-        return JSONResponse(
-            status_code=resp.status_code,
-            content={"error": "Audio backend error", "detail": resp.text},
-        )
-
-    media_type = _MEDIA_TYPES[normalized_format]
-    return Response(
-        content=resp.content,
-        media_type=media_type,
+    return await stream_or_error_response(
+        resp,
+        "Audio backend error",
+        media_type=_MEDIA_TYPES[normalized_format],
         headers={"Content-Disposition": f"attachment; filename=converted.{normalized_format}"},
     )
@@ -0,0 +1,265 @@
+"""Async job routes — long-running STT, diarization and denoise work.
+
+Endpoints:
+  POST   /jobs/stt/transcribe    — Queue a transcription (202 + job)
+  POST   /jobs/speakers/diarize  — Queue a diarization (202 + job)
+  POST   /jobs/audio/denoise     — Queue a noise reduction (202 + job)
+  GET    /jobs                   — List jobs and queue stats
+  GET    /jobs/{job_id}          — Job status
+  GET    /jobs/{job_id}/result   — Result body once the job succeeded
+  DELETE /jobs/{job_id}          — Cancel a pending job or delete a finished one
+
+Submitting returns as soon as the upload is spooled to disk; the backend call
+runs on a per-backend worker pool, so it survives client disconnects and
+backend concurrency is bounded by the pool size rather than by clients.
+"""
+
+import asyncio
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import FileResponse, JSONResponse
+from starlette.datastructures import Headers
+
+from .backend_client import client
+from .config import get_backend_url, settings
+from .jobs import SUCCEEDED, Job, JobFailed, JobKind, JobManager, JobQueueFull, JobStorageFull, WebhookRejected
+from .router_speaker import diarize_fields
+from .router_stt import transcribe_fields
+from .upload_stream import MultipartUploadStream
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+logger = logging.getLogger(__name__)
+
+_WRITE_CHUNK = 1024 * 1024
+
+JOBS = JobManager(
+    jobs_dir=settings.jobs_dir,
+    ttl_seconds=settings.jobs_ttl_seconds,
+    max_pending=settings.jobs_max_pending,
+    max_bytes=settings.jobs_max_mb * 1024 * 1024,
+    workers={
+        "whisper-stt": settings.jobs_stt_workers,
+        "pyannote-speaker": settings.jobs_speaker_workers,
+        "deepfilter-audio": settings.jobs_audio_workers,
+    },
+    webhook_timeout_seconds=settings.jobs_webhook_timeout_seconds,
+    webhook_allowed_hosts=settings.jobs_webhook_allowed_hosts,
+)
+
+
+def _get_config():
+    from .main import get_backends_config
+    return get_backends_config()
+
+
+@contextmanager
+def _spooled_upload(job: Job, input_path: Path):
+    """The job's spooled input as an UploadFile for MultipartUploadStream."""
+    handle = open(input_path, "rb")
+    try:
+        yield UploadFile(
+            file=handle,
+            filename=job.input_filename,
+            size=job.input_bytes,
+            headers=Headers({"content-type": job.input_content_type}),
+        )
+    finally:
+        handle.close()
+
+
+def _error_detail(resp) -> str:
+    try:
+        payload = resp.json()
+    except ValueError:
+        return resp.text[:1000]
+    if isinstance(payload, dict):
+        return str(payload.get("detail") or payload.get("error") or payload)[:1000]
+    return str(payload)[:1000]
+
+
+async def _json_job(
+    job: Job, input_path: Path, result_path: Path, *, backend: str, endpoint: str
+) -> str:
+    backend_url = get_backend_url(_get_config(), backend)
+    with _spooled_upload(job, input_path) as upload:
+        body = MultipartUploadStream(files=[("file", upload, "audio.wav")], fields=job.params)
+        resp = await client.request(
+            backend, "POST", f"{backend_url}{endpoint}",
+            content=body,
+            headers=body.headers,
+            timeout_type="jobs",
+        )
+    if resp.status_code >= 400:
+        raise JobFailed(resp.status_code, _error_detail(resp))
+    try:
+        resp.json()
+    except ValueError as e:
+        raise JobFailed(502, f"{backend} returned invalid JSON") from e
+    await asyncio.to_thread(result_path.write_bytes, resp.content)
+    return "application/json"
+
+
+async def _run_transcribe(job: Job, input_path: Path, result_path: Path) -> str:
+    return await _json_job(job, input_path, result_path, backend="whisper-stt", endpoint="/transcribe")
+
+
+async def _run_diarize(job: Job, input_path: Path, result_path: Path) -> str:
+    return await _json_job(job, input_path, result_path, backend="pyannote-speaker", endpoint="/diarize")
+
+
+async def _run_denoise(job: Job, input_path: Path, result_path: Path) -> str:
+    backend_url = get_backend_url(_get_config(), "deepfilter-audio")
+    with _spooled_upload(job, input_path) as upload:
+        body = MultipartUploadStream(files=[("file", upload, "audio.wav")])
+        resp = await client.request(
+            "deepfilter-audio", "POST", f"{backend_url}/denoise",
+            content=body,
+            headers=body.headers,
+            timeout_type="jobs",
+            stream=True,
+        )
+        try:
+            if resp.status_code != 200:
+                await resp.aread()
+                raise JobFailed(resp.status_code, _error_detail(resp))
+            handle = await asyncio.to_thread(open, result_path, "wb")
+            try:
+                async for chunk in resp.aiter_bytes(_WRITE_CHUNK):
+                    await asyncio.to_thread(handle.write, chunk)
+            finally:
+                await asyncio.to_thread(handle.close)
+        finally:
+            await resp.aclose()
+    return "audio/wav"
+
+
+JOBS.register(JobKind("transcribe", "whisper-stt", _run_transcribe))
+JOBS.register(JobKind("diarize", "pyannote-speaker", _run_diarize))
+JOBS.register(JobKind("denoise", "deepfilter-audio", _run_denoise))
+
+
+async def start_jobs() -> None:
+    await JOBS.start()
+
+
+async def stop_jobs() -> None:
+    await JOBS.stop()
+
+
+async def _validate_webhook(webhook_url: Optional[str]) -> Optional[str]:
+    if not webhook_url:
+        return None
+    try:
+        await JOBS.check_webhook(webhook_url)
+    except WebhookRejected as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return webhook_url
+
+
+async def _submit(kind: str, file: UploadFile, params: dict[str, str], webhook_url: Optional[str]) -> JSONResponse:
+    webhook_url = await _validate_webhook(webhook_url)
+    try:
+        job = await JOBS.submit(
+            kind,
+            file.file,
+            filename=file.filename,
+            content_type=file.content_type,
+            params=params,
+            webhook_url=webhook_url,
+        )
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Job queue full: {e}") from e
+    except JobStorageFull as e:
+        raise HTTPException(status_code=507, detail=f"Job storage full: {e}") from e
+    except OSError as e:
+        logger.error("Failed to spool %s job upload: %s", kind, e)
+        raise HTTPException(status_code=507, detail="Could not store job input") from e
+    logger.info("Queued %s job %s (%d bytes)", kind, job.id, job.input_bytes)
+    return JSONResponse(
+        status_code=202,
+        content=JOBS.public(job),
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+
+@router.post("/stt/transcribe", status_code=202)
+async def submit_transcribe(
+    file: UploadFile = File(...),
+    language: Optional[str] = Form(None),
+    word_timestamps: bool = Form(False),
+    webhook_url: Optional[str] = Form(None),
+):
+    """Queue a transcription; the result is the /stt/transcribe JSON."""
+    return await _submit("transcribe", file, transcribe_fields(language, word_timestamps), webhook_url)
+
+
+@router.post("/speakers/diarize", status_code=202)
+async def submit_diarize(
+    file: UploadFile = File(...),
+    num_speakers: Optional[int] = Form(None),
+    min_speakers: Optional[int] = Form(None),
+    max_speakers: Optional[int] = Form(None),
+    webhook_url: Optional[str] = Form(None),
+):
+    """Queue a diarization; the result is the /speakers/diarize JSON."""
+    return await _submit(
+        "diarize", file, diarize_fields(num_speakers, min_speakers, max_speakers), webhook_url
+    )
+
+
+@router.post("/audio/denoise", status_code=202)
+async def submit_denoise(
+    file: UploadFile = File(...),
+    webhook_url: Optional[str] = Form(None),
+):
+    """Queue a noise reduction; the result is the denoised WAV."""
+    return await _submit("denoise", file, {}, webhook_url)
+
+
+@router.get("")
+async def list_jobs(status: Optional[str] = None, kind: Optional[str] = None, limit: int = 100):
+    """Jobs newest first (optionally filtered) plus queue stats."""
+    jobs = JOBS.list_jobs(status=status, kind=kind)[: max(0, limit)]
+    return {"jobs": [JOBS.public(job) for job in jobs], "stats": JOBS.stats()}
+
+
+def _require_job(job_id: str) -> Job:
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Job status; ``result_url`` is set once it succeeded."""
+    return JOBS.public(_require_job(job_id))
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Result body (JSON or WAV, Range supported); 409 until the job succeeded."""
+    job = _require_job(job_id)
+    if job.status != SUCCEEDED:
+        return JSONResponse(
+            status_code=409,
+            content={"error": "Job has no result", "detail": f"Job is {job.status}", "job": JOBS.public(job)},
+        )
+    path = JOBS.result_path(job)
+    if not path.is_file():
+        raise HTTPException(status_code=410, detail=f"Result for job '{job_id}' is no longer available")
+    filename = f"{job.kind}-{job.id}.{'wav' if job.result_media_type == 'audio/wav' else 'json'}"
+    return FileResponse(path, media_type=job.result_media_type, filename=filename)
+
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued/running job, or delete a finished job and its result."""
+    job = await JOBS.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return JOBS.public(job)
@@ -1,19 +1,33 @@
 """LLM proxy routes — embeddings, chat completions, and model management."""
 
 import asyncio
+import copy
 import json
 import logging
 import re
 import threading
 import time
+from collections.abc import AsyncIterator
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 
 from .backend_client import client
 from .config import get_backend_url, settings
+from .embedding_batcher import (
+    EmbeddingBatcher,
+    EmbeddingBatchResult,
+    EmbeddingUpstreamError,
+    parse_embeddings_response,
+)
+from .embedding_cache import EmbeddingCache
+from .metrics import MODEL_UNLOADS, observe_model_swap
+from .model_catalog import ModelCatalog
 from .model_profile_store import ModelProfileStore
+from .model_scheduler import ModelLease, ModelScheduler
+from .single_flight import SingleFlight
 from .router_runtime_controller import (
     RUNTIME_PROFILE_TO_ROUTER_ARG,
     RouterRuntimeController,
@@ -39,6 +53,33 @@ ROUTER_RUNTIME_CONTROLLER = RouterRuntimeController(
     deployment_name=settings.llama_router_deployment_name,
     container_name=settings.llama_router_container_name,
 )
+EMBEDDING_CACHE: EmbeddingCache | None = (
+    EmbeddingCache(
+        max_bytes=settings.embedding_cache_max_mb * 1024 * 1024,
+        ttl_seconds=settings.embedding_cache_ttl_seconds,
+        disk_dir=settings.embedding_cache_dir,
+        disk_max_bytes=settings.embedding_cache_disk_max_mb * 1024 * 1024,
+    )
+    if settings.embedding_cache_enabled
+    else None
+)
+EMBEDDING_BATCHER: EmbeddingBatcher | None = (
+    EmbeddingBatcher(
+        client=client,
+        window_seconds=settings.embedding_batch_window_ms / 1000.0,
+        max_inputs=settings.embedding_batch_max_inputs,
+        max_tokens=settings.embedding_batch_max_tokens,
+    )
+    if settings.embedding_batch_enabled
+    else None
+)
+# Request keys that change the returned vectors and therefore the cache key.
+EMBEDDING_KEY_PARAMS = ("dimensions",)
+MODEL_SCHEDULER = ModelScheduler(
+    max_starvation_seconds=settings.chat_scheduler_max_starvation_seconds,
+)
+# Dedupes router load/reconfigure work keyed by (operation, model id, runtime profile).
+ROUTER_SINGLE_FLIGHT = SingleFlight()
 SPLIT_MODEL_ID_RE = re.compile(r"^(?P<base>.+)-(?P<part>\d+)-of-(?P<total>\d+)$")
 REASONING_LINE_RE = re.compile(r"(?im)^\s*reasoning\s*:\s*(low|medium|high)\s*$")
 
@@ -565,7 +606,8 @@ def _parse_json_object(body: bytes, *, required: bool = True) -> dict[str, Any]:
     return payload
 
 
-async def _list_router_models(router_url: str) -> list[dict]:
+async def _router_models_payload(router_url: str) -> dict:
+    """GET llama-router ``/models``; the whole payload is cached so ``/models`` can relay it."""
     try:
         resp = await client.request(
             "llama-router",
@@ -580,18 +622,88 @@ async def _list_router_models(router_url: str) -> list[dict]:
             status_code=502,
             detail=f"llama-router /models failed with status {resp.status_code}",
         )
-    data = resp.json()
-    models = data.get("data", [])
-    if not isinstance(models, list):
+    try:
+        data = resp.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or not isinstance(data.setdefault("data", []), list):
         raise HTTPException(status_code=502, detail="llama-router /models returned invalid payload")
-    return models
+    return data
+
+
+async def _fetch_router_catalog() -> dict:
+    return await _router_models_payload(_require_backend_url(_get_config(), "llama-router"))
+
+
+async def _router_models(*, refresh: bool = False) -> list[dict]:
+    """Model entries from the cached llama-router catalog (``refresh`` bypasses the TTL)."""
+    payload = await (ROUTER_MODEL_CATALOG.refresh() if refresh else ROUTER_MODEL_CATALOG.get())
+    return payload["data"]
+
+
+async def _fetch_v1_models_catalog() -> dict[str, list]:
+    """Query every LLM backend's /v1/models concurrently."""
+    config = _get_config()
+    backends = [name for name in ("llama-embed", "llama-router", "vllm") if name in config.get("backends", {})]
+    results = await asyncio.gather(
+        *(_fetch_backend_v1_models(config, name) for name in backends)
+    )
+    return dict(zip(backends, results))
+
+
+async def _fetch_backend_v1_models(config: dict, backend_name: str) -> list:
+    try:
+        backend_url = get_backend_url(config, backend_name)
+        resp = await client.request(
+            backend_name, "GET", f"{backend_url}/v1/models",
+            timeout_type="default",
+        )
+        if resp.status_code == 200:
+            models = resp.json().get("data", [])
+            if isinstance(models, list):
+                return models
+    except Exception as e:
+        logger.warning("Failed to list %s models: %s", backend_name, e)
+    return []
+
+
+ROUTER_MODEL_CATALOG = ModelCatalog(
+    name="llama-router",
+    fetch=_fetch_router_catalog,
+    ttl_seconds=settings.model_catalog_ttl_seconds,
+    refresh_interval_seconds=settings.model_catalog_refresh_seconds,
+)
+V1_MODELS_CATALOG = ModelCatalog(
+    name="v1-models",
+    fetch=_fetch_v1_models_catalog,
+    ttl_seconds=settings.model_catalog_ttl_seconds,
+    refresh_interval_seconds=settings.model_catalog_refresh_seconds,
+)
+
+
+def _invalidate_model_catalogs() -> None:
+    """Called after every gateway-initiated load/unload/reconfigure."""
+    ROUTER_MODEL_CATALOG.invalidate()
+    V1_MODELS_CATALOG.invalidate()
+
+
+async def start_model_catalogs() -> None:
+    config = _get_config()
+    if "llama-router" in config.get("backends", {}):
+        await ROUTER_MODEL_CATALOG.start()
+    await V1_MODELS_CATALOG.start()
 
 
-async def _list_router_models_with_retry(router_url: str) -> list[dict]:
+async def stop_model_catalogs() -> None:
+    await ROUTER_MODEL_CATALOG.stop()
+    await V1_MODELS_CATALOG.stop()
+
+
+async def _list_router_models_with_retry() -> list[dict]:
     deadline = time.monotonic() + ROUTER_MODELS_RETRY_SECONDS
     while True:
         try:
-            return await _list_router_models(router_url)
+            return await _router_models()
         except HTTPException as e:
             if e.status_code not in {502, 503, 504}:
                 raise
@@ -641,10 +753,14 @@ def _runtime_matches(desired: dict[str, int], current: dict[str, int]) -> bool:
     return True
 
 
+def _runtime_key(runtime: dict[str, int]) -> tuple[tuple[str, int], ...]:
+    return tuple(sorted(runtime.items()))
+
+
 async def _ensure_router_runtime_profile(router_url: str, model_id: str) -> list[dict]:
     profile = _get_model_profile(model_id)
     desired_runtime = _extract_runtime_profile_values(profile)
-    models = await _list_router_models_with_retry(router_url)
+    models = await _list_router_models_with_retry()
     if not desired_runtime:
         return models
 
@@ -652,6 +768,19 @@ async def _ensure_router_runtime_profile(router_url: str, model_id: str) -> list
     if _runtime_matches(desired_runtime, current_runtime):
         return models
 
+    # One PATCH + rollout wait per target runtime, however many callers need it.
+    return await ROUTER_SINGLE_FLIGHT.do(
+        ("runtime", _runtime_key(desired_runtime)),
+        lambda: _reconfigure_router_runtime(router_url, model_id, desired_runtime, current_runtime),
+    )
+
+
+async def _reconfigure_router_runtime(
+    router_url: str,
+    model_id: str,
+    desired_runtime: dict[str, int],
+    current_runtime: dict[str, int],
+) -> list[dict]:
     logger.info(
         "Applying llama-router runtime profile for model=%s desired=%s current=%s",
         model_id,
@@ -659,6 +788,7 @@ async def _ensure_router_runtime_profile(router_url: str, model_id: str) -> list
         current_runtime,
     )
 
+    deadline = time.monotonic() + settings.runtime_reconfigure_timeout_seconds
     try:
         await ROUTER_RUNTIME_CONTROLLER.apply_runtime_values(desired_runtime)
     except RuntimeError as e:
@@ -666,12 +796,26 @@ async def _ensure_router_runtime_profile(router_url: str, model_id: str) -> list
             status_code=503,
             detail=f"Failed to reconfigure llama-router runtime for '{model_id}': {e}",
         ) from e
+    finally:
+        _invalidate_model_catalogs()
 
-    deadline = time.monotonic() + settings.runtime_reconfigure_timeout_seconds
+    # The watch resolves once the new pod passes readiness, so the first
+    # catalog read below normally already reports the new runtime.
+    try:
+        await ROUTER_RUNTIME_CONTROLLER.wait_for_rollout(max(0.0, deadline - time.monotonic()))
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=504,
+            detail=f"llama-router rollout for '{model_id}' did not complete: {e}",
+        ) from e
+
+    first_attempt = True
     while time.monotonic() < deadline:
-        await asyncio.sleep(ROUTER_MODELS_RETRY_INTERVAL_SECONDS)
+        if not first_attempt:
+            await asyncio.sleep(ROUTER_MODELS_RETRY_INTERVAL_SECONDS)
+        first_attempt = False
         try:
-            models = await _list_router_models(router_url)
+            models = await _router_models(refresh=True)
         except HTTPException:
             # router can be temporarily unavailable during rollout
             continue
@@ -703,6 +847,7 @@ async def _post_router_load_with_retry(router_url: str, model_id: str):
                 json={"model": model_id},
                 timeout_type="llm",
             )
+            _invalidate_model_catalogs()
             last_resp = resp
             if resp.status_code == 200:
                 return resp
@@ -721,7 +866,16 @@ async def _post_router_load_with_retry(router_url: str, model_id: str):
 
 
 async def _ensure_router_model_loaded(router_url: str, model_id: str) -> None:
-    """Ensure selected model is loaded; unload other loaded models when needed."""
+    """Ensure selected model is loaded; concurrent callers share one load sequence."""
+    runtime = _extract_runtime_profile_values(_get_model_profile(model_id))
+    await ROUTER_SINGLE_FLIGHT.do(
+        ("load", model_id, _runtime_key(runtime)),
+        lambda: _load_router_model_once(router_url, model_id),
+    )
+
+
+async def _load_router_model_once(router_url: str, model_id: str) -> None:
+    """Load the selected model; unload other loaded models when needed."""
     models = await _ensure_router_runtime_profile(router_url, model_id)
     model = _find_model(models, model_id)
     if model is None:
@@ -746,11 +900,25 @@ async def _ensure_router_model_loaded(router_url: str, model_id: str) -> None:
             json={"model": other_id},
             timeout_type="llm",
         )
+        MODEL_UNLOADS.inc()
+        _invalidate_model_catalogs()
 
     state = _status_value(model)
     if state == "loaded":
         return
 
+    started = time.monotonic()
+    try:
+        await _load_and_wait_router_model(router_url, model_id, state)
+    except Exception as e:
+        timed_out = isinstance(e, HTTPException) and e.status_code == 504
+        observe_model_swap("timeout" if timed_out else "failed", time.monotonic() - started)
+        raise
+    observe_model_swap("loaded", time.monotonic() - started)
+
+
+async def _load_and_wait_router_model(router_url: str, model_id: str, state: str) -> None:
+    """Request a load (unless one is in progress) and poll until it settles."""
     if state != "loading":
         load_resp = await _post_router_load_with_retry(router_url, model_id)
         if load_resp.status_code != 200:
@@ -763,7 +931,7 @@ async def _ensure_router_model_loaded(router_url: str, model_id: str) -> None:
     while time.monotonic() < deadline:
         await asyncio.sleep(LOAD_POLL_INTERVAL_SECONDS)
         try:
-            models = await _list_router_models(router_url)
+            models = await _router_models(refresh=True)
         except HTTPException:
             continue
         model = _find_model(models, model_id)
@@ -782,13 +950,108 @@ async def _ensure_router_model_loaded(router_url: str, model_id: str) -> None:
     )
 
 
+def _string_embedding_inputs(payload: dict[str, Any]) -> list[str] | None:
+    """Return string inputs when the request can be cached/batched, else None."""
+    if payload.get("encoding_format") not in (None, "float"):
+        return None
+    raw = payload.get("input")
+    if isinstance(raw, str):
+        return [raw]
+    if isinstance(raw, list) and raw and all(isinstance(item, str) for item in raw):
+        return raw
+    return None
+
+
+async def _fetch_embeddings(
+    backend_url: str, payload: dict[str, Any], texts: list[str]
+) -> EmbeddingBatchResult:
+    """Embed texts upstream, via the coalescer when it is enabled."""
+    if EMBEDDING_BATCHER is not None:
+        template = {key: value for key, value in payload.items() if key != "input"}
+        return await EMBEDDING_BATCHER.submit(backend_url, template, texts)
+
+    upstream_payload = dict(payload)
+    upstream_payload["input"] = texts
+    resp = await client.request(
+        "llama-embed", "POST", f"{backend_url}/v1/embeddings",
+        json=upstream_payload,
+        timeout_type="embeddings",
+    )
+    return parse_embeddings_response(resp, len(texts))
+
+
+async def _embed_strings(
+    backend_url: str, payload: dict[str, Any], inputs: list[str]
+) -> JSONResponse:
+    """Serve cached vectors and forward only the misses to llama-embed."""
+    model = payload.get("model")
+    model_key = model if isinstance(model, str) else ""
+    cache = EMBEDDING_CACHE
+    if cache is None:
+        result = await _fetch_embeddings(backend_url, payload, inputs)
+        keys = [str(index) for index in range(len(inputs))]
+        vectors = dict(zip(keys, result.vectors))
+        usage = result.usage
+        response_model = result.model or model_key
+    else:
+        params = json.dumps(
+            {key: payload[key] for key in EMBEDDING_KEY_PARAMS if key in payload},
+            sort_keys=True,
+        )
+        keys = [cache.make_key(model_key, text, params) for text in inputs]
+        vectors = await cache.get_many(keys)
+
+        # Deduplicate misses so a batch with repeated chunks embeds each once.
+        miss_keys: list[str] = []
+        miss_texts: list[str] = []
+        seen_misses: set[str] = set()
+        for key, text in zip(keys, inputs):
+            if key in vectors or key in seen_misses:
+                continue
+            seen_misses.add(key)
+            miss_keys.append(key)
+            miss_texts.append(text)
+
+        usage = {"prompt_tokens": 0, "total_tokens": 0}
+        response_model = model_key
+        if miss_texts:
+            result = await _fetch_embeddings(backend_url, payload, miss_texts)
+            fetched = dict(zip(miss_keys, result.vectors))
+            await cache.put_many(fetched)
+            vectors.update(fetched)
+            usage = result.usage
+            response_model = result.model or model_key
+
+    return JSONResponse(content={
+        "object": "list",
+        "data": [
+            {"object": "embedding", "index": index, "embedding": vectors[key]}
+            for index, key in enumerate(keys)
+        ],
+        "model": response_model,
+        "usage": usage,
+    })
+
+
 @router.post("/v1/embeddings")
 async def embeddings(request: Request):
-    """Proxy embeddings to llama-embed."""
+    """Proxy embeddings to llama-embed, serving repeated inputs from the cache."""
     config = _get_config()
     backend_url = _require_backend_url(config, "llama-embed")
     body = await request.body()
 
+    if EMBEDDING_CACHE is not None or EMBEDDING_BATCHER is not None:
+        try:
+            payload = json.loads(body) if body else None
+        except json.JSONDecodeError:
+            payload = None
+        inputs = _string_embedding_inputs(payload) if isinstance(payload, dict) else None
+        if inputs is not None:
+            try:
+                return await _embed_strings(backend_url, payload, inputs)
+            except EmbeddingUpstreamError as e:
+                return JSONResponse(content=e.payload, status_code=e.status_code)
+
     url = f"{backend_url}/v1/embeddings"
     resp = await client.request(
         "llama-embed", "POST", url,
@@ -799,6 +1062,30 @@ async def embeddings(request: Request):
     return JSONResponse(content=resp.json(), status_code=resp.status_code)
 
 
+@router.get("/v1/embeddings/cache", include_in_schema=False)
+async def embeddings_cache_stats():
+    """Return embedding cache and coalescer counters."""
+    cache_stats = {"enabled": False} if EMBEDDING_CACHE is None else {"enabled": True, **EMBEDDING_CACHE.stats()}
+    batcher_stats = {"enabled": False} if EMBEDDING_BATCHER is None else {"enabled": True, **EMBEDDING_BATCHER.stats()}
+    return {**cache_stats, "batching": batcher_stats}
+
+
+async def _acquire_model_lease(router_url: str, model_id: str) -> ModelLease:
+    """Queue for the model's turn on llama-router and make sure it is loaded."""
+    return await MODEL_SCHEDULER.acquire(
+        model_id,
+        lambda: _ensure_router_model_loaded(router_url, model_id),
+    )
+
+
+async def _stream_with_lease(lease: ModelLease, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        lease.release()
+
+
 @router.post("/v1/chat/completions")
 async def chat_completions(request: Request):
     """Proxy OpenAI-compatible chat completions to llama.cpp router backend."""
@@ -816,7 +1103,7 @@ async def chat_completions(request: Request):
         ",".join(applied_defaults) if applied_defaults else "none",
     )
 
-    await _ensure_router_model_loaded(router_url, selected_model)
+    lease = await _acquire_model_lease(router_url, selected_model)
 
     # Handle streaming explicitly to keep SSE chunking end-to-end.
     stream = bool(payload.get("stream", False))
@@ -824,34 +1111,53 @@ async def chat_completions(request: Request):
 
     url = f"{router_url}/v1/chat/completions"
     if stream:
+        # The lease is held until the stream ends; the background task covers
+        # clients that disconnect before the body iterator ever starts.
         return StreamingResponse(
-            client.stream_bytes(
-                "llama-router",
-                "POST",
-                url,
-                content=proxy_body,
-                headers={"Content-Type": "application/json"},
-                timeout_type="llm",
+            _stream_with_lease(
+                lease,
+                client.stream_bytes(
+                    "llama-router",
+                    "POST",
+                    url,
+                    content=proxy_body,
+                    headers={"Content-Type": "application/json"},
+                    timeout_type="llm",
+                ),
             ),
             media_type="text/event-stream",
+            background=BackgroundTask(lease.release),
         )
 
-    resp = await client.request(
-        "llama-router",
-        "POST",
-        url,
-        content=proxy_body,
-        headers={"Content-Type": "application/json"},
-        timeout_type="llm",
-    )
+    try:
+        resp = await client.request(
+            "llama-router",
+            "POST",
+            url,
+            content=proxy_body,
+            headers={"Content-Type": "application/json"},
+            timeout_type="llm",
+        )
+    finally:
+        lease.release()
+    if resp.status_code >= 400:
+        # The model may have been idle-unloaded behind the cached catalog.
+        _invalidate_model_catalogs()
     return _proxy_response(resp)
 
 
-@router.get("/models")
-async def list_router_models():
-    """List llama.cpp router models and their load status."""
-    config = _get_config()
-    backend_url = _require_backend_url(config, "llama-router")
+@router.get("/models/scheduler", include_in_schema=False)
+async def model_scheduler_stats():
+    """Return chat scheduler queue depth, swap count and wait-time counters."""
+    return {
+        **MODEL_SCHEDULER.stats(),
+        "single_flight": ROUTER_SINGLE_FLIGHT.stats(),
+        "catalogs": [ROUTER_MODEL_CATALOG.stats(), V1_MODELS_CATALOG.stats()],
+    }
+
+
+async def _proxy_router_models(backend_url: str) -> Response:
+    """Query llama-router ``/models`` directly, passing its status and body through."""
     try:
         resp = await client.request(
             "llama-router",
@@ -867,21 +1173,38 @@ async def list_router_models():
         data = resp.json()
     except ValueError:
         return _proxy_response(resp)
-    if isinstance(data, dict):
-        models = data.get("data")
-        if isinstance(models, list):
-            _attach_model_load_defaults(models)
-            data["data"] = _collapse_split_models(models)
-        return JSONResponse(content=data, status_code=resp.status_code)
+    if isinstance(data, dict) and isinstance(data.get("data"), list):
+        return JSONResponse(content=_annotate_router_models(data))
     return _proxy_response(resp)
 
 
+def _annotate_router_models(payload: dict) -> dict:
+    models = payload["data"]
+    _attach_model_load_defaults(models)
+    payload["data"] = _collapse_split_models(models)
+    return payload
+
+
+@router.get("/models")
+async def list_router_models():
+    """List llama.cpp router models and their load status (from the cached catalog)."""
+    config = _get_config()
+    backend_url = _require_backend_url(config, "llama-router")
+    try:
+        payload = await ROUTER_MODEL_CATALOG.get()
+    except HTTPException:
+        # Only successful listings are cached; pass llama-router's own error through.
+        return await _proxy_router_models(backend_url)
+    # The catalog payload is shared; annotate a copy.
+    return _annotate_router_models(copy.deepcopy(payload))
+
+
 @router.get("/models/{model_id}/schema")
 async def get_model_profile_schema(model_id: str):
     """Return editable profile schema and field help for a model."""
     config = _get_config()
     backend_url = _require_backend_url(config, "llama-router")
-    models = await _list_router_models(backend_url)
+    models = await _router_models()
     if _find_model(models, model_id) is None:
         raise HTTPException(status_code=404, detail=f"Model '{model_id}' not found")
     return _schema_payload(model_id)
@@ -892,7 +1215,7 @@ async def get_model_profile(model_id: str):
     """Return persisted profile values for a model."""
     config = _get_config()
     backend_url = _require_backend_url(config, "llama-router")
-    models = await _list_router_models(backend_url)
+    models = await _router_models()
     if _find_model(models, model_id) is None:
         raise HTTPException(status_code=404, detail=f"Model '{model_id}' not found")
     return {
@@ -907,7 +1230,7 @@ async def put_model_profile(model_id: str, request: Request):
     """Create or update persisted profile values for a model."""
     config = _get_config()
     backend_url = _require_backend_url(config, "llama-router")
-    models = await _list_router_models(backend_url)
+    models = await _router_models()
     if _find_model(models, model_id) is None:
         raise HTTPException(status_code=404, detail=f"Model '{model_id}' not found")
 
@@ -946,7 +1269,7 @@ async def apply_model_profile(model_id: str, request: Request):
     """Apply persisted profile and optionally load the model."""
     config = _get_config()
     backend_url = _require_backend_url(config, "llama-router")
-    models = await _list_router_models(backend_url)
+    models = await _router_models()
     if _find_model(models, model_id) is None:
         raise HTTPException(status_code=404, detail=f"Model '{model_id}' not found")
 
@@ -955,7 +1278,8 @@ async def apply_model_profile(model_id: str, request: Request):
     load_status = {"requested": load_model, "success": True}
     if load_model:
         try:
-            await _ensure_router_model_loaded(backend_url, model_id)
+            lease = await _acquire_model_lease(backend_url, model_id)
+            lease.release()
         except HTTPException as e:
             load_status = {
                 "requested": True,
@@ -987,7 +1311,10 @@ async def load_router_model(request: Request):
 
     await _ensure_router_runtime_profile(backend_url, model_id)
 
-    resp = await _post_router_load_with_retry(backend_url, model_id)
+    resp = await ROUTER_SINGLE_FLIGHT.do(
+        ("post-load", model_id),
+        lambda: _post_router_load_with_retry(backend_url, model_id),
+    )
     if resp.status_code != 200:
         return _proxy_response(resp)
     try:
@@ -1015,66 +1342,27 @@ async def unload_router_model(request: Request):
         headers={"Content-Type": "application/json"},
         timeout_type="llm",
     )
+    _invalidate_model_catalogs()
     return _proxy_response(resp)
 
 
 @router.get("/v1/models")
 async def list_models():
-    """Aggregate model lists from all LLM backends."""
-    config = _get_config()
+    """Aggregate model lists from all LLM backends (from the cached catalog)."""
+    by_backend = copy.deepcopy(await V1_MODELS_CATALOG.get())
     models = []
 
     # llama-embed models
-    try:
-        embed_url = get_backend_url(config, "llama-embed")
-        resp = await client.request(
-            "llama-embed", "GET", f"{embed_url}/v1/models",
-            timeout_type="default",
-        )
-        if resp.status_code == 200:
-            data = resp.json()
-            models_from_router = data.get("data", [])
-            if isinstance(models_from_router, list):
-                _attach_model_load_defaults(models_from_router)
-            for m in models_from_router:
-                models.append(m)
-    except Exception as e:
-        logger.warning("Failed to list llama-embed models: %s", e)
+    embed_models = by_backend.get("llama-embed", [])
+    _attach_model_load_defaults(embed_models)
+    models.extend(embed_models)
 
     # llama-router models (chat/completions)
-    try:
-        router_url = get_backend_url(config, "llama-router")
-        resp = await client.request(
-            "llama-router", "GET", f"{router_url}/v1/models",
-            timeout_type="default",
-        )
-        if resp.status_code == 200:
-            data = resp.json()
-            router_models = data.get("data", [])
-            if isinstance(router_models, list):
-                _attach_model_load_defaults(router_models)
-                router_models = _collapse_split_models(router_models)
-            for m in router_models:
-                models.append(m)
-    except KeyError:
-        pass
-    except Exception as e:
-        logger.warning("Failed to list llama-router models: %s", e)
+    router_models = by_backend.get("llama-router", [])
+    _attach_model_load_defaults(router_models)
+    models.extend(_collapse_split_models(router_models))
 
     # vLLM models (when deployed — currently commented out in backends.yaml)
-    try:
-        vllm_url = get_backend_url(config, "vllm")
-        resp = await client.request(
-            "vllm", "GET", f"{vllm_url}/v1/models",
-            timeout_type="default",
-        )
-        if resp.status_code == 200:
-            data = resp.json()
-            for m in data.get("data", []):
-                models.append(m)
-    except KeyError:
-        pass  # vLLM not configured yet
-    except Exception as e:
-        logger.warning("Failed to list vLLM models: %s", e)
+    models.extend(by_backend.get("vllm", []))
 
     return {"object": "list", "data": models}
@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
 import os
+import time
 from pathlib import Path
 from typing import Any
 
 import httpx
 
+logger = logging.getLogger(__name__)
+
 SERVICE_ACCOUNT_TOKEN_PATH = Path("/var/run/secrets/kubernetes.io/serviceaccount/token")
 SERVICE_ACCOUNT_CA_PATH = Path("/var/run/secrets/kubernetes.io/serviceaccount/ca.crt")
+# Projected service account tokens rotate; re-read at least this often.
+SERVICE_ACCOUNT_TOKEN_REFRESH_SECONDS = 60.0
+# Server-side watch timeout; the watch is re-established until the deadline.
+ROLLOUT_WATCH_SECONDS = 60
 
 RUNTIME_PROFILE_TO_ROUTER_ARG: dict[str, str] = {
     "runtime_ctx_size": "--ctx-size",
@@ -51,13 +61,47 @@ def apply_runtime_profile_args(args: list[str], runtime_values: dict[str, int])
     return updated
 
 
+def rollout_complete(deployment: dict[str, Any], generation: int) -> bool:
+    """True once the controller observed ``generation`` and every replica is updated and ready."""
+    metadata = deployment.get("metadata", {})
+    status = deployment.get("status", {})
+    if not isinstance(metadata, dict) or not isinstance(status, dict):
+        return False
+    if int(metadata.get("generation", 0) or 0) > generation:
+        # Superseded by a newer patch; that rollout is tracked separately.
+        return False
+    if int(status.get("observedGeneration", 0) or 0) < generation:
+        return False
+    desired = deployment.get("spec", {}).get("replicas", 1)
+    desired = 1 if desired is None else int(desired)
+    updated = int(status.get("updatedReplicas", 0) or 0)
+    ready = int(status.get("readyReplicas", 0) or 0)
+    total = int(status.get("replicas", 0) or 0)
+    unavailable = int(status.get("unavailableReplicas", 0) or 0)
+    return updated >= desired and ready >= desired and total == updated and unavailable == 0
+
+
 class RouterRuntimeController:
-    """Applies llama-router runtime args by patching Kubernetes deployment spec."""
+    """Applies llama-router runtime args by patching Kubernetes deployment spec.
+
+    Keeps one API client for the process and tracks rollouts with the watch
+    API, so waiting for a reconfigure follows pod readiness instead of polling.
+    """
 
     def __init__(self, namespace: str, deployment_name: str, container_name: str):
         self._namespace = namespace
         self._deployment_name = deployment_name
         self._container_name = container_name
+        self._session: httpx.AsyncClient | None = None
+        self._token: str | None = None
+        self._token_mtime: float | None = None
+        self._token_read_at = 0.0
+        self._target_generation = 0
+        self._resource_version: str | None = None
+        self._rollout_event = asyncio.Event()
+        self._rollout_event.set()
+        self._rollout_task: asyncio.Task | None = None
+        self._rollout_error: str | None = None
 
     @property
     def _deployment_path(self) -> str:
@@ -65,6 +109,15 @@ class RouterRuntimeController:
             f"/apis/apps/v1/namespaces/{self._namespace}/deployments/{self._deployment_name}"
         )
 
+    @property
+    def _deployments_path(self) -> str:
+        return f"/apis/apps/v1/namespaces/{self._namespace}/deployments"
+
+    @property
+    def rollout_event(self) -> asyncio.Event:
+        """Set whenever the most recently patched generation has fully rolled out."""
+        return self._rollout_event
+
     @staticmethod
     def _api_base_url() -> str:
         host = os.getenv("KUBERNETES_SERVICE_HOST")
@@ -73,13 +126,23 @@ class RouterRuntimeController:
             return f"https://{host}:{port}"
         return "https://kubernetes.default.svc"
 
-    @staticmethod
-    def _read_service_account_token() -> str:
-        if not SERVICE_ACCOUNT_TOKEN_PATH.exists():
+    def _read_service_account_token(self) -> str:
+        try:
+            mtime = SERVICE_ACCOUNT_TOKEN_PATH.stat().st_mtime
+        except OSError as e:
             raise RuntimeError(
                 "Kubernetes service account token not available; runtime reconfigure is only supported in-cluster."
-            )
-        return SERVICE_ACCOUNT_TOKEN_PATH.read_text(encoding="utf-8").strip()
+            ) from e
+        now = time.monotonic()
+        if (
+            self._token is None
+            or mtime != self._token_mtime
+            or now - self._token_read_at > SERVICE_ACCOUNT_TOKEN_REFRESH_SECONDS
+        ):
+            self._token = SERVICE_ACCOUNT_TOKEN_PATH.read_text(encoding="utf-8").strip()
+            self._token_mtime = mtime
+            self._token_read_at = now
+        return self._token
 
     @staticmethod
     def _verify_target() -> str | bool:
@@ -87,6 +150,33 @@ class RouterRuntimeController:
             return str(SERVICE_ACCOUNT_CA_PATH)
         return True
 
+    def _client(self) -> httpx.AsyncClient:
+        if self._session is None:
+            self._session = httpx.AsyncClient(
+                base_url=self._api_base_url(),
+                timeout=30.0,
+                verify=self._verify_target(),
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        if self._rollout_task is not None:
+            self._rollout_task.cancel()
+            try:
+                await self._rollout_task
+            except asyncio.CancelledError:
+                pass
+            self._rollout_task = None
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
+
+    def _auth_headers(self, content_type: str | None = None) -> dict[str, str]:
+        headers = {"Authorization": f"Bearer {self._read_service_account_token()}"}
+        if content_type:
+            headers["Content-Type"] = content_type
+        return headers
+
     async def _request(
         self,
         method: str,
@@ -95,13 +185,9 @@ class RouterRuntimeController:
         json_body: dict[str, Any] | None = None,
         content_type: str | None = None,
     ) -> dict[str, Any]:
-        token = self._read_service_account_token()
-        headers = {"Authorization": f"Bearer {token}"}
-        if content_type:
-            headers["Content-Type"] = content_type
-        url = f"{self._api_base_url()}{path}"
-        async with httpx.AsyncClient(timeout=30.0, verify=self._verify_target()) as session:
-            response = await session.request(method, url, headers=headers, json=json_body)
+        response = await self._client().request(
+            method, path, headers=self._auth_headers(content_type), json=json_body
+        )
         if response.status_code >= 400:
             detail = response.text.strip() or f"status={response.status_code}"
             raise RuntimeError(
@@ -160,10 +246,98 @@ class RouterRuntimeController:
                 }
             }
         }
-        await self._request(
+        patched = await self._request(
             "PATCH",
             self._deployment_path,
             json_body=patch_body,
             content_type="application/strategic-merge-patch+json",
         )
+        self._track_rollout(patched)
         return True
+
+    # --- Rollout tracking ---
+
+    def _track_rollout(self, deployment: dict[str, Any]) -> None:
+        metadata = deployment.get("metadata", {})
+        generation = int(metadata.get("generation", 0) or 0)
+        self._target_generation = generation
+        self._resource_version = metadata.get("resourceVersion")
+        self._rollout_error = None
+        if rollout_complete(deployment, generation):
+            self._rollout_event.set()
+            return
+        self._rollout_event.clear()
+        if self._rollout_task is None or self._rollout_task.done():
+            self._rollout_task = asyncio.create_task(self._watch_rollout())
+
+    async def wait_for_rollout(self, timeout: float) -> None:
+        """Wait until the last patched generation is rolled out and ready."""
+        try:
+            await asyncio.wait_for(self._rollout_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError as e:
+            raise RuntimeError(
+                f"Timed out after {timeout:.0f}s waiting for deployment/{self._deployment_name} "
+                f"generation {self._target_generation} rollout"
+            ) from e
+        if self._rollout_error:
+            raise RuntimeError(self._rollout_error)
+
+    async def _watch_rollout(self) -> None:
+        """Follow deployment events until the target generation is ready."""
+        backoff = 1.0
+        while not self._rollout_event.is_set():
+            try:
+                if self._resource_version is None:
+                    deployment = await self._request("GET", self._deployment_path)
+                    self._resource_version = deployment.get("metadata", {}).get("resourceVersion")
+                    if rollout_complete(deployment, self._target_generation):
+                        self._rollout_event.set()
+                        return
+                await self._watch_once()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("llama-router rollout watch interrupted: %s", e)
+                self._resource_version = None
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 15.0)
+
+    async def _watch_once(self) -> None:
+        params = {
+            "watch": "1",
+            "fieldSelector": f"metadata.name={self._deployment_name}",
+            "timeoutSeconds": str(ROLLOUT_WATCH_SECONDS),
+            "allowWatchBookmarks": "true",
+        }
+        if self._resource_version:
+            params["resourceVersion"] = self._resource_version
+        timeout = httpx.Timeout(30.0, read=ROLLOUT_WATCH_SECONDS + 15.0)
+        async with self._client().stream(
+            "GET", self._deployments_path, params=params, headers=self._auth_headers(), timeout=timeout
+        ) as response:
+            if response.status_code >= 400:
+                detail = (await response.aread()).decode("utf-8", "replace").strip()
+                raise RuntimeError(
+                    f"Kubernetes API watch failed ({response.status_code}): {detail or 'no detail'}"
+                )
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                event_type = event.get("type")
+                obj = event.get("object", {})
+                if event_type == "ERROR":
+                    # 410 Gone: resourceVersion too old; re-list and resume.
+                    self._resource_version = None
+                    return
+                version = obj.get("metadata", {}).get("resourceVersion")
+                if version:
+                    self._resource_version = version
+                if event_type == "DELETED":
+                    self._rollout_error = f"deployment/{self._deployment_name} was deleted during rollout"
+                    self._rollout_event.set()
+                    return
+                if event_type in {"ADDED", "MODIFIED"} and rollout_complete(obj, self._target_generation):
+                    self._rollout_event.set()
+                    return
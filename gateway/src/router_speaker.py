@@ -13,6 +13,7 @@ from fastapi import APIRouter, File, Form, UploadFile
 from .backend_client import client
 from .config import get_backend_url
 from .http_utils import json_or_error_response
+from .upload_stream import MultipartUploadStream
 
 router = APIRouter(prefix="/speakers", tags=["speaker"])
 logger = logging.getLogger(__name__)
@@ -23,6 +24,20 @@ def _get_config():
     return get_backends_config()
 
 
+def diarize_fields(
+    num_speakers: Optional[int], min_speakers: Optional[int], max_speakers: Optional[int]
+) -> dict[str, str]:
+    """Form fields for pyannote /diarize (shared with /jobs/speakers/diarize)."""
+    data = {}
+    if num_speakers is not None:
+        data["num_speakers"] = str(num_speakers)
+    if min_speakers is not None:
+        data["min_speakers"] = str(min_speakers)
+    if max_speakers is not None:
+        data["max_speakers"] = str(max_speakers)
+    return data
+
+
 @router.post("/diarize")
 async def diarize(
     file: UploadFile = File(...),
@@ -34,21 +49,15 @@ async def diarize(
     config = _get_config()
     backend_url = get_backend_url(config, "pyannote-speaker")
 
-    audio_data = await file.read()
-
-    files = [("file", (file.filename or "audio.wav", audio_data, file.content_type or "audio/wav"))]
-    data = {}
-    if num_speakers is not None:
-        data["num_speakers"] = str(num_speakers)
-    if min_speakers is not None:
-        data["min_speakers"] = str(min_speakers)
-    if max_speakers is not None:
-        data["max_speakers"] = str(max_speakers)
+    body = MultipartUploadStream(
+        files=[("file", file, "audio.wav")],
+        fields=diarize_fields(num_speakers, min_speakers, max_speakers),
+    )
 
     resp = await client.request(
         "pyannote-speaker", "POST", f"{backend_url}/diarize",
-        files=files,
-        data=data,
+        content=body,
+        headers=body.headers,
         timeout_type="speaker",
     )
 
@@ -64,17 +73,14 @@ async def verify(
     config = _get_config()
     backend_url = get_backend_url(config, "pyannote-speaker")
 
-    data1 = await file1.read()
-    data2 = await file2.read()
-
-    files = [
-        ("file1", (file1.filename or "speaker1.wav", data1, file1.content_type or "audio/wav")),
-        ("file2", (file2.filename or "speaker2.wav", data2, file2.content_type or "audio/wav")),
-    ]
+    body = MultipartUploadStream(
+        files=[("file1", file1, "speaker1.wav"), ("file2", file2, "speaker2.wav")],
+    )
 
     resp = await client.request(
         "pyannote-speaker", "POST", f"{backend_url}/verify",
-        files=files,
+        content=body,
+        headers=body.headers,
         timeout_type="speaker",
     )
 
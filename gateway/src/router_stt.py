@@ -4,73 +4,108 @@ Endpoints:
   POST /stt/transcribe      — Full transcription (returns JSON)
   POST /stt/detect-language  — Detect spoken language
   POST /stt/stream           — Streaming transcription (SSE)
+  WS   /stt/realtime         — Live transcription of streamed audio frames
+
+Transcribe and detect-language results are cached by audio content hash plus
+the forwarded options, so resubmitted recordings are answered without
+uploading them to whisper-stt again.
 """
 
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, File, Form, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, File, Form, UploadFile, WebSocket
+from fastapi.responses import Response
 
 from .backend_client import client
-from .config import get_backend_url
-from .http_utils import json_or_error_response
+from .config import get_backend_url, settings
+from .http_utils import json_or_error_response, stream_or_error_response
+from .realtime_stt import RealtimeSTT, WindowTranscribeError
+from .stt_cache import STTResultCache
+from .upload_stream import MultipartUploadStream
 
 router = APIRouter(prefix="/stt", tags=["stt"])
 logger = logging.getLogger(__name__)
 
+STT_CACHE = (
+    STTResultCache(
+        cache_dir=settings.stt_cache_dir,
+        max_bytes=settings.stt_cache_max_mb * 1024 * 1024,
+        ttl_seconds=settings.stt_cache_ttl_seconds,
+        namespace=settings.stt_cache_namespace,
+    )
+    if settings.stt_cache_enabled and settings.stt_cache_dir
+    else None
+)
+
 
 def _get_config():
     from .main import get_backends_config
     return get_backends_config()
 
 
-@router.post("/transcribe")
-async def transcribe(
-    file: UploadFile = File(...),
-    language: Optional[str] = Form(None),
-    word_timestamps: bool = Form(False),
-):
-    """Transcribe audio file. Proxied to faster-whisper backend."""
-    config = _get_config()
-    backend_url = get_backend_url(config, "whisper-stt")
-
-    audio_data = await file.read()
-
-    files = [("file", (file.filename or "audio.wav", audio_data, file.content_type or "audio/wav"))]
+def transcribe_fields(language: Optional[str], word_timestamps: bool) -> dict[str, str]:
+    """Form fields for whisper-stt /transcribe (shared with /jobs/stt/transcribe)."""
     data = {}
     if language:
         data["language"] = language
     if word_timestamps:
         data["word_timestamps"] = "true"
+    return data
 
-    resp = await client.request(
-        "whisper-stt", "POST", f"{backend_url}/transcribe",
-        files=files,
-        data=data,
-        timeout_type="stt",
-    )
 
-    return json_or_error_response(resp, "STT backend error")
+async def _cached_json(file: UploadFile, endpoint: str, fields: dict[str, str]) -> Response:
+    """POST ``file`` + ``fields`` to whisper-stt ``endpoint``, answering from STT_CACHE when possible."""
+    cache_key = None
+    if STT_CACHE is not None:
+        cache_key = STT_CACHE.make_key(
+            endpoint=endpoint, audio_digest=await STT_CACHE.audio_digest(file), params=fields
+        )
+        cached = await STT_CACHE.get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json", headers={"X-Synapse-Cache": "hit"})
 
-
-@router.post("/detect-language")
-async def detect_language(file: UploadFile = File(...)):
-    """Detect spoken language from audio. Proxied to faster-whisper backend."""
     config = _get_config()
     backend_url = get_backend_url(config, "whisper-stt")
 
-    audio_data = await file.read()
-
-    files = [("file", (file.filename or "audio.wav", audio_data, file.content_type or "audio/wav"))]
+    body = MultipartUploadStream(files=[("file", file, "audio.wav")], fields=fields)
 
     resp = await client.request(
-        "whisper-stt", "POST", f"{backend_url}/detect-language",
-        files=files,
+        "whisper-stt", "POST", f"{backend_url}{endpoint}",
+        content=body,
+        headers=body.headers,
         timeout_type="stt",
     )
 
-    return json_or_error_response(resp, "STT backend error")
+    response = json_or_error_response(resp, "STT backend error")
+    if cache_key is not None:
+        response.headers["X-Synapse-Cache"] = "miss"
+        # A non-JSON 200 was turned into an error envelope above; never cache that.
+        if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("application/json"):
+            await STT_CACHE.put(cache_key, response.body)
+    return response
+
+
+@router.post("/transcribe")
+async def transcribe(
+    file: UploadFile = File(...),
+    language: Optional[str] = Form(None),
+    word_timestamps: bool = Form(False),
+):
+    """Transcribe audio file. Proxied to faster-whisper backend."""
+    return await _cached_json(file, "/transcribe", transcribe_fields(language, word_timestamps))
+
+
+@router.post("/detect-language")
+async def detect_language(
+    file: UploadFile = File(...),
+    top_k: Optional[int] = Form(None),
+):
+    """Detect spoken language from audio. Proxied to faster-whisper backend."""
+    data = {}
+    if top_k is not None:
+        data["top_k"] = str(top_k)
+    return await _cached_json(file, "/detect-language", data)
 
 
 @router.post("/stream")
@@ -82,19 +117,85 @@ async def stream(
     config = _get_config()
     backend_url = get_backend_url(config, "whisper-stt")
 
-    audio_data = await file.read()
-
-    files = [("file", (file.filename or "audio.wav", audio_data, file.content_type or "audio/wav"))]
     data = {}
     if language:
         data["language"] = language
+    body = MultipartUploadStream(files=[("file", file, "audio.wav")], fields=data)
+
+    # Send the upload before returning: the form file may be closed once the
+    # handler exits, so only the SSE response body is left to stream.
+    resp = await client.request(
+        "whisper-stt", "POST", f"{backend_url}/stream",
+        content=body,
+        headers=body.headers,
+        timeout_type="stt",
+        max_retries=1,
+        stream=True,
+    )
+
+    return await stream_or_error_response(resp, "STT backend error", media_type="text/event-stream")
+
+
+@router.get("/cache", include_in_schema=False)
+async def stt_cache_stats():
+    """Transcription result cache counters."""
+    if STT_CACHE is None:
+        return {"enabled": False}
+    return {"enabled": True, **STT_CACHE.stats()}
+
+
+# --- Realtime ---
+
 
-    return StreamingResponse(
-        client.stream_bytes(
-            "whisper-stt", "POST", f"{backend_url}/stream",
-            files=files,
-            data=data,
-            timeout_type="stt",
-        ),
-        media_type="text/event-stream",
+async def _transcribe_window(wav: bytes, fields: dict[str, str]) -> dict:
+    """One realtime speech window through whisper-stt /transcribe."""
+    backend_url = get_backend_url(_get_config(), "whisper-stt")
+    resp = await client.request(
+        "whisper-stt", "POST", f"{backend_url}/transcribe",
+        files={"file": ("window.wav", wav, "audio/wav")},
+        data=fields,
+        timeout_type="stt",
     )
+    if resp.status_code != 200:
+        raise WindowTranscribeError(f"STT backend error {resp.status_code}: {resp.text[:200]}")
+    try:
+        return resp.json()
+    except ValueError as e:
+        raise WindowTranscribeError("STT backend returned invalid JSON") from e
+
+
+REALTIME = RealtimeSTT(
+    transcribe=_transcribe_window,
+    max_sessions=settings.stt_realtime_max_sessions,
+    max_inflight=settings.stt_realtime_max_inflight,
+    max_pending=settings.stt_realtime_max_pending_utterances,
+    partial_interval_ms=settings.stt_realtime_partial_interval_ms,
+    endpoint_silence_ms=settings.stt_realtime_endpoint_silence_ms,
+    max_utterance_seconds=settings.stt_realtime_max_utterance_seconds,
+    vad_min_rms=settings.stt_realtime_vad_min_rms,
+    vad_threshold_ratio=settings.stt_realtime_vad_threshold_ratio,
+)
+
+
+@router.websocket("/realtime")
+async def realtime(
+    websocket: WebSocket,
+    format: str = "pcm",
+    sample_rate: int = 16000,
+    language: Optional[str] = None,
+    word_timestamps: bool = False,
+):
+    """Live transcription: binary audio frames in, partial/final JSON messages out."""
+    await REALTIME.serve(
+        websocket,
+        audio_format=format,
+        sample_rate=sample_rate,
+        language=language,
+        word_timestamps=word_timestamps,
+    )
+
+
+@router.get("/realtime/stats", include_in_schema=False)
+async def realtime_stats():
+    """Realtime session and backpressure counters."""
+    return REALTIME.stats()
@@ -4,27 +4,39 @@ Chatterbox uses a two-step flow for voice cloning:
   1. POST /upload_reference  (multipart file → returns filename)
   2. POST /tts               (JSON with reference_audio_filename)
 
-The gateway caches uploaded filenames per voice_id to avoid re-uploading
-the same reference on every synthesis request.
+The gateway caches uploaded filenames by reference content hash (persisted
+on the voices PVC) to avoid re-uploading the same reference on every
+synthesis request or after a restart.
 """
 
-import io
+import asyncio
 import logging
-import os
 from typing import Annotated
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
+import aiofiles
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 
+from .audio_encoder import FORMATS, AudioEncoderPool
 from .backend_client import client
-from .config import get_backend_url
+from .config import get_backend_url, settings
+from .http_utils import range_headers, stream_or_error_response
 from .models import InterpolateRequest, SynthesizeRequest, StreamRequest
+from .reference_cache import ReferenceUploadCache
+from .tts_cache import TTSOutputCache
+from .tts_pipeline import (
+    PipelinedSynthesis,
+    TTSChunkError,
+    split_text_chunks,
+    split_wav_stream,
+    streaming_wav_header,
+)
 
 router = APIRouter(tags=["tts"])
 logger = logging.getLogger(__name__)
 
-# Cache: voice_id → filename returned by Chatterbox /upload_reference
-_ref_upload_cache: dict[str, str] = {}
+_PREDEFINED_VOICE = "Alice.wav"
 _MAX_VOICE_FILES = 10
 _MAX_VOICE_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
 _ALLOWED_WAV_CONTENT_TYPES = {
@@ -118,32 +130,22 @@ async def delete_voice(voice_id: str):
     deleted = vm.delete_voice(voice_id)
     if not deleted:
         raise HTTPException(404, f"Voice not found: {voice_id}")
-    _ref_upload_cache.pop(voice_id, None)
     return {"status": "deleted", "voice_id": voice_id}
 
 
 # --- Helpers ---
 
 
-async def _upload_reference_to_chatterbox(
-    backend_url: str, voice_id: str, ref_path: str
-) -> str:
-    """Upload a reference WAV to Chatterbox and cache the returned filename.
+def _chatterbox_url() -> str:
+    return get_backend_url(_get_config(), "chatterbox-tts")
 
-    Chatterbox requires a two-step flow:
-      1. POST /upload_reference (multipart) → returns {"uploaded_files": ["filename.wav"], ...}
-      2. POST /tts (JSON with reference_audio_filename)
-
-    We cache the filename per voice_id so subsequent synthesis calls skip re-upload.
-    """
-    if voice_id in _ref_upload_cache:
-        return _ref_upload_cache[voice_id]
 
+async def _post_reference_upload(ref_path: str, filename: str) -> str:
+    """POST /upload_reference (multipart) → {"uploaded_files": ["filename.wav"], ...}."""
     with open(ref_path, "rb") as f:
-        filename = f"{voice_id}_{os.path.basename(ref_path)}"
         resp = await client.request(
             "chatterbox-tts", "POST",
-            f"{backend_url}/upload_reference",
+            f"{_chatterbox_url()}/upload_reference",
             files=[("files", (filename, f, "audio/wav"))],
             timeout_type="default",
         )
@@ -155,23 +157,142 @@ async def _upload_reference_to_chatterbox(
     uploaded_files = data.get("uploaded_files", [])
     if not uploaded_files:
         raise HTTPException(502, "Chatterbox returned no uploaded files")
+    return uploaded_files[0]
+
+
+async def _list_chatterbox_references() -> set[str]:
+    resp = await client.request(
+        "chatterbox-tts", "GET",
+        f"{_chatterbox_url()}/get_reference_files",
+        timeout_type="default",
+    )
+    resp.raise_for_status()
+    files = resp.json()
+    if not isinstance(files, list):
+        raise ValueError("unexpected /get_reference_files payload")
+    return {name for name in files if isinstance(name, str)}
+
+
+REFERENCE_CACHE = ReferenceUploadCache(
+    index_path=settings.tts_reference_cache_path,
+    max_entries=settings.tts_reference_cache_max_entries,
+    verify_interval_seconds=settings.tts_reference_verify_seconds,
+    upload=_post_reference_upload,
+    list_remote=_list_chatterbox_references,
+)
+
+
+AUDIO_ENCODER = AudioEncoderPool(
+    max_workers=settings.tts_encode_workers,
+    bitrates_kbps={"opus": settings.tts_opus_bitrate_kbps, "mp3": settings.tts_mp3_bitrate_kbps},
+)
+
+TTS_CACHE = (
+    TTSOutputCache(cache_dir=settings.tts_cache_dir, max_bytes=settings.tts_cache_max_mb * 1024 * 1024)
+    if settings.tts_cache_enabled and settings.tts_cache_dir
+    else None
+)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Weak If-None-Match comparison; ``*`` is not honoured on this POST."""
+    header = request.headers.get("if-none-match", "")
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(",")) if header else False
+
+
+async def _upload_reference_to_chatterbox(voice_id: str, ref_path: str) -> str:
+    """Return the Chatterbox filename for a reference WAV, uploading it if needed.
+
+    Chatterbox requires a two-step flow:
+      1. POST /upload_reference (multipart) → returns {"uploaded_files": ["filename.wav"], ...}
+      2. POST /tts (JSON with reference_audio_filename)
+
+    Uploads are cached by content hash, so adding or replacing references
+    never serves a stale upload and identical files upload once.
+    """
+    try:
+        return await REFERENCE_CACHE.resolve(ref_path)
+    except FileNotFoundError:
+        raise HTTPException(404, f"Reference file missing for voice: {voice_id}")
+
+
+async def _reupload_reference(voice_id: str, ref_path: str, remote_filename: str) -> str:
+    """Chatterbox lost ``remote_filename`` (e.g. restarted); upload it again."""
+    REFERENCE_CACHE.forget_remote(remote_filename)
+    return await _upload_reference_to_chatterbox(voice_id, ref_path)
 
-    remote_filename = uploaded_files[0]
-    _ref_upload_cache[voice_id] = remote_filename
-    logger.info("Uploaded reference for voice %s → %s", voice_id, remote_filename)
-    return remote_filename
+
+def _tts_reference_missing(status_code: int, detail: str, remote_filename: str) -> bool:
+    """Whether upstream ``/tts`` rejected a clone request for a missing reference.
+
+    The route itself always exists, so a 404 naming the file means the upload is gone.
+    """
+    return status_code == 404 and remote_filename in detail
+
+
+async def _synthesize_chunk(backend_url: str, tts_payload: dict) -> bytes:
+    """Synthesize one pipelined text chunk; returns the complete WAV."""
+    resp = await client.request(
+        "chatterbox-tts", "POST", f"{backend_url}/tts",
+        json=tts_payload,
+        timeout_type="tts",
+    )
+    if resp.status_code != 200:
+        raise TTSChunkError(resp.status_code, resp.text)
+    return resp.content
+
+
+async def _missing_reference(resp) -> str | None:
+    """Filename from a ``/synapse/tts_blend`` 409 ``reference_missing`` error, else None."""
+    if resp.status_code != 409:
+        return None
+    await resp.aread()
+    try:
+        detail = resp.json().get("detail")
+    except (ValueError, AttributeError):
+        return None
+    if isinstance(detail, dict) and detail.get("code") == "reference_missing":
+        return detail.get("reference_audio_filename")
+    return None
+
+
+async def _prepend(head: bytes, body):
+    yield head
+    async for chunk in body:
+        yield chunk
+
+
+async def _file_chunks(path, chunk_size: int = 64 * 1024):
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
+
+
+def _output_media(output_format: str, filename: str) -> tuple[str, dict[str, str]]:
+    """Media type and Content-Disposition for a requested output format."""
+    if output_format in FORMATS:
+        if not AUDIO_ENCODER.available:
+            raise HTTPException(503, f"output_format {output_format!r} needs ffmpeg in the gateway image")
+        media_type = FORMATS[output_format].media_type
+    else:
+        media_type = "audio/wav"
+    return media_type, {"Content-Disposition": f"attachment; filename={filename}.{output_format}"}
 
 
 # --- TTS synthesis (proxied to Chatterbox) ---
 
 
 @router.post("/tts/synthesize")
-async def synthesize(req: SynthesizeRequest):
+async def synthesize(req: SynthesizeRequest, request: Request):
     """Synthesize speech. Resolves voice references, proxies to Chatterbox.
 
     Uses Chatterbox two-step flow:
       - clone mode: upload reference via /upload_reference, then /tts with filename
       - predefined mode: /tts with predefined_voice_id
+
+    Repeated (text, voice, language, speed, split) requests are served from
+    the on-disk output cache without calling Chatterbox.
     """
     config = _get_config()
     backend_url = get_backend_url(config, "chatterbox-tts")
@@ -185,39 +306,105 @@ async def synthesize(req: SynthesizeRequest):
     if req.speed != 1.0:
         tts_payload["speed_factor"] = req.speed
 
+    ref_path = None
+    voice_key = f"predefined:{_PREDEFINED_VOICE}"
     if req.voice_id:
-        # Clone mode: upload reference first, then synthesize
         vm = _get_vm()
         ref_paths = vm.get_reference_paths(req.voice_id)
         if not ref_paths:
             raise HTTPException(404, f"Voice not found or has no references: {req.voice_id}")
-
-        remote_filename = await _upload_reference_to_chatterbox(
-            backend_url, req.voice_id, ref_paths[0]
+        ref_path = ref_paths[0]
+        try:
+            # Keyed by reference content, so replacing references misses the cache.
+            voice_key = f"clone:{await REFERENCE_CACHE.digest(ref_path)}"
+        except FileNotFoundError:
+            raise HTTPException(404, f"Reference file missing for voice: {req.voice_id}")
+
+    encoded = req.output_format in FORMATS
+    media_type, headers = _output_media(req.output_format, "synapse_tts")
+    cache_key = None
+    if TTS_CACHE is not None:
+        cache_key = TTS_CACHE.make_key(
+            text=req.text,
+            voice=voice_key,
+            language=req.language,
+            speed=req.speed,
+            split=req.split_sentences,
         )
+        headers["ETag"] = TTS_CACHE.etag(cache_key, req.output_format)
+        cached_path = await TTS_CACHE.lookup(cache_key)
+        # Only an entry still on disk can be the representation the client holds.
+        if cached_path is not None and _etag_matches(request, headers["ETag"]):
+            return Response(status_code=304, headers={"ETag": headers["ETag"]})
+        if cached_path is not None and encoded:
+            return StreamingResponse(
+                AUDIO_ENCODER.encode(req.output_format, _file_chunks(cached_path)),
+                media_type=media_type,
+                headers={**headers, "X-Synapse-Cache": "hit"},
+            )
+        if cached_path is not None:
+            return FileResponse(
+                cached_path,
+                media_type="audio/wav",
+                headers={**headers, "X-Synapse-Cache": "hit"},
+            )
+        headers["X-Synapse-Cache"] = "miss"
+
+    if ref_path is not None:
+        # Clone mode: upload reference first, then synthesize
+        remote_filename = await _upload_reference_to_chatterbox(req.voice_id, ref_path)
         tts_payload["voice_mode"] = "clone"
         tts_payload["reference_audio_filename"] = remote_filename
     else:
         # Predefined mode: use default voice
         tts_payload["voice_mode"] = "predefined"
-        tts_payload["predefined_voice_id"] = "Alice.wav"
+        tts_payload["predefined_voice_id"] = _PREDEFINED_VOICE
 
+    # Byte ranges of the WAV are meaningless for an encoded response.
+    forwarded = {} if encoded else range_headers(request)
     resp = await client.request(
         "chatterbox-tts", "POST", f"{backend_url}/tts",
         json=tts_payload,
+        headers=forwarded,
         timeout_type="tts",
+        stream=True,
     )
+    if ref_path is not None and resp.status_code == 404:
+        await resp.aread()
+        if _tts_reference_missing(resp.status_code, resp.text, remote_filename):
+            # Re-upload and retry once, as /tts/interpolate does.
+            await resp.aclose()
+            tts_payload["reference_audio_filename"] = await _reupload_reference(
+                req.voice_id, ref_path, remote_filename
+            )
+            resp = await client.request(
+                "chatterbox-tts", "POST", f"{backend_url}/tts",
+                json=tts_payload,
+                headers=forwarded,
+                timeout_type="tts",
+                stream=True,
+            )
 
-    if resp.status_code != 200:
-        return JSONResponse(
-            status_code=resp.status_code,
-            content={"error": "TTS backend error", "detail": resp.text},
-        )
-
-    return StreamingResponse(
-        io.BytesIO(resp.content),
-        media_type="audio/wav",
-        headers={"Content-Disposition": "attachment; filename=synapse_tts.wav"},
+    expected = resp.headers.get("content-length")
+
+    def complete(size: int) -> bool:
+        return resp.status_code == 200 and (expected is None or int(expected) == size)
+
+    def wrap_body(body):
+        # The cache always stores WAV; encoding happens downstream of it.
+        if cache_key is not None and not forwarded:
+            body = TTS_CACHE.tee(cache_key, body, complete=complete)
+        if encoded:
+            body = AUDIO_ENCODER.encode(req.output_format, body)
+        return body
+
+    return await stream_or_error_response(
+        resp,
+        "TTS backend error",
+        media_type=media_type,
+        headers=headers,
+        wrap_body=wrap_body,
+        relay_headers=not encoded,
     )
 
 
@@ -225,77 +412,139 @@ async def synthesize(req: SynthesizeRequest):
 async def stream_tts(req: StreamRequest):
     """Stream TTS audio via Chatterbox /v1/audio/speech (OpenAI-compatible).
 
-    Voice cloning via streaming: pre-uploads reference, then uses the /tts
-    endpoint (Chatterbox /v1/audio/speech doesn't support clone mode).
-    When voice_id is provided, falls back to non-streaming /tts endpoint.
+    Voice cloning via streaming: pre-uploads reference, then pipelines
+    sentence-sized /tts calls (Chatterbox /v1/audio/speech doesn't support
+    clone mode) and stitches their PCM into one stream.
+
+    Compressed ``output_format`` values are encoded from the WAV stream as
+    it arrives.
     """
+    if not req.text.strip():
+        raise HTTPException(400, "Text must not be blank")
     config = _get_config()
     backend_url = get_backend_url(config, "chatterbox-tts")
+    media_type, headers = _output_media(req.output_format, "synapse_tts")
 
     if req.voice_id:
-        # Voice cloning not supported via OpenAI-compatible streaming endpoint.
-        # Fall back to the /tts endpoint (non-chunked but supports cloning).
         vm = _get_vm()
         ref_paths = vm.get_reference_paths(req.voice_id)
         if not ref_paths:
             raise HTTPException(404, f"Voice not found: {req.voice_id}")
 
-        remote_filename = await _upload_reference_to_chatterbox(
-            backend_url, req.voice_id, ref_paths[0]
-        )
+        ref_path = ref_paths[0]
+        remote_filename = await _upload_reference_to_chatterbox(req.voice_id, ref_path)
 
         tts_payload = {
-            "text": req.text,
             "voice_mode": "clone",
             "reference_audio_filename": remote_filename,
-            "split_text": req.split_sentences,
+            "split_text": False,
+            "output_format": "wav",
         }
         if req.language:
             tts_payload["language"] = req.language
         if req.speed != 1.0:
             tts_payload["speed_factor"] = req.speed
 
-        resp = await client.request(
-            "chatterbox-tts", "POST", f"{backend_url}/tts",
-            json=tts_payload,
-            timeout_type="tts",
+        if req.split_sentences:
+            chunks = split_text_chunks(req.text, settings.tts_stream_max_chunk_chars)
+        else:
+            chunks = [req.text]
+
+        async def synthesize_chunk(text: str) -> bytes:
+            sent = tts_payload["reference_audio_filename"]
+            try:
+                return await _synthesize_chunk(backend_url, {**tts_payload, "text": text})
+            except TTSChunkError as e:
+                if not _tts_reference_missing(e.status_code, e.detail, sent):
+                    raise
+            # Later chunks pick up the re-uploaded name too.
+            tts_payload["reference_audio_filename"] = await _reupload_reference(req.voice_id, ref_path, sent)
+            return await _synthesize_chunk(backend_url, {**tts_payload, "text": text})
+
+        pipeline = PipelinedSynthesis(
+            chunks,
+            synthesize_chunk,
+            parallelism=settings.tts_stream_parallelism,
         )
-
-        if resp.status_code != 200:
+        try:
+            fmt = await pipeline.start()
+        except TTSChunkError as e:
             return JSONResponse(
-                status_code=resp.status_code,
-                content={"error": "TTS backend error", "detail": resp.text},
+                status_code=e.status_code,
+                content={"error": "TTS backend error", "detail": e.detail},
+            )
+        except ValueError as e:
+            return JSONResponse(
+                status_code=502,
+                content={"error": "TTS backend error", "detail": f"Invalid WAV from Chatterbox: {e}"},
             )
 
+        audio_headers = {
+            **headers,
+            "X-Audio-Sample-Rate": str(fmt.sample_rate),
+            "X-Audio-Channels": str(fmt.channels),
+            "X-Audio-Bits-Per-Sample": str(fmt.bits_per_sample),
+        }
+        if req.output_format == "pcm":
+            return StreamingResponse(
+                pipeline.pcm(),
+                media_type=f"audio/L{fmt.bits_per_sample};rate={fmt.sample_rate};channels={fmt.channels}",
+                headers=audio_headers,
+                background=BackgroundTask(pipeline.aclose),
+            )
+        wav = _prepend(streaming_wav_header(fmt), pipeline.pcm())
+        if req.output_format in FORMATS:
+            wav = AUDIO_ENCODER.encode(req.output_format, wav)
         return StreamingResponse(
-            io.BytesIO(resp.content),
-            media_type="audio/wav",
-            headers={"Content-Disposition": "attachment; filename=synapse_tts.wav"},
+            wav,
+            media_type=media_type,
+            headers=audio_headers,
+            background=BackgroundTask(pipeline.aclose),
         )
 
     # Default voice: use OpenAI-compatible streaming endpoint
-    return StreamingResponse(
-        client.stream_bytes(
-            "chatterbox-tts", "POST",
-            f"{backend_url}/v1/audio/speech",
-            json={
-                "model": "chatterbox",
-                "input": req.text,
-                "voice": "Alice.wav",
-                "speed": req.speed,
-            },
-            timeout_type="tts",
-        ),
-        media_type="audio/wav",
+    wav = client.stream_bytes(
+        "chatterbox-tts", "POST",
+        f"{backend_url}/v1/audio/speech",
+        json={
+            "model": "chatterbox",
+            "input": req.text,
+            "voice": _PREDEFINED_VOICE,
+            "speed": req.speed,
+        },
+        timeout_type="tts",
     )
+    if req.output_format == "pcm":
+        try:
+            fmt, pcm = await split_wav_stream(wav)
+        except ValueError as e:
+            await wav.aclose()
+            return JSONResponse(
+                status_code=502,
+                content={"error": "TTS backend error", "detail": f"Invalid WAV from Chatterbox: {e}"},
+            )
+        return StreamingResponse(
+            pcm,
+            media_type=f"audio/L{fmt.bits_per_sample};rate={fmt.sample_rate};channels={fmt.channels}",
+            headers={
+                "X-Audio-Sample-Rate": str(fmt.sample_rate),
+                "X-Audio-Channels": str(fmt.channels),
+                "X-Audio-Bits-Per-Sample": str(fmt.bits_per_sample),
+            },
+            background=BackgroundTask(wav.aclose),
+        )
+    if req.output_format in FORMATS:
+        wav = AUDIO_ENCODER.encode(req.output_format, wav)
+    return StreamingResponse(wav, media_type=media_type)
 
 
 @router.post("/tts/interpolate")
-async def interpolate(req: InterpolateRequest):
-    """Blend multiple voices and synthesize. Proxied to Chatterbox.
+async def interpolate(req: InterpolateRequest, request: Request):
+    """Blend multiple voices by weight and synthesize.
 
-    Chatterbox doesn't support native interpolation — uses the
-    highest-weighted voice for cloning.
+    References are uploaded once (content-addressed) and Chatterbox's
+    ``/synapse/tts_blend`` extension blends their cached speaker embeddings.
+    Images without the extension fall back to the highest-weighted voice.
     """
     config = _get_config()
     backend_url = get_backend_url(config, "chatterbox-tts")
@@ -309,46 +558,99 @@ async def interpolate(req: InterpolateRequest):
             raise HTTPException(404, f"Voice not found: {vw.voice_id}")
         voice_refs.append({"voice_id": vw.voice_id, "path": paths[0], "weight": vw.weight})
 
-    # Use the highest-weighted voice for cloning
-    primary = max(voice_refs, key=lambda v: v["weight"])
-
-    remote_filename = await _upload_reference_to_chatterbox(
-        backend_url, primary["voice_id"], primary["path"]
+    remote_filenames = await asyncio.gather(
+        *(_upload_reference_to_chatterbox(v["voice_id"], v["path"]) for v in voice_refs)
     )
 
-    tts_payload = {
+    blend_payload = {
         "text": req.text,
-        "voice_mode": "clone",
-        "reference_audio_filename": remote_filename,
+        "voices": [
+            {"reference_audio_filename": name, "weight": v["weight"]}
+            for v, name in zip(voice_refs, remote_filenames)
+        ],
         "split_text": True,
+        "speed_factor": req.speed,
     }
     if req.language:
-        tts_payload["language"] = req.language
-    if req.speed != 1.0:
-        tts_payload["speed_factor"] = req.speed
+        blend_payload["language"] = req.language
 
+    headers = {"Content-Disposition": "attachment; filename=synapse_interpolate.wav"}
     resp = await client.request(
-        "chatterbox-tts", "POST", f"{backend_url}/tts",
-        json=tts_payload,
+        "chatterbox-tts", "POST", f"{backend_url}/synapse/tts_blend",
+        json=blend_payload,
+        headers=range_headers(request),
         timeout_type="tts",
+        stream=True,
     )
+    missing = await _missing_reference(resp)
+    if missing is not None:
+        # Chatterbox lost an upload (e.g. restarted); re-upload and retry once.
+        await resp.aclose()
+        REFERENCE_CACHE.forget_remote(missing)
+        remote_filenames = await asyncio.gather(
+            *(_upload_reference_to_chatterbox(v["voice_id"], v["path"]) for v in voice_refs)
+        )
+        for voice, name in zip(blend_payload["voices"], remote_filenames):
+            voice["reference_audio_filename"] = name
+        resp = await client.request(
+            "chatterbox-tts", "POST", f"{backend_url}/synapse/tts_blend",
+            json=blend_payload,
+            headers=range_headers(request),
+            timeout_type="tts",
+            stream=True,
+        )
 
-    if resp.status_code != 200:
-        return JSONResponse(
-            status_code=resp.status_code,
-            content={"error": "TTS backend error", "detail": resp.text},
+    # Missing references are a 409, so 404/405 here means the route itself is absent.
+    if resp.status_code in (404, 405):
+        await resp.aclose()
+        logger.warning("Chatterbox image lacks /synapse/tts_blend; using highest-weighted voice")
+        primary = max(range(len(voice_refs)), key=lambda i: voice_refs[i]["weight"])
+        tts_payload = {
+            "text": req.text,
+            "voice_mode": "clone",
+            "reference_audio_filename": remote_filenames[primary],
+            "split_text": True,
+        }
+        if req.language:
+            tts_payload["language"] = req.language
+        if req.speed != 1.0:
+            tts_payload["speed_factor"] = req.speed
+        resp = await client.request(
+            "chatterbox-tts", "POST", f"{backend_url}/tts",
+            json=tts_payload,
+            headers=range_headers(request),
+            timeout_type="tts",
+            stream=True,
         )
+        headers["X-Synapse-Interpolation"] = "primary-voice"
+    else:
+        headers["X-Synapse-Interpolation"] = "blended"
 
-    return StreamingResponse(
-        io.BytesIO(resp.content),
+    return await stream_or_error_response(
+        resp,
+        "TTS backend error",
         media_type="audio/wav",
-        headers={"Content-Disposition": "attachment; filename=synapse_interpolate.wav"},
+        headers=headers,
     )
 
 
 # --- TTS metadata ---
 
 
+@router.get("/tts/references/cache", include_in_schema=False)
+async def reference_cache_stats():
+    """Chatterbox reference upload cache counters."""
+    return REFERENCE_CACHE.stats()
+
+
+@router.get("/tts/cache", include_in_schema=False)
+async def tts_cache_stats():
+    """Synthesized-audio cache counters."""
+    if TTS_CACHE is None:
+        return {"enabled": False}
+    return {"enabled": True, **TTS_CACHE.stats()}
+
+
 # Chatterbox Turbo supported languages (ISO 639-1)
 SUPPORTED_LANGUAGES = [
     {"code": "en", "name": "English"},
@@ -0,0 +1,51 @@
+"""Single-flight call deduplication for asyncio coroutines."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Hashable
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Run at most one call per key; concurrent callers await the same result.
+
+    The shared call is shielded, so a waiter that gets cancelled (client
+    disconnect) does not cancel the work other waiters depend on.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._started = 0
+        self._joined = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None or call.done():
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            self._started += 1
+            call.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._joined += 1
+        return await asyncio.shield(call)
+
+    def in_flight(self, key: Hashable) -> bool:
+        call = self._calls.get(key)
+        return call is not None and not call.done()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": sum(1 for call in self._calls.values() if not call.done()),
+            "started": self._started,
+            "joined": self._joined,
+        }
+
+    def _forget(self, key: Hashable, done: asyncio.Future) -> None:
+        if self._calls.get(key) is done:
+            del self._calls[key]
+        if not done.cancelled():
+            # Mark the exception as retrieved when every waiter went away.
+            done.exception()
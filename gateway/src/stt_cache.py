@@ -0,0 +1,91 @@
+"""Disk cache for STT results keyed by audio content and request options."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+from .disk_lru import DiskLRUCache
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def _sha256_file(handle: BinaryIO) -> str:
+    digest = hashlib.sha256()
+    handle.seek(0)
+    while chunk := handle.read(_HASH_CHUNK):
+        digest.update(chunk)
+    handle.seek(0)
+    return digest.hexdigest()
+
+
+class STTResultCache(DiskLRUCache):
+    """Backend JSON bodies stored as ``{dir}/{key[:2]}/{key}.json``.
+
+    Keys hash the upload bytes (streamed from Starlette's spooled file) plus
+    the endpoint and the form fields sent to whisper-stt, so a hit answers
+    the request without uploading the audio again. ``namespace`` is hashed
+    into every key; changing it (e.g. after swapping the whisper model)
+    orphans the old entries, which age out through LRU and TTL. Entries
+    expire ``ttl_seconds`` after they were stored.
+    """
+
+    def __init__(self, *, cache_dir: str, max_bytes: int, ttl_seconds: float = 0.0, namespace: str = ""):
+        super().__init__(
+            cache_dir=cache_dir, max_bytes=max_bytes, suffix=".json", label="STT cache", ttl_seconds=ttl_seconds
+        )
+        self._namespace = namespace
+
+    @staticmethod
+    async def audio_digest(upload: UploadFile) -> str:
+        """SHA-256 of the upload, read in chunks off the event loop; rewinds the file."""
+        return await asyncio.to_thread(_sha256_file, upload.file)
+
+    def make_key(self, *, endpoint: str, audio_digest: str, params: dict[str, str]) -> str:
+        payload = json.dumps(
+            {"namespace": self._namespace, "endpoint": endpoint, "audio": audio_digest, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> bytes | None:
+        """Cached body for ``key`` (marked recently used), or None."""
+        await self._ensure_loaded()
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        if self._is_expired(entry[0]):
+            self._misses += 1
+            await self._expire(key)
+            return None
+        try:
+            body = await asyncio.to_thread(self.path_for(key).read_bytes)
+        except OSError:
+            self._drop(key)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return body
+
+    async def put(self, key: str, body: bytes) -> None:
+        """Store ``body`` for ``key``; write failures only log."""
+        await self._ensure_loaded()
+        try:
+            await asyncio.to_thread(self._write, key, body)
+        except OSError as e:
+            logger.warning("STT cache write failed for %s: %s", key, e)
+            return
+        await self._commit(key, len(body))
+
+    def stats(self) -> dict:
+        return {**super().stats(), "ttl_seconds": self._ttl_seconds, "namespace": self._namespace, "expired": self._expired}
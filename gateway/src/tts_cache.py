@@ -0,0 +1,123 @@
+"""Disk cache for synthesized TTS audio with LRU eviction."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import unicodedata
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+
+from .disk_lru import DiskLRUCache
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_tts_text(text: str) -> str:
+    """Canonical text for cache keys (NFC, collapsed whitespace)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class TTSOutputCache(DiskLRUCache):
+    """Synthesized WAVs stored as ``{dir}/{key[:2]}/{key}.wav``.
+
+    Lookups refresh the file mtime so LRU order carries across restarts.
+    Misses are written while the response streams to the client and only
+    committed once the whole body arrived.
+    """
+
+    def __init__(self, *, cache_dir: str, max_bytes: int):
+        super().__init__(cache_dir=cache_dir, max_bytes=max_bytes, suffix=".wav", label="TTS cache")
+
+    @staticmethod
+    def make_key(*, text: str, voice: str, language: str, speed: float, split: bool) -> str:
+        payload = json.dumps(
+            {
+                "text": normalize_tts_text(text),
+                "voice": voice,
+                "language": language,
+                "speed": round(speed, 3),
+                "split": split,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def etag(key: str, output_format: str = "wav") -> str:
+        # Weak: the tag names the request inputs, and Chatterbox is not
+        # deterministic, so a re-synthesis after eviction differs in bytes.
+        # Compressed encodings of the same audio are separate representations.
+        suffix = "" if output_format == "wav" else f"-{output_format}"
+        return f'W/"{key[:32]}{suffix}"'
+
+    async def lookup(self, key: str) -> Path | None:
+        """Return the cached file for ``key`` (and mark it recently used)."""
+        await self._ensure_loaded()
+        if key not in self._entries:
+            self._misses += 1
+            return None
+        path = self.path_for(key)
+        try:
+            # mtime carries LRU order across restarts.
+            await asyncio.to_thread(os.utime, path)
+        except OSError:
+            self._drop(key)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return path
+
+    async def tee(
+        self, key: str, body: AsyncIterator[bytes], *, complete: Callable[[int], bool]
+    ) -> AsyncIterator[bytes]:
+        """Relay ``body`` while writing it to the cache.
+
+        ``complete(size)`` is checked once the body ends; the file is only
+        committed when it returns True (e.g. a full 200 response).
+        """
+        await self._ensure_loaded()
+        final_path = self.path_for(key)
+        temp_path = self._temp_path(key)
+        handle = None
+        try:
+            await asyncio.to_thread(final_path.parent.mkdir, parents=True, exist_ok=True)
+            handle = await asyncio.to_thread(open, temp_path, "wb")
+        except OSError as e:
+            logger.warning("TTS cache write disabled for this response: %s", e)
+
+        size = 0
+        committed = False
+        try:
+            async for chunk in body:
+                if handle is not None:
+                    try:
+                        await asyncio.to_thread(handle.write, chunk)
+                    except OSError as e:
+                        logger.warning("TTS cache write failed: %s", e)
+                        await asyncio.to_thread(handle.close)
+                        handle = None
+                size += len(chunk)
+                yield chunk
+            if handle is not None and size and complete(size):
+                await asyncio.to_thread(handle.close)
+                handle = None
+                await asyncio.to_thread(os.replace, temp_path, final_path)
+                committed = True
+                await self._commit(key, size)
+        finally:
+            if handle is not None:
+                await asyncio.to_thread(handle.close)
+            if not committed:
+                try:
+                    await asyncio.to_thread(temp_path.unlink, True)
+                except OSError:
+                    pass
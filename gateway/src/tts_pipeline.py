@@ -0,0 +1,269 @@
+"""Sentence-pipelined TTS streaming for cloned voices.
+
+Chatterbox only supports clone mode on its blocking ``/tts`` endpoint. The
+pipeline splits text into sentence/clause chunks, synthesizes a bounded number
+of chunks ahead of the one being sent, and stitches their PCM into a single
+stream behind one WAV header, so first audio arrives after one sentence.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import struct
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？…])\s+")
+_CLAUSE_END = re.compile(r"(?<=[,;:，；：])\s+")
+# Keep the first chunk short so first audio is not gated on a long sentence.
+_FIRST_CHUNK_MAX_CHARS = 120
+# RIFF/data sizes for a WAV whose length is unknown when the header is sent.
+_STREAMING_SIZE = 0xFFFFFFFF
+# Give up looking for the data chunk of a streamed WAV after this many bytes.
+_MAX_WAV_HEADER_BYTES = 64 * 1024
+
+
+class TTSChunkError(Exception):
+    """Chatterbox failed a chunk; carries the status and detail to relay."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"TTS backend returned status {status_code}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _split_long(text: str, max_chars: int) -> list[str]:
+    """Split an overlong sentence on clause boundaries, then on words."""
+    parts: list[str] = []
+    for clause in _CLAUSE_END.split(text):
+        if len(clause) <= max_chars:
+            parts.append(clause)
+            continue
+        current = ""
+        for word in clause.split():
+            if current and len(current) + 1 + len(word) > max_chars:
+                parts.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        if current:
+            parts.append(current)
+    return _merge(parts, max_chars)
+
+
+def _merge(parts: list[str], max_chars: int) -> list[str]:
+    merged: list[str] = []
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        if merged and len(merged[-1]) + 1 + len(part) <= max_chars:
+            merged[-1] = f"{merged[-1]} {part}"
+        else:
+            merged.append(part)
+    return merged
+
+
+def split_text_chunks(text: str, max_chars: int) -> list[str]:
+    """Split text into sentence-aligned chunks of at most ``max_chars``.
+
+    Short sentences are merged so the backend is not called per word-count
+    fragment; the first chunk is capped lower to keep time-to-first-audio low.
+    """
+    max_chars = max(20, max_chars)
+    pieces: list[str] = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) > max_chars:
+            pieces.extend(_split_long(sentence, max_chars))
+        else:
+            pieces.append(sentence)
+    if not pieces:
+        return []
+
+    first_limit = min(max_chars, _FIRST_CHUNK_MAX_CHARS)
+    first = _split_long(pieces[0], first_limit) if len(pieces[0]) > first_limit else [pieces[0]]
+    return [first[0]] + _merge(first[1:] + pieces[1:], max_chars)
+
+
+@dataclass(frozen=True)
+class WavFormat:
+    audio_format: int
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+
+    @property
+    def block_align(self) -> int:
+        return self.channels * self.bits_per_sample // 8
+
+
+def _wav_header(data: bytes) -> tuple[WavFormat, int, int] | None:
+    """Format, data offset and data size of a WAV prefix; None until the data chunk is reached."""
+    if len(data) < 12:
+        return None
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("not a RIFF/WAVE file")
+    fmt: WavFormat | None = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        size = struct.unpack_from("<I", data, offset + 4)[0]
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            if body + 16 > len(data):
+                return None
+            audio_format, channels, sample_rate, _byte_rate, _align, bits = struct.unpack_from(
+                "<HHIIHH", data, body
+            )
+            fmt = WavFormat(audio_format, channels, sample_rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk precedes fmt chunk")
+            return fmt, body, size
+        offset = body + size + (size & 1)
+    return None
+
+
+def parse_wav(data: bytes) -> tuple[WavFormat, bytes]:
+    """Return the format and PCM payload of a RIFF/WAVE file."""
+    if len(data) < 12:
+        raise ValueError("not a RIFF/WAVE file")
+    header = _wav_header(data)
+    if header is None:
+        raise ValueError("WAV file has no data chunk")
+    fmt, body, size = header
+    # Streaming writers leave the size unset; take the rest of the file.
+    end = len(data) if size in (0, _STREAMING_SIZE) else min(len(data), body + size)
+    pcm = data[body:end]
+    return fmt, pcm[: len(pcm) - len(pcm) % max(1, fmt.block_align)]
+
+
+async def split_wav_stream(chunks: AsyncIterator[bytes]) -> tuple[WavFormat, AsyncIterator[bytes]]:
+    """Read a WAV stream up to its data chunk; return the format and the PCM after it."""
+    head = b""
+    header = None
+    async for chunk in chunks:
+        head += chunk
+        header = _wav_header(head)
+        if header is not None:
+            break
+        if len(head) > _MAX_WAV_HEADER_BYTES:
+            raise ValueError("WAV header too large")
+    if header is None:
+        raise ValueError("WAV stream has no data chunk")
+    fmt, body, _size = header
+
+    async def pcm() -> AsyncIterator[bytes]:
+        if len(head) > body:
+            yield head[body:]
+        async for chunk in chunks:
+            yield chunk
+
+    return fmt, pcm()
+
+
+def streaming_wav_header(fmt: WavFormat) -> bytes:
+    """WAV header with unknown (max) sizes, as used for live WAV streams."""
+    byte_rate = fmt.sample_rate * fmt.block_align
+    return (
+        b"RIFF"
+        + struct.pack("<I", _STREAMING_SIZE)
+        + b"WAVEfmt "
+        + struct.pack(
+            "<IHHIIHH",
+            16,
+            fmt.audio_format,
+            fmt.channels,
+            fmt.sample_rate,
+            byte_rate,
+            fmt.block_align,
+            fmt.bits_per_sample,
+        )
+        + b"data"
+        + struct.pack("<I", _STREAMING_SIZE)
+    )
+
+
+class PipelinedSynthesis:
+    """Synthesize chunks with bounded look-ahead and yield PCM in text order.
+
+    ``start()`` waits for the first chunk so a backend failure can still be
+    reported as a normal error response; later failures end the stream early.
+    """
+
+    def __init__(
+        self,
+        chunks: list[str],
+        synthesize: Callable[[str], Awaitable[bytes]],
+        *,
+        parallelism: int,
+    ):
+        self._chunks = chunks
+        self._synthesize = synthesize
+        self._parallelism = max(1, parallelism)
+        self._pending: deque[asyncio.Task] = deque()
+        self._next_index = 0
+        self.format: WavFormat | None = None
+        self._first_pcm = b""
+
+    async def _synthesize_pcm(self, text: str) -> tuple[WavFormat, bytes]:
+        return parse_wav(await self._synthesize(text))
+
+    def _fill(self) -> None:
+        while len(self._pending) < self._parallelism and self._next_index < len(self._chunks):
+            text = self._chunks[self._next_index]
+            self._pending.append(asyncio.create_task(self._synthesize_pcm(text)))
+            self._next_index += 1
+
+    async def start(self) -> WavFormat:
+        self._fill()
+        try:
+            self.format, self._first_pcm = await self._pending[0]
+        except BaseException:
+            await self.aclose()
+            raise
+        self._pending.popleft()
+        self._fill()
+        return self.format
+
+    async def pcm(self) -> AsyncIterator[bytes]:
+        try:
+            yield self._first_pcm
+            self._first_pcm = b""
+            index = 1
+            while self._pending:
+                task = self._pending.popleft()
+                try:
+                    fmt, pcm = await task
+                except Exception as e:
+                    logger.warning(
+                        "Streaming TTS stopped at chunk %d/%d: %s", index + 1, len(self._chunks), e
+                    )
+                    return
+                self._fill()
+                if fmt != self.format:
+                    logger.warning(
+                        "Streaming TTS chunk %d format %s differs from %s; stopping",
+                        index + 1, fmt, self.format,
+                    )
+                    return
+                index += 1
+                yield pcm
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        tasks = list(self._pending)
+        self._pending.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,183 @@
+"""Streaming upload passthrough for audio routes.
+
+Starlette spools multipart files to disk past 1 MiB, so the only full copies of
+an upload in gateway RAM came from ``await file.read()`` and httpx building a
+new multipart body. ``MultipartUploadStream`` re-encodes the parts in fixed
+chunks straight from the spooled file, and ``UploadSizeLimitMiddleware`` caps
+request bodies as bytes arrive rather than after they have been stored.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from collections.abc import AsyncIterator
+
+from fastapi import UploadFile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _quote(value: str) -> str:
+    # Same escaping httpx/browsers use for multipart parameter values.
+    return value.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+class MultipartUploadStream:
+    """Re-iterable ``multipart/form-data`` body that streams UploadFiles in chunks.
+
+    Re-iteration rewinds the files, so BackendClient's connect retries can
+    replay the body. Content-Length is sent when every file size is known.
+    """
+
+    def __init__(
+        self,
+        *,
+        files: list[tuple[str, UploadFile, str]],
+        fields: dict[str, str] | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self._files = files
+        self._fields = fields or {}
+        self._chunk_size = max(1, chunk_size)
+        self._boundary = uuid.uuid4().hex
+
+    def _field_part(self, name: str, value: str) -> bytes:
+        return (
+            f"--{self._boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(name)}"\r\n\r\n'
+        ).encode("utf-8") + value.encode("utf-8") + b"\r\n"
+
+    def _file_header(self, name: str, upload: UploadFile, default_filename: str) -> bytes:
+        filename = upload.filename or default_filename
+        content_type = upload.content_type or "audio/wav"
+        return (
+            f"--{self._boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(name)}"; filename="{_quote(filename)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+
+    def _closing(self) -> bytes:
+        return f"--{self._boundary}--\r\n".encode("ascii")
+
+    @staticmethod
+    def _file_size(upload: UploadFile) -> int | None:
+        if upload.size is not None:
+            return upload.size
+        try:
+            return os.fstat(upload.file.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {"Content-Type": f"multipart/form-data; boundary={self._boundary}"}
+        length = sum(len(self._field_part(name, value)) for name, value in self._fields.items())
+        for name, upload, default_filename in self._files:
+            size = self._file_size(upload)
+            if size is None:
+                return headers
+            length += len(self._file_header(name, upload, default_filename)) + size + 2
+        length += len(self._closing())
+        headers["Content-Length"] = str(length)
+        return headers
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for name, value in self._fields.items():
+            yield self._field_part(name, value)
+        for name, upload, default_filename in self._files:
+            yield self._file_header(name, upload, default_filename)
+            await upload.seek(0)
+            while True:
+                chunk = await upload.read(self._chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+            yield b"\r\n"
+        yield self._closing()
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadSizeLimitMiddleware:
+    """Reject request bodies above ``max_bytes`` on the given path prefixes.
+
+    Declared Content-Length is checked up front; chunked bodies are counted as
+    they are received and cut off with 413 once they pass the limit.
+    """
+
+    def __init__(self, app, *, max_bytes: int, path_prefixes: tuple[str, ...]):
+        self.app = app
+        self._max_bytes = max(0, max_bytes)
+        self._path_prefixes = path_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not self._max_bytes
+            or not scope.get("path", "").startswith(self._path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        for key, value in scope.get("headers", []):
+            if key == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > self._max_bytes:
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self._max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded:
+                # FastAPI reports body-parsing failures as 400; answer 413 instead.
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await self._reject(send)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            if not response_started:
+                await self._reject(send)
+
+    async def _reject(self, send) -> None:
+        body = json.dumps({
+            "error": "Upload too large",
+            "detail": f"Request body exceeds the {self._max_bytes // (1024 * 1024)} MiB upload limit",
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,215 @@
+"""Rollout watch tests for RouterRuntimeController against a fake API server."""
+
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+
+from src import router_runtime_controller as rrc
+from src.router_runtime_controller import RouterRuntimeController, rollout_complete
+
+DEPLOYMENT_PATH = "/apis/apps/v1/namespaces/ai/deployments/llama-router"
+
+
+def _deployment(
+    generation: int,
+    observed: int,
+    *,
+    ready: int = 1,
+    updated: int = 1,
+    replicas: int = 1,
+    resource_version: str = "100",
+) -> dict:
+    return {
+        "metadata": {"name": "llama-router", "generation": generation, "resourceVersion": resource_version},
+        "spec": {"replicas": 1},
+        "status": {
+            "observedGeneration": observed,
+            "replicas": replicas,
+            "updatedReplicas": updated,
+            "readyReplicas": ready,
+        },
+    }
+
+
+def _event(event_type: str, obj: dict) -> bytes:
+    return (json.dumps({"type": event_type, "object": obj}) + "\n").encode()
+
+
+class FakeAPIServer:
+    """Serves deployment GETs and scripted watch streams, recording each request."""
+
+    def __init__(self, deployment: dict, watches: list[list[bytes | Exception]]):
+        self.deployment = deployment
+        self.watches = list(watches)
+        self.watch_params: list[dict] = []
+        self.watch_tokens: list[str] = []
+        self.gets = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == DEPLOYMENT_PATH:
+            self.gets += 1
+            return httpx.Response(200, json=self.deployment)
+        assert request.url.params.get("watch") == "1"
+        self.watch_params.append(dict(request.url.params))
+        self.watch_tokens.append(request.headers["Authorization"])
+        script = self.watches.pop(0) if self.watches else []
+
+        async def body():
+            for item in script:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+            # An exhausted script is the server closing the watch.
+
+        return httpx.Response(200, content=body())
+
+
+@pytest.fixture
+def token_file(tmp_path, monkeypatch):
+    path = tmp_path / "token"
+    path.write_text("token-1\n", encoding="utf-8")
+    monkeypatch.setattr(rrc, "SERVICE_ACCOUNT_TOKEN_PATH", path)
+    return path
+
+
+def _controller(server: FakeAPIServer) -> RouterRuntimeController:
+    controller = RouterRuntimeController("ai", "llama-router", "llama-router")
+    controller._session = httpx.AsyncClient(
+        base_url="https://kubernetes.test", transport=httpx.MockTransport(server.handler)
+    )
+    return controller
+
+
+def test_rollout_complete_requires_observed_generation_and_ready_replicas():
+    assert rollout_complete(_deployment(2, 2), 2)
+    assert not rollout_complete(_deployment(2, 1), 2)
+    assert not rollout_complete(_deployment(2, 2, ready=0), 2)
+    assert not rollout_complete(_deployment(2, 2, replicas=2), 2)
+    # A newer patch supersedes the tracked generation.
+    assert not rollout_complete(_deployment(3, 3), 2)
+
+
+def test_wait_for_rollout_resolves_on_completion_event(token_file):
+    server = FakeAPIServer(
+        _deployment(2, 1),
+        [[
+            _event("MODIFIED", _deployment(2, 2, ready=0, resource_version="101")),
+            _event("BOOKMARK", {"metadata": {"resourceVersion": "102"}}),
+            _event("MODIFIED", _deployment(2, 2, resource_version="103")),
+        ]],
+    )
+
+    async def scenario():
+        controller = _controller(server)
+        try:
+            controller._track_rollout(_deployment(2, 1, resource_version="100"))
+            assert not controller.rollout_event.is_set()
+            await controller.wait_for_rollout(timeout=5)
+        finally:
+            await controller.aclose()
+
+    asyncio.run(scenario())
+    assert len(server.watch_params) == 1
+    assert server.watch_params[0]["resourceVersion"] == "100"
+    assert server.gets == 0
+
+
+def test_watch_resumes_from_last_resource_version_after_stream_closes(token_file):
+    server = FakeAPIServer(
+        _deployment(2, 1),
+        [
+            [_event("MODIFIED", _deployment(2, 2, ready=0, resource_version="101"))],
+            [_event("MODIFIED", _deployment(2, 2, resource_version="102"))],
+        ],
+    )
+
+    async def scenario():
+        controller = _controller(server)
+        try:
+            controller._track_rollout(_deployment(2, 1, resource_version="100"))
+            await controller.wait_for_rollout(timeout=5)
+        finally:
+            await controller.aclose()
+
+    asyncio.run(scenario())
+    assert [p["resourceVersion"] for p in server.watch_params] == ["100", "101"]
+    assert server.gets == 0
+
+
+def test_watch_relists_after_gone_and_dropped_stream(token_file):
+    server = FakeAPIServer(
+        _deployment(2, 2, ready=0, resource_version="200"),
+        [
+            [_event("ERROR", {"kind": "Status", "code": 410, "reason": "Expired"})],
+            [httpx.ReadError("connection reset")],
+            [_event("MODIFIED", _deployment(2, 2, resource_version="201"))],
+        ],
+    )
+
+    async def scenario():
+        controller = _controller(server)
+        try:
+            controller._track_rollout(_deployment(2, 1, resource_version="100"))
+            await controller.wait_for_rollout(timeout=10)
+        finally:
+            await controller.aclose()
+
+    asyncio.run(scenario())
+    # 410 and the reset each force a re-list before the watch resumes.
+    assert [p.get("resourceVersion") for p in server.watch_params] == ["100", "200", "200"]
+    assert server.gets == 2
+
+
+def test_watch_rereads_rotated_token(token_file):
+    server = FakeAPIServer(
+        _deployment(2, 1),
+        [
+            [_event("MODIFIED", _deployment(2, 2, ready=0, resource_version="101"))],
+            [_event("MODIFIED", _deployment(2, 2, resource_version="102"))],
+        ],
+    )
+
+    async def scenario():
+        controller = _controller(server)
+        original_watch_once = controller._watch_once
+        watches = 0
+
+        async def rotate_then_watch():
+            nonlocal watches
+            if watches == 1:
+                token_file.write_text("token-2\n", encoding="utf-8")
+                stat = token_file.stat()
+                os.utime(token_file, (stat.st_atime, stat.st_mtime + 10))
+            watches += 1
+            await original_watch_once()
+
+        controller._watch_once = rotate_then_watch
+        try:
+            controller._track_rollout(_deployment(2, 1, resource_version="100"))
+            await controller.wait_for_rollout(timeout=5)
+        finally:
+            await controller.aclose()
+
+    asyncio.run(scenario())
+    assert server.watch_tokens == ["Bearer token-1", "Bearer token-2"]
+
+
+def test_wait_for_rollout_reports_deleted_deployment(token_file):
+    server = FakeAPIServer(
+        _deployment(2, 1),
+        [[_event("DELETED", _deployment(2, 1, resource_version="101"))]],
+    )
+
+    async def scenario():
+        controller = _controller(server)
+        try:
+            controller._track_rollout(_deployment(2, 1, resource_version="100"))
+            with pytest.raises(RuntimeError, match="was deleted"):
+                await controller.wait_for_rollout(timeout=5)
+        finally:
+            await controller.aclose()
+
+    asyncio.run(scenario())